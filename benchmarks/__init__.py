@@ -0,0 +1,12 @@
+"""
+Benchmarks for the translation engine and its entry points.
+
+``workbooks`` generates synthetic alarm exports (.xlsx, .ods, and .xls when
+xlwt is installed) of any size, ``suite`` times each entry point on them in
+a fresh process and saves the results as JSON, and ``compare`` flags the
+stages that got slower than in a stored baseline. Everything runs offline.
+
+Usage:
+    python -m benchmarks run --rows 1000 10000 -o results.json
+    python -m benchmarks compare baseline.json results.json
+"""
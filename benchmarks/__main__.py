@@ -0,0 +1,106 @@
+"""Command line of the benchmarks: ``python -m benchmarks {generate,run,compare}``."""
+
+import argparse
+import os
+import sys
+
+from benchmarks.compare import MIN_SECONDS, THRESHOLD, compare, format_rows, load_results
+from benchmarks.suite import ENTRY_POINTS, default_workdir, measure_in_process, run_suite, save_results
+from benchmarks.workbooks import DEFAULT_FORMATS, FORMATS, FormatUnavailable, make_workbook
+
+QUICK_ROWS = [1000, 10000]
+FULL_ROWS = [1000, 10000, 100000, 1000000]
+
+
+def _flag(value):
+    return value.lower() in ('1', 'yes', 'true', 'on')
+
+
+def add_case_arguments(parser):
+    parser.add_argument('--rows', type=int, nargs='+', help=f'Data rows per workbook (default: {QUICK_ROWS}, '
+                                                            f'or {FULL_ROWS} with --full)')
+    parser.add_argument('--full', action='store_true', help='Go up to a million rows')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(DEFAULT_FORMATS),
+                        help='Workbook formats (default: xlsx ods; xls needs xlwt)')
+    parser.add_argument('--distinct-ratio', type=float, nargs='+', default=[0.05],
+                        help='Distinct Description values per row (default: 0.05)')
+    parser.add_argument('--junk-rows', type=int, nargs='+', default=[3],
+                        help='Rows above the header (default: 3)')
+    parser.add_argument('--mixed-types', type=_flag, nargs='+', default=[True], metavar='{yes,no}',
+                        help='Numbers, dates, booleans and empty cells among the text (default: yes)')
+    parser.add_argument('--workdir', default=default_workdir(),
+                        help='Where workbooks are generated and kept between runs (default: %(default)s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark the translation entry points on synthetic workbooks.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Only generate the workbooks')
+    add_case_arguments(generate)
+
+    run = commands.add_parser('run', help='Time every entry point on each workbook')
+    add_case_arguments(run)
+    run.add_argument('--entries', nargs='+', choices=ENTRY_POINTS, default=list(ENTRY_POINTS),
+                     help='Entry points to time (default: all)')
+    run.add_argument('--repeat', type=int, default=3, help='Runs per measurement, the fastest is kept (default: 3)')
+    run.add_argument('-o', '--output', default='benchmark_results.json',
+                     help='Results file (default: %(default)s)')
+    run.add_argument('--baseline', help='Compare the results with this baseline when done')
+    run.add_argument('-v', '--verbose', action='store_true', help='Show the output of the entry points')
+
+    comparison = commands.add_parser('compare', help='Flag regressions against a baseline')
+    comparison.add_argument('baseline', help='Results of the reference run')
+    comparison.add_argument('results', help='Results of the run to check')
+    comparison.add_argument('--all', action='store_true', help='List unchanged measurements too')
+
+    for command in (run, comparison):
+        command.add_argument('--threshold', type=float, default=THRESHOLD,
+                             help=f'Slowdown flagged as a regression, as a share (default: {THRESHOLD})')
+        command.add_argument('--min-seconds', type=float, default=MIN_SECONDS,
+                             help=f'Smallest slowdown flagged, in seconds (default: {MIN_SECONDS})')
+
+    # Run by suite.measure in a fresh process for each measurement
+    measure = commands.add_parser('_measure')
+    for name in ('entry', 'input_path', 'output_dir', 'result_path'):
+        measure.add_argument(name)
+
+    args = parser.parse_args()
+    if args.command == '_measure':
+        # The entry points log with print; the parent discards it unless --verbose
+        measure_in_process(args.entry, args.input_path, args.output_dir, args.result_path)
+        return
+
+    if args.command == 'compare':
+        rows = compare(load_results(args.baseline), load_results(args.results), args.threshold, args.min_seconds)
+        print(format_rows(rows, args.all))
+        sys.exit(1 if any(row['status'] == 'regression' for row in rows) else 0)
+
+    rows_list = args.rows or (FULL_ROWS if args.full else QUICK_ROWS)
+    if args.command == 'generate':
+        for file_format in args.formats:
+            for rows in rows_list:
+                for ratio in args.distinct_ratio:
+                    for junk_rows in args.junk_rows:
+                        for mixed_types in args.mixed_types:
+                            try:
+                                path = make_workbook(os.path.join(args.workdir, 'workbooks'), rows, ratio,
+                                                     junk_rows, mixed_types, file_format)
+                            except (FormatUnavailable, ValueError) as e:
+                                print(f"Skipping .{file_format} with {rows} rows: {str(e)}")
+                                continue
+                            print(f"{path} ({os.path.getsize(path)} bytes)")
+        return
+
+    results = run_suite(rows_list, args.formats, args.distinct_ratio, args.junk_rows, args.mixed_types,
+                        args.entries, args.repeat, args.workdir, args.verbose)
+    save_results(results, args.output)
+    if args.baseline:
+        rows = compare(load_results(args.baseline), results, args.threshold, args.min_seconds)
+        print(format_rows(rows))
+        sys.exit(1 if any(row['status'] == 'regression' for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Comparison of benchmark results against a stored baseline.
+
+Each case and entry point found in both files is compared on its total
+wall time, the time of its whole process and each stage group. A
+measurement is a regression when it is both ``threshold`` (a share, default
+20%) and ``min_seconds`` slower than the baseline, so that noise on stages
+of a few milliseconds is not flagged. A case that succeeded in the baseline
+and fails now is always a regression.
+"""
+
+import json
+
+try:
+    from .suite import GROUPS
+except ImportError:
+    from suite import GROUPS
+
+THRESHOLD = 0.2
+MIN_SECONDS = 0.1
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _index(results):
+    return {(result['case'], result['entry']): result for result in results['results']}
+
+
+def compare(baseline, current, threshold=THRESHOLD, min_seconds=MIN_SECONDS):
+    """Return one row per measurement found in both results, worst change first.
+
+    Each row is a dict with the case, entry point, metric, both times, the
+    relative change and a status: 'regression', 'improvement' or 'ok'.
+    """
+    rows = []
+    baseline_index = _index(baseline)
+    for key, result in _index(current).items():
+        before = baseline_index.get(key)
+        if before is None or not before['success']:
+            continue
+        case, entry = key
+        if not result['success']:
+            rows.append({'case': case, 'entry': entry, 'metric': 'success', 'baseline': before['wall'],
+                         'current': None, 'change': None, 'status': 'regression',
+                         'note': result.get('error', 'failed')})
+            continue
+        # Time inside the job, then for the whole process with Python start-up
+        metrics = [('wall', before['wall'], result['wall']), ('elapsed', before['elapsed'], result['elapsed'])]
+        metrics += [(group, before['stages'].get(group, 0.0), result['stages'].get(group, 0.0)) for group in GROUPS]
+        for metric, old, new in metrics:
+            if not old and not new:
+                continue
+            change = (new - old) / old if old else None
+            if new - old >= min_seconds and (change is None or change >= threshold):
+                status = 'regression'
+            elif old - new >= min_seconds and change is not None and change <= -threshold:
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append({'case': case, 'entry': entry, 'metric': metric, 'baseline': old, 'current': new,
+                         'change': change, 'status': status})
+    order = {'regression': 0, 'improvement': 1, 'ok': 2}
+    rows.sort(key=lambda row: (order[row['status']], -abs(row['change'] or 0.0)))
+    return rows
+
+
+def format_rows(rows, show_all=False):
+    """Return the comparison as a table; only changed measurements unless ``show_all``."""
+    shown = [row for row in rows if show_all or row['status'] != 'ok']
+    if not shown:
+        return "No significant changes."
+    lines = [f"{'Case':<32} {'Entry':<16} {'Metric':<17} {'Baseline':>9} {'Current':>9} {'Change':>8}  Status"]
+    for row in shown:
+        current = f"{row['current']:.3f}" if row['current'] is not None else 'failed'
+        change = f"{100 * row['change']:+.1f}%" if row['change'] is not None else ''
+        status = row['status'] + (f" ({row['note']})" if row.get('note') else '')
+        lines.append(f"{row['case']:<32} {row['entry']:<16} {row['metric']:<17} {row['baseline']:>9.3f} "
+                     f"{current:>9} {change:>8}  {status}")
+    return '\n'.join(lines)
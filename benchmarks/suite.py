@@ -0,0 +1,273 @@
+"""
+Timing of each entry point on the generated workbooks.
+
+Every measurement runs in a fresh Python process, so start-up and imports
+count as they do for a user running the tools, and one measurement cannot
+warm the caches of the next. The entry point runs with profiling on (see
+src/profiling.py) and the stages of its profile are grouped into import,
+load, header detection, translation and save. A case is measured
+``repeat`` times and the fastest run is kept.
+
+Untranslated values go to a translation memory in the work directory, not
+to the one in glossary/, so the synthetic values never end up there.
+"""
+
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    from .workbooks import DEFAULT_FORMATS, XLS_MAX_ROWS, FormatUnavailable, can_write, make_workbook
+except ImportError:
+    from workbooks import DEFAULT_FORMATS, XLS_MAX_ROWS, FormatUnavailable, can_write, make_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_VERSION = 1
+ENTRY_POINTS = ('excel_processor', 'converter', 'excel_converter', 'streaming')
+COLUMNS = ['Description', 'Message']
+# Profile stages (see src/profiling.py) grouped under the headings reported
+STAGE_GROUPS = {
+    'import pandas': 'import',
+    'load': 'load',
+    'load glossaries': 'load',
+    'check watermark': 'load',
+    'header detection': 'header detection',
+    'detect columns': 'translation',
+    'translate': 'translation',
+    'insert columns': 'translation',
+    # Streaming reads, translates and writes each row in turn
+    'read, translate and write rows': 'translation',
+    'save': 'save',
+    'record misses': 'save',
+    'report': 'save',
+}
+GROUPS = ('import', 'load', 'header detection', 'translation', 'save', 'other')
+
+
+def default_workdir():
+    return os.path.join(tempfile.gettempdir(), 'translingoo_benchmarks')
+
+
+def case_name(file_format, rows, distinct_ratio, junk_rows, mixed_types):
+    return f"{file_format}-{rows}r-d{distinct_ratio:g}-j{junk_rows}{'-mixed' if mixed_types else ''}"
+
+
+def group_stages(stages):
+    """Add up the wall time of profile stages by STAGE_GROUPS heading."""
+    groups = dict.fromkeys(GROUPS, 0.0)
+    for stage in stages:
+        groups[STAGE_GROUPS.get(stage['stage'], 'other')] += stage['wall']
+    return {group: round(seconds, 6) for group, seconds in groups.items()}
+
+
+def run_entry(entry, input_path, output_dir):
+    """Run one entry point on a workbook with profiling on; return ``(success, profile path)``."""
+    sys.path.insert(0, ROOT)
+    from src.profiling import profile_path
+
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    if entry == 'excel_processor':
+        from src.excel_processor import ExcelProcessor
+
+        output_path = os.path.join(output_dir, f"{stem}_processor.xlsx")
+        processor = ExcelProcessor(profile=True)
+        success = (processor.load_excel(input_path) and processor.process_file(COLUMNS)
+                   and processor.save_excel(output_path))
+        if not os.path.exists(profile_path(output_path)):
+            # Stopped before save_excel, which saves the profile
+            processor.profile.save(output_path, input_path)
+    elif entry == 'converter':
+        from converter import convert_and_process
+
+        output_path = os.path.join(output_dir, f"{stem}_converter.xlsx")
+        success = convert_and_process(input_path, output_path, COLUMNS, profile=True)
+    elif entry == 'excel_converter':
+        from excel_converter import convert_excel_to_csv
+
+        output_path = os.path.join(output_dir, f"{stem}_converter.csv")
+        success = convert_excel_to_csv(input_path, output_path, profile=True)
+    elif entry == 'streaming':
+        from src.profiling import start_profile
+        from src.streaming import stream_translate
+
+        output_path = os.path.join(output_dir, f"{stem}_streaming.xlsx")
+        profile = start_profile(True)
+        success, _ = stream_translate(input_path, output_path, COLUMNS, max_rows=None, profile=profile)
+        profile.save(output_path, input_path)
+    else:
+        raise ValueError(f"Unknown entry point: {entry}")
+    return bool(success), profile_path(output_path)
+
+
+def measure_in_process(entry, input_path, output_dir, result_path):
+    """Body of the child process: run the entry point and write what it measured."""
+    start = time.perf_counter()
+    try:
+        success, path = run_entry(entry, input_path, output_dir)
+        with open(path, encoding='utf-8') as f:
+            profile = json.load(f)
+        result = {'success': success, 'profile': profile}
+    except Exception as e:
+        result = {'success': False, 'error': f"{type(e).__name__}: {str(e)}"}
+    result['seconds'] = time.perf_counter() - start
+    # Kilobytes on Linux
+    result['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def measure(entry, input_path, workdir, verbose=False):
+    """Run one entry point on a workbook in a fresh process and return its result."""
+    output_dir = tempfile.mkdtemp(prefix=f"{entry}_", dir=workdir)
+    result_path = os.path.join(output_dir, 'result.json')
+    env = dict(os.environ, TRANSLINGOO_MISSES_DB=os.path.join(workdir, 'misses.sqlite3'))
+    output = None if verbose else subprocess.DEVNULL
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-m', 'benchmarks', '_measure', entry, input_path, output_dir,
+                              result_path], cwd=ROOT, env=env, stdout=output, stderr=output)
+    elapsed = time.perf_counter() - start
+    try:
+        with open(result_path, encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        result = {'success': False, 'error': f"process exited with status {process.returncode}"}
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    result['elapsed'] = elapsed
+    return result
+
+
+def summarize(case, entry, runs):
+    """Reduce the runs of one case and entry point to the fastest successful one."""
+    succeeded = [run for run in runs if run['success']]
+    summary = dict(case, entry=entry, success=bool(succeeded), runs=len(runs))
+    if not succeeded:
+        last = runs[-1]
+        summary['error'] = last.get('error') or _failed_attempts(last)
+        return summary
+    best = min(succeeded, key=lambda run: run['profile']['wall'])
+    profile = best['profile']
+    summary.update({
+        # Inside the job, and for the whole process including Python start-up
+        'wall': profile['wall'],
+        'cpu': profile['cpu'],
+        'elapsed': round(min(run['elapsed'] for run in succeeded), 6),
+        'max_rss_kb': best['max_rss_kb'],
+        'stages': group_stages(profile['stages']),
+        'profile_stages': profile['stages'],
+        'path': profile['info'].get('path'),
+        'distinct_values': profile['info'].get('distinct_values'),
+    })
+    return summary
+
+
+def _failed_attempts(run):
+    attempts = run.get('profile', {}).get('info', {}).get('attempts', [])
+    return '; '.join(f"{a['path']}: {a.get('error', 'failed')}" for a in attempts if not a['success']) or 'failed'
+
+
+def can_read(file_format):
+    """pandas reads .ods files with odfpy, which the tools do not require."""
+    if file_format != 'ods':
+        return True
+    try:
+        import odf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_cases(rows_list, formats, distinct_ratios, junk_rows_list, mixed_types_list):
+    cases, skipped = [], []
+    for file_format in formats:
+        for rows in rows_list:
+            for distinct_ratio in distinct_ratios:
+                for junk_rows in junk_rows_list:
+                    for mixed_types in mixed_types_list:
+                        case = {'case': case_name(file_format, rows, distinct_ratio, junk_rows, mixed_types),
+                                'format': file_format, 'rows': rows, 'distinct_ratio': distinct_ratio,
+                                'junk_rows': junk_rows, 'mixed_types': mixed_types}
+                        if not can_write(file_format):
+                            skipped.append(dict(case, reason="xlwt is not installed"))
+                        elif not can_read(file_format):
+                            skipped.append(dict(case, reason="odfpy is not installed"))
+                        elif file_format == 'xls' and rows + junk_rows + 1 > XLS_MAX_ROWS:
+                            skipped.append(dict(case, reason=f"more than {XLS_MAX_ROWS} rows"))
+                        else:
+                            cases.append(case)
+    return cases, skipped
+
+
+def applies(entry, file_format):
+    # stream_translate only reads .xlsx
+    return entry != 'streaming' or file_format == 'xlsx'
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(rows_list, formats=DEFAULT_FORMATS, distinct_ratios=(0.05,), junk_rows_list=(3,), mixed_types_list=(True,),
+              entries=ENTRY_POINTS, repeat=3, workdir=None, verbose=False):
+    """Generate the workbooks, measure every entry point on each and return the results."""
+    workdir = workdir or default_workdir()
+    os.makedirs(workdir, exist_ok=True)
+    cases, skipped = build_cases(rows_list, formats, distinct_ratios, junk_rows_list, mixed_types_list)
+    for case in skipped:
+        print(f"Skipping {case['case']}: {case['reason']}")
+
+    results = []
+    for case in cases:
+        start = time.perf_counter()
+        try:
+            input_path = make_workbook(os.path.join(workdir, 'workbooks'), case['rows'], case['distinct_ratio'],
+                                       case['junk_rows'], case['mixed_types'], case['format'])
+        except (FormatUnavailable, ValueError) as e:
+            skipped.append(dict(case, reason=str(e)))
+            print(f"Skipping {case['case']}: {str(e)}")
+            continue
+        print(f"{case['case']}: {os.path.getsize(input_path)} bytes, generated or found in "
+              f"{time.perf_counter() - start:.1f}s")
+        case = dict(case, input_bytes=os.path.getsize(input_path))
+        for entry in entries:
+            if not applies(entry, case['format']):
+                continue
+            runs = [measure(entry, input_path, workdir, verbose) for _ in range(repeat)]
+            summary = summarize(case, entry, runs)
+            results.append(summary)
+            if summary['success']:
+                stages = '  '.join(f"{group} {seconds:.3f}" for group, seconds in summary['stages'].items() if seconds)
+                print(f"  {entry:<16} {summary['wall']:>8.3f}s  ({stages})")
+            else:
+                # The last way of reading the file tried says the most
+                print(f"  {entry:<16}   failed  ({summary['error'].split('; ')[-1][:100]})")
+
+    return {
+        'version': RESULTS_VERSION,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {'rows': list(rows_list), 'formats': list(formats), 'distinct_ratios': list(distinct_ratios),
+                   'junk_rows': list(junk_rows_list), 'mixed_types': list(mixed_types_list),
+                   'entries': list(entries), 'repeat': repeat},
+        'skipped': skipped,
+        'results': results,
+    }
+
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Saved results to {path}")
@@ -0,0 +1,231 @@
+"""
+Synthetic alarm exports for the benchmarks.
+
+The workbooks look like the SCADA exports the tools are used on: a few junk
+rows (title, site, export date) above the header, then one alarm per row
+with a timestamp, the bay, a Description taken from the glossary terms (or
+a misspelling of one that fuzzy matching corrects, or a value the glossary
+does not know), a status
+Message and a few numeric, boolean and empty cells. The number of rows, the
+share of distinct Description values, the junk rows and the mixed cell
+types can all be varied, and the same parameters always give the same file.
+
+.xlsx files are written with openpyxl and .ods files with the small writer
+below, so neither needs more than the tools themselves. .xls files need
+xlwt, which is not a dependency; without it they cannot be generated, so
+they are left out of DEFAULT_FORMATS and only made when asked for.
+"""
+
+import datetime
+import functools
+import os
+import random
+import sys
+import zipfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.translator import get_glossary
+
+# Bump when the generated content changes, so cached workbooks are rebuilt
+GENERATOR_VERSION = 2
+FORMATS = ('xlsx', 'xls', 'ods')
+# Formats generated unless others are asked for; .xls needs xlwt
+DEFAULT_FORMATS = ('xlsx', 'ods')
+# Rows an .xls sheet can hold, header and junk rows included
+XLS_MAX_ROWS = 65536
+
+HEADER = ['Time', 'Origin', 'Description', 'Message', 'Type', 'Priority', 'Value', 'Acknowledged', 'Operator']
+MESSAGES = ['Set', 'Reset', 'Set - App Ack', 'Reset - App Ack', 'OPEN - Clearing',
+            'Fail - App Ack', 'Healthy', 'Operated', 'Alarm', 'Normal']
+JUNK_ROWS = [['Alarm Summary Report'], ['Site:', 'SUBSTATION 12'], ['Exported:', '2024-01-01 00:00'],
+             [], ['Filter:', 'All bays', None, 'All priorities']]
+# Share of the distinct Description values that the glossary can translate
+KNOWN_SHARE = 0.75
+
+
+class FormatUnavailable(Exception):
+    """The library needed to write a format is not installed."""
+
+
+def can_write(file_format):
+    if file_format != 'xls':
+        return True
+    try:
+        import xlwt  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def workbook_name(rows, distinct_ratio, junk_rows, mixed_types, file_format):
+    """File name encoding the generation parameters, used as a cache key."""
+    return (f"alarms_v{GENERATOR_VERSION}_{rows}r_d{distinct_ratio:g}_j{junk_rows}"
+            f"{'_mixed' if mixed_types else ''}.{file_format}")
+
+
+def _misspellings(glossary):
+    """Yield the terms with one letter dropped that fuzzy matching corrects back."""
+    if glossary.fuzzy is None:
+        return
+    terms = sorted(glossary.terms)
+    for position in range(1, max(len(term) for term in terms)):
+        for term in terms:
+            if position >= len(term) - 1:
+                continue
+            misspelled = term[:position] + term[position + 1:]
+            # Most short words and terms are out of reach (see fuzzy.py)
+            match = glossary.fuzzy.match(misspelled)
+            if match is not None and glossary.terms[match[0]] == glossary.terms[term]:
+                yield misspelled
+
+
+@functools.lru_cache(maxsize=1)
+def _known_values():
+    """Description values the glossary knows: its terms, recased and misspelled."""
+    glossary = get_glossary()
+    terms = sorted(glossary.terms)
+    values = list(terms)
+    values += [term.title() for term in terms] + [term.lower() for term in terms]
+    values += _misspellings(glossary)
+    unique = list(dict.fromkeys(values))
+    random.Random(0).shuffle(unique)
+    return unique
+
+
+def description_values(distinct):
+    """Return ``distinct`` Description values, about KNOWN_SHARE of them known."""
+    known = _known_values()[:int(distinct * KNOWN_SHARE)]
+    unknown = [f"UNKNOWN SIGNAL {i}" for i in range(distinct - len(known))]
+    return known + unknown
+
+
+def alarm_rows(rows, distinct_ratio=0.05, junk_rows=3, mixed_types=True, seed=0):
+    """Yield the junk rows, the header and ``rows`` alarm rows as lists."""
+    rng = random.Random(seed)
+    descriptions = description_values(max(1, int(rows * distinct_ratio)))
+    for i in range(junk_rows):
+        yield list(JUNK_ROWS[i % len(JUNK_ROWS)])
+    yield list(HEADER)
+    start = datetime.datetime(2024, 1, 1)
+    for i in range(rows):
+        description = rng.choice(descriptions)
+        message = rng.choice(MESSAGES)
+        row = [start + datetime.timedelta(seconds=7 * i), f"BAY-{rng.randint(1, 12)}", description, message,
+               rng.choice(['Alarm', 'Event'])]
+        if mixed_types:
+            draw = rng.random()
+            if draw < 0.02:
+                row[2] = None
+            elif draw < 0.03:
+                # Some exports put the numeric signal code where the text is missing
+                row[2] = rng.randint(1000, 9999)
+            if rng.random() < 0.02:
+                row[3] = None
+            row += [rng.randint(1, 4), round(rng.uniform(0, 400), 2), rng.random() < 0.5,
+                    'operator' if rng.random() < 0.1 else None]
+        else:
+            row += [str(rng.randint(1, 4)), f"{rng.uniform(0, 400):.2f}", 'TRUE', '']
+        yield row
+
+
+def write_xlsx(path, rows):
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Alarms')
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def write_xls(path, rows):
+    try:
+        import xlwt
+    except ImportError:
+        raise FormatUnavailable("writing .xls files needs xlwt (pip install xlwt)")
+
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet('Alarms')
+    date_style = xlwt.easyxf(num_format_str='yyyy-mm-dd hh:mm:ss')
+    for r, row in enumerate(rows):
+        if r >= XLS_MAX_ROWS:
+            raise ValueError(f".xls sheets hold at most {XLS_MAX_ROWS} rows")
+        for c, value in enumerate(row):
+            if isinstance(value, datetime.datetime):
+                ws.write(r, c, value, date_style)
+            elif value is not None:
+                ws.write(r, c, value)
+    wb.save(path)
+
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def _ods_cell(value):
+    if value is None:
+        return '<table:table-cell/>'
+    if isinstance(value, bool):
+        return (f'<table:table-cell office:value-type="boolean" office:boolean-value="{str(value).lower()}">'
+                f'<text:p>{str(value).upper()}</text:p></table:table-cell>')
+    if isinstance(value, (int, float)):
+        return (f'<table:table-cell office:value-type="float" office:value="{value!r}">'
+                f'<text:p>{value!r}</text:p></table:table-cell>')
+    if isinstance(value, datetime.datetime):
+        return (f'<table:table-cell office:value-type="date" office:date-value="{value.isoformat()}">'
+                f'<text:p>{value:%Y-%m-%d %H:%M:%S}</text:p></table:table-cell>')
+    return f'<table:table-cell office:value-type="string"><text:p>{_escape(str(value))}</text:p></table:table-cell>'
+
+
+ODS_MANIFEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">
+ <manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>
+ <manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>
+</manifest:manifest>
+'''
+ODS_CONTENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+    '<office:body><office:spreadsheet><table:table table:name="Alarms">'
+)
+ODS_CONTENT_TAIL = '</table:table></office:spreadsheet></office:body></office:document-content>'
+
+
+def write_ods(path, rows):
+    """Write a single-sheet OpenDocument spreadsheet, streaming the rows."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        # The mimetype comes first and uncompressed, as the format requires
+        archive.writestr(zipfile.ZipInfo('mimetype'), 'application/vnd.oasis.opendocument.spreadsheet',
+                         compress_type=zipfile.ZIP_STORED)
+        archive.writestr('META-INF/manifest.xml', ODS_MANIFEST)
+        with archive.open('content.xml', 'w', force_zip64=True) as content:
+            content.write(ODS_CONTENT_HEAD.encode('utf-8'))
+            for row in rows:
+                cells = ''.join(_ods_cell(value) for value in row)
+                content.write(f'<table:table-row>{cells}</table:table-row>'.encode('utf-8'))
+            content.write(ODS_CONTENT_TAIL.encode('utf-8'))
+
+
+WRITERS = {'xlsx': write_xlsx, 'xls': write_xls, 'ods': write_ods}
+
+
+def make_workbook(directory, rows, distinct_ratio=0.05, junk_rows=3, mixed_types=True, file_format='xlsx', seed=0):
+    """Return the path of a generated alarm workbook, writing it if it is not cached in ``directory``.
+
+    Raises FormatUnavailable if the format cannot be written here.
+    """
+    path = os.path.join(directory, workbook_name(rows, distinct_ratio, junk_rows, mixed_types, file_format))
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    # Written under another name so an interrupted run leaves no truncated file behind
+    partial_path = f"{path}.partial.{file_format}"
+    try:
+        WRITERS[file_format](partial_path, alarm_rows(rows, distinct_ratio, junk_rows, mixed_types, seed))
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return path
@@ -3,14 +3,82 @@
 Excel Converter - A simple script to convert Excel files and process translations
 """
 
-import pandas as pd
 import os
 import sys
 import argparse
 import re
+import signal
+from functools import partial
 
-def convert_and_process(input_file, output_file=None, columns_to_translate=None):
-    """Convert an Excel file and apply translations."""
+# The glossaries (glossary/en_*.tsv) and translation engine are shared with the
+# web app and the GUIs
+from src.batch import MANIFEST_NAME, Manifest, expand_inputs, is_batch, output_path, run_batch
+from src.coverage import build_report, write_report
+from src.daemon import DEFAULT_PORT, TranslationServer
+from src.detection import detect_columns, sample_dataframe
+from src.excel_processor import insert_translated_columns, translate_column_languages, warm_up
+from src.glossary import available_languages, target_column_name
+from src.profiling import attempt, note, stage, start_profile
+from src.streaming import HEADER_SEARCH_ROWS, can_stream, header_index, match_columns, stream_translate
+from src.translation_memory import MissRecorder
+from src.translator import get_glossaries, watch_glossary
+from src.watch import FolderWatcher
+
+# Smaller .xlsx files are translated with the streaming reader and writer,
+# which do not need pandas; importing it takes longer than the whole job
+FAST_PATH_MAX_BYTES = 1024 * 1024
+
+def save_translated(df, columns_map, input_file, output_file, languages=None, reverse=False, profile=None):
+    """Add the translated columns, save the file and write its coverage report.
+
+    Each translated column is inserted right after its source column, as the
+    streaming path does, so both give the same workbook.
+    """
+    with stage(profile, 'load glossaries'):
+        glossaries = get_glossaries(languages, reverse)
+    recorder = MissRecorder(input_file)
+    stats = {'rows': len(df), 'coverage': {}, 'glossary_versions': {g.language: g.version for g in glossaries}}
+    distinct_values = {}
+    for original_col, actual_col in columns_map.items():
+        print(f"Translating column: {actual_col}")
+        
+        # One new column per target language, translating each distinct value once
+        with stage(profile, 'translate'):
+            translated, distinct_values[actual_col], counts = translate_column_languages(
+                df[actual_col], glossaries, actual_col, recorder)
+        new_columns = []
+        for glossary in glossaries:
+            new_column_name = target_column_name(actual_col, glossary.language)
+            new_columns.append(translated[glossary.language].rename(new_column_name))
+            stats['coverage'][new_column_name] = counts[glossary.language]
+        df = insert_translated_columns(df, actual_col, new_columns)
+    
+    with stage(profile, 'save'):
+        df.to_excel(output_file, index=False)
+    with stage(profile, 'record misses'):
+        recorder.flush()
+    with stage(profile, 'report'):
+        write_report(build_report(input_file, output_file, stats, glossaries[0].version), output_file)
+    if profile is not None:
+        profile.note('rows', len(df))
+        profile.note('distinct_values', distinct_values)
+        profile.note_glossaries(glossaries)
+
+def detected_columns(df, columns_map, languages=None, reverse=False, profile=None):
+    """Return columns_map with the columns the glossary knows added to it."""
+    with stage(profile, 'detect columns'):
+        detected = detect_columns(sample_dataframe(df), get_glossaries(languages, reverse)[0])
+    found = set(columns_map.values())
+    return dict(columns_map, **{col: col for col in detected if col not in found})
+
+def convert_and_process(input_file, output_file=None, columns_to_translate=None, languages=None, reverse=False,
+                        auto_detect=False, incremental=False, profile=False, cprofile=False):
+    """Convert an Excel file and apply translations.
+    
+    With ``profile`` (or ``cprofile``, which adds a cProfile dump), the time
+    spent in each stage is printed and saved next to the output, whether
+    the conversion succeeds or not (see src/profiling.py).
+    """
     
     if not os.path.exists(input_file):
         print(f"Error: File {input_file} does not exist.")
@@ -22,12 +90,52 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
         name_without_ext = os.path.splitext(basename)[0]
         output_file = f"{name_without_ext}_translated.xlsx"
     
+    job_profile = start_profile(profile, cprofile)
+    try:
+        success = translate_workbook(input_file, output_file, columns_to_translate, languages, reverse,
+                                     auto_detect, incremental, job_profile)
+    finally:
+        if job_profile is not None:
+            job_profile.stop()
+    if job_profile is not None:
+        job_profile.note('success', success)
+        job_profile.save(output_file, input_file)
+    return success
+
+def translate_workbook(input_file, output_file, columns_to_translate=None, languages=None, reverse=False,
+                       auto_detect=False, incremental=False, profile=None):
+    """Try each way of reading the file until one translates it; see convert_and_process."""
+    
     print(f"Processing {input_file} to {output_file}...")
     
     # Default columns to translate if none specified
     if columns_to_translate is None:
         columns_to_translate = ["Description", "Message"]
     
+    if incremental:
+        if can_stream(input_file):
+            # Only the rows appended since the last run are translated
+            success, _ = stream_translate(input_file, output_file, columns_to_translate, max_rows=None,
+                                          languages=languages, reverse=reverse, auto_detect=auto_detect,
+                                          incremental=True, profile=profile)
+            attempt(profile, 'incremental streaming', success)
+            return success
+        print(f"Warning: Incremental mode needs an .xlsx file, translating all of {input_file}")
+    
+    if can_stream(input_file) and os.path.getsize(input_file) <= FAST_PATH_MAX_BYTES:
+        success, _ = stream_translate(input_file, output_file, columns_to_translate, max_rows=None,
+                                      languages=languages, reverse=reverse, auto_detect=auto_detect,
+                                      lightweight=True, skip_missing=True, profile=profile)
+        attempt(profile, 'lightweight streaming', success)
+        if success:
+            print(f"Successfully saved translated file: {output_file}")
+            return True
+        print("Retrying with pandas...")
+    
+    with stage(profile, 'import pandas'):
+        import pandas as pd
+    note(profile, 'engine', 'pandas')
+    
     # Try different engines to read the Excel file
     engines = ['xlrd', 'openpyxl', 'odf']
     
@@ -35,8 +143,13 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
         try:
             print(f"Trying with engine: {engine}")
             
-            # First attempt: Just read the file directly
-            df = pd.read_excel(input_file, engine=engine)
+            # Find the header row the way the streaming path does, then read below it
+            with stage(profile, 'header detection'):
+                head = pd.read_excel(input_file, engine=engine, header=None, nrows=HEADER_SEARCH_ROWS)
+                header_row = header_index(head.astype(object).where(head.notna(), None).itertuples(index=False))
+            with stage(profile, 'load'):
+                df = pd.read_excel(input_file, engine=engine, header=header_row)
+            df.columns = [str(col).strip() for col in df.columns]
             
             # Check if we have data and the required columns
             if len(df) > 0:
@@ -44,194 +157,130 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
                 print(f"Columns: {df.columns.tolist()}")
                 print(f"Shape: {df.shape}")
                 
-                # Find the actual columns to translate (case insensitive)
-                columns_map = {}
-                for col in columns_to_translate:
-                    found = False
-                    for df_col in df.columns:
-                        if col.lower() == str(df_col).lower():
-                            columns_map[col] = df_col
-                            found = True
-                            break
-                    if not found:
-                        print(f"Warning: Column '{col}' not found in the Excel file")
+                # Find the actual columns to translate (exact, then case insensitive)
+                positions = match_columns(list(df.columns), columns_to_translate)
+                columns_map = {col: df.columns[i] for col, i in positions.items()}
+                
+                if auto_detect:
+                    columns_map = detected_columns(df, columns_map, languages, reverse, profile)
                 
+                note(profile, 'header_row', header_row)
                 if columns_map:
-                    # Apply translations to each column
-                    for original_col, actual_col in columns_map.items():
-                        print(f"Translating column: {actual_col}")
-                        
-                        # Create a new column for translations
-                        new_column_name = f"{actual_col} Français"
-                        
-                        # Apply translation to each cell
-                        df[new_column_name] = df[actual_col].apply(lambda x: translate_text(x))
-                        
-                    # Save the result
-                    df.to_excel(output_file, index=False)
+                    # Translate, save and write the coverage report
+                    save_translated(df, columns_map, input_file, output_file, languages, reverse, profile)
+                    attempt(profile, engine, True)
                     print(f"Successfully saved translated file: {output_file}")
                     return True
                 else:
                     print("No columns to translate were found in the file")
+                    attempt(profile, engine, False, 'no columns to translate')
                     return False
+            attempt(profile, engine, False, 'no rows')
             
         except Exception as e:
             print(f"Failed with engine {engine}: {str(e)}")
-            
-            # Try with additional options
-            try:
-                print(f"Trying with {engine} and header detection...")
-                # Read without headers first
-                raw_df = pd.read_excel(input_file, engine=engine, header=None)
-                
-                if len(raw_df) > 0:
-                    # Find the header row
-                    header_row = None
-                    for i in range(min(20, len(raw_df))):
-                        row_str = ' '.join(raw_df.iloc[i].astype(str).values)
-                        if 'Description' in row_str and ('Message' in row_str or 'Type' in row_str):
-                            header_row = i
-                            break
-                    
-                    if header_row is not None:
-                        print(f"Found header at row {header_row}")
-                        df = pd.read_excel(input_file, engine=engine, header=header_row)
-                        
-                        # Check if we have the columns to translate
-                        columns_map = {}
-                        for col in columns_to_translate:
-                            found = False
-                            for df_col in df.columns:
-                                if col.lower() == str(df_col).lower():
-                                    columns_map[col] = df_col
-                                    found = True
-                                    break
-                            if not found:
-                                print(f"Warning: Column '{col}' not found in the Excel file")
-                        
-                        if columns_map:
-                            # Apply translations to each column
-                            for original_col, actual_col in columns_map.items():
-                                print(f"Translating column: {actual_col}")
-                                
-                                # Create a new column for translations
-                                new_column_name = f"{actual_col} Français"
-                                
-                                # Apply translation to each cell
-                                df[new_column_name] = df[actual_col].apply(lambda x: translate_text(x))
-                            
-                            # Save the result
-                            df.to_excel(output_file, index=False)
-                            print(f"Successfully saved translated file: {output_file}")
-                            return True
-                        else:
-                            print("No columns to translate were found in the file")
-                            return False
-            except Exception as sub_e:
-                print(f"Failed with {engine} and header detection: {str(sub_e)}")
+            attempt(profile, engine, False, e)
     
     print("All processing methods failed.")
     return False
 
-def translate_text(text):
-    """Translate text from English to French."""
-    if pd.isna(text) or text is None or str(text).strip() == '':
-        return text
-        
-    # Dictionary of translations
-    translations = {
-        # Common values in Description and Message columns
-        'ABSENCE OF REFERENCE VOLTAGE': 'ABSENCE DE TENSION DE REFERENCE',
-        'ABSENCE OF VOLTAGE': 'ABSENCE DE TENSION',
-        'DEAD INCOMING DEAD RUNNING': 'ENTRÉE HORS TENSION, FONCTIONNEMENT HORS TENSION',  
-        'DEAD INCOMING  DEAD RUNNING': 'ENTRÉE HORS TENSION, FONCTIONNEMENT HORS TENSION',  
-        'LIVE INCOMING LIVE RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT SOUS TENSION',   
-        'LIVE INCOMING  LIVE RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT SOUS TENSION',  
-        'CLOSE PERMISSIVE': 'AUTORISATION DE FERMETURE',
-        'PRESENE OF REFERENCE VOLTAGE': 'PRÉSENCE DE TENSION DE RÉFÉRENCE',
-        'PRASENCE OF VOLTAGE': 'PRÉSENCE DE TENSION',
-        'LIVE INCOMING  DEAD RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT HORS TENSION',
-        'POSSIBLE CLOSING': 'FERMETURE AUTORISEE',
-        'BUS-1 SELECT': 'SÉLECTION DU BUS-1',
-        'BUS-2 DESELECT': 'DÉSÉLECTION DU BUS-2',
-        'BAY L/R MODE': 'MODE LOCAL/DISTANT DE LA TRAVÉE',
-        'BAY L/R  MODE': 'MODE L/R TRAVEE',
-        'IINTERLOCK PERMISSIVE': 'VERROUILLAGE AUTORISÉ',
-        'CARRIER IN': 'PORTEUSE ENTRANTE',
-        'CARRIER OUT': 'PORTEUSE SORTANTE',
-        'EQUIPMENT BCU': 'EQUIPEMENT BCU',
-        'COMMUNICATION': 'COMMUNICATION',
-        'UNLOCKING RELAY ACTIVATED': 'RELAIS DEVERROUILLAGE ACTIVE',
-        'PROTECTION': 'PROTECTION',
-        'STAGE START': 'DEMARRAGE ETAPE',
-        'STAGE': 'ETAPE',
-        'TRIP CIRCUIT FAULT': 'DEFAUT CIRCUIT DE DECLENCHEMENT',
-        'I/L PERMISSIVE': 'PERMISSIF V/F',
-        'CLOSE I/L PERMISSIVE': 'PERMISSIF V/F FERMETURE',
-        'OPEN I/L PERMISSIVE': 'PERMISSIF V/F OUVERTURE',
-        
-        # Alarm/status values typically in Message column
-        'Set': 'Réglé',
-        'Set - App Ack': 'Réglé - App Ack',
-        'SET': 'RÉGLÉ',
-        'SET - APP ACK': 'RÉGLÉ - APP ACK',
-        'Reset': 'Réinitialiser',
-        'Reset - App Ack': 'Réinitialiser - App Ack',
-        'RESET': 'RÉINITIALISER',
-        'RESET - APP ACK': 'RÉINITIALISER - APP ACK',
-        'Operational': 'Opérationnel',
-        'OPERATIONAL': 'OPÉRATIONNEL',
-        'Alarm': 'Alarme',
-        'ALARM': 'ALARME',
-        'Normal': 'Normal',
-        'NORMAL': 'NORMAL',
-        'Operated': 'Opéré',
-        'OPERATED': 'OPÉRÉ',
-        'TRIP - App Ack': 'DÉCLENCHEMENT - App Ack',
-        'OPEN - App Ack': 'OUVERT - App Ack',
-        'OPEN - Clearing': 'OUVERT - Effacement',
-        'Fail - App Ack': 'Défaillance - App Ack',
-        'Fail - Clearing': 'Défaillance - Effacement',
-        'Faulty - Clearing': 'Défectueux - Effacement',
-        'Operated - Clearing': 'Opéré - Effacement',
-        'Operated - App Ack': 'Opéré - App Ack',
-        'OFF - App Ack': 'DÉSACTIVÉ - App Ack',
-        'Off - App Ack': 'Désactivé - App Ack',
-        'Trip': 'Déclenchement',
-        'Closed': 'Fermé',
-        'On Sync': 'En Synchronisation',
-        'Healthy': 'En Bon État',
-        'Operational Mode': 'Mode Opérationnel',
-        'Fail': 'Défaillance',
-        'Faulty': 'Défectueux',
-        'Off': 'Désactivé'
-    }
-    
-    # Try to find a direct match
-    text_str = str(text).strip().upper()
-    
-    if text_str in translations:
-        return translations[text_str]
-    
-    # Try with normalized spacing
-    normalized_text = ' '.join(text_str.split())
-    for key, value in translations.items():
-        if normalized_text == ' '.join(key.upper().split()):
-            return value
-    
-    # If no translation found, return original
-    return text
-
 def main():
     """Main function to parse arguments and process Excel files."""
     parser = argparse.ArgumentParser(description='Process Excel files and apply translations.')
-    parser.add_argument('input_file', help='Path to the input Excel file (.xls or .xlsx)')
-    parser.add_argument('-o', '--output', help='Path to the output Excel file (default: input_name_translated.xlsx)')
+    parser.add_argument('inputs', nargs='*', metavar='input_file',
+                        help='Input Excel file (.xls or .xlsx), or directories and glob patterns for a batch')
+    parser.add_argument('-o', '--output', help='Output Excel file (default: input_name_translated.xlsx), '
+                                               'or output directory for a batch (default: next to each input)')
     parser.add_argument('-c', '--columns', nargs='+', help='Columns to translate (default: Description Message)')
+    parser.add_argument('-l', '--languages', nargs='+', choices=available_languages(),
+                        help='Target languages, one column each (default: fr)')
+    parser.add_argument('-r', '--reverse', action='store_true',
+                        help='Translate from the language given with -l (default: fr) back to English')
+    parser.add_argument('-a', '--auto-detect', action='store_true',
+                        help='Translate the columns whose values are in the glossary, whatever their name')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help='Only translate the rows appended to an .xlsx log since the previous run '
+                             'and add them to its output')
+    parser.add_argument('-j', '--workers', type=int, help='Files translated at once in a batch (default: CPU count), '
+                                                          'or by the translation service (default: 1)')
+    parser.add_argument('--manifest', help=f'Batch manifest, used to resume an interrupted batch '
+                                           f'(default: {MANIFEST_NAME} in the output directory)')
+    parser.add_argument('-w', '--watch', metavar='DIR',
+                        help='Keep running and translate every Excel file dropped into DIR '
+                             '(output directory: -o, default DIR/translated)')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help='Seconds a dropped file must stay unchanged before it is translated (default: 2)')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='Seconds between rescans of the watched directory (default: 5)')
+    parser.add_argument('--serve', type=int, nargs='?', const=DEFAULT_PORT, metavar='PORT',
+                        help=f'Keep running and translate the workbooks posted to http://HOST:PORT/translate '
+                             f'(default port: {DEFAULT_PORT})')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Address the translation service listens on (default: %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time spent in each stage and save it to <output>.profile.json')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='Also run under cProfile and dump the statistics to <output>.pstats (implies --profile)')
     
     args = parser.parse_args()
+    if args.reverse and args.languages and len(args.languages) > 1:
+        parser.error('--reverse takes a single language')
+    if not args.inputs and not args.watch and args.serve is None:
+        parser.error('an input file, directory, --watch DIR or --serve is required')
+    
+    job = partial(convert_and_process, columns_to_translate=args.columns, languages=args.languages,
+                  reverse=args.reverse, auto_detect=args.auto_detect, incremental=args.incremental,
+                  profile=args.profile, cprofile=args.cprofile)
+    
+    if args.serve is not None:
+        # Import the engines and load the glossaries before accepting jobs, so
+        # the first file is as fast as the others
+        warm_up()
+        get_glossaries(args.languages, args.reverse)
+        watch_glossary()
+        server = TranslationServer(job, args.host, args.serve, args.workers or 1)
+        # PID 1 of a container ignores SIGTERM unless it installs a handler
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Translation service listening on http://{args.host}:{args.serve}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            print("Stopped serving.")
+        sys.exit(0)
+    
+    if args.watch:
+        # Load the glossaries once; every dropped file reuses them
+        get_glossaries(args.languages, args.reverse)
+        watch_glossary()
+        watcher = FolderWatcher(args.watch, job, args.output, settle=args.settle, interval=args.interval)
+        signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+        print("Stopped watching.")
+        sys.exit(0)
+    
+    if is_batch(args.inputs):
+        # Spread the files over a process pool, skipping those already done
+        files = expand_inputs(args.inputs, exclude_suffix='_translated.xlsx')
+        if not files:
+            print("No Excel files to process.")
+            sys.exit(1)
+        manifest = Manifest(args.manifest or os.path.join(args.output or '.', MANIFEST_NAME))
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+        settings = {'columns': args.columns, 'languages': args.languages, 'reverse': args.reverse,
+                    'auto_detect': args.auto_detect}
+        failed = run_batch(files, job, partial(output_path, output_dir=args.output), args.workers, manifest,
+                           settings)
+        sys.exit(1 if failed else 0)
     
-    success = convert_and_process(args.input_file, args.output, args.columns)
+    success = convert_and_process(args.inputs[0], args.output, args.columns, args.languages, args.reverse,
+                                  args.auto_detect, args.incremental, args.profile, args.cprofile)
     
     if success:
         print("Processing completed successfully.")
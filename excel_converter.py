@@ -3,13 +3,21 @@
 Excel Converter - A simple script to convert Excel files to CSV
 """
 
-import pandas as pd
 import os
 import sys
 import argparse
+from functools import partial
 
-def convert_excel_to_csv(input_file, output_file=None, sheet_name=0):
-    """Convert an Excel file to CSV format."""
+from src.batch import MANIFEST_NAME, Manifest, expand_inputs, is_batch, output_path, run_batch
+from src.profiling import attempt, note, stage, start_profile
+
+def convert_excel_to_csv(input_file, output_file=None, sheet_name=0, profile=False, cprofile=False):
+    """Convert an Excel file to CSV format.
+    
+    With ``profile`` (or ``cprofile``, which adds a cProfile dump), the time
+    spent in each stage is printed and saved next to the output (see
+    src/profiling.py).
+    """
     
     if not os.path.exists(input_file):
         print(f"Error: File {input_file} does not exist.")
@@ -21,8 +29,25 @@ def convert_excel_to_csv(input_file, output_file=None, sheet_name=0):
         name_without_ext = os.path.splitext(basename)[0]
         output_file = f"{name_without_ext}.csv"
     
+    job_profile = start_profile(profile, cprofile)
+    try:
+        success = write_csv(input_file, output_file, sheet_name, job_profile)
+    finally:
+        if job_profile is not None:
+            job_profile.stop()
+    if job_profile is not None:
+        job_profile.note('success', success)
+        job_profile.save(output_file, input_file)
+    return success
+
+def write_csv(input_file, output_file, sheet_name=0, profile=None):
+    """Try each engine until one reads the file, and save it as CSV; see convert_excel_to_csv."""
+    
     print(f"Converting {input_file} to {output_file}...")
     
+    with stage(profile, 'import pandas'):
+        import pandas as pd
+    
     # Try different engines to read the Excel file
     engines = ['openpyxl', 'xlrd', 'odf']
     
@@ -31,47 +56,63 @@ def convert_excel_to_csv(input_file, output_file=None, sheet_name=0):
             print(f"Trying with engine: {engine}")
             
             # First attempt: Just read the file directly
-            df = pd.read_excel(input_file, engine=engine, sheet_name=sheet_name)
+            with stage(profile, 'load'):
+                df = pd.read_excel(input_file, engine=engine, sheet_name=sheet_name)
             
             # Save to CSV
-            df.to_csv(output_file, index=False)
+            with stage(profile, 'save'):
+                df.to_csv(output_file, index=False)
+            attempt(profile, engine, True)
+            note(profile, 'rows', len(df))
             print(f"Successfully converted to CSV format: {output_file}")
             print(f"CSV file shape: {df.shape}")
             return True
             
         except Exception as e:
             print(f"Failed with engine {engine}: {str(e)}")
+            attempt(profile, engine, False, e)
             
             # Try with additional options
             try:
                 print(f"Trying with {engine} and header=None...")
-                df = pd.read_excel(input_file, engine=engine, sheet_name=sheet_name, header=None)
+                with stage(profile, 'load'):
+                    df = pd.read_excel(input_file, engine=engine, sheet_name=sheet_name, header=None)
                 
                 # Check if we found content
                 if len(df) > 0:
                     # Find the header row (usually within first 20 rows)
-                    header_row = None
-                    for i in range(min(20, len(df))):
-                        row_str = ' '.join(df.iloc[i].astype(str).values)
-                        if 'Description' in row_str and ('Message' in row_str or 'Type' in row_str):
-                            header_row = i
-                            break
+                    with stage(profile, 'header detection'):
+                        header_row = None
+                        for i in range(min(20, len(df))):
+                            row_str = ' '.join(df.iloc[i].astype(str).values)
+                            if 'Description' in row_str and ('Message' in row_str or 'Type' in row_str):
+                                header_row = i
+                                break
                     
                     if header_row is not None:
                         # Use this row as header
                         new_df = pd.DataFrame(df.values[header_row+1:], columns=df.iloc[header_row])
-                        new_df.to_csv(output_file, index=False)
+                        with stage(profile, 'save'):
+                            new_df.to_csv(output_file, index=False)
+                        attempt(profile, f"{engine} with header=None", True)
+                        note(profile, 'header_row', header_row)
+                        note(profile, 'rows', len(new_df))
                         print(f"Successfully converted to CSV format with header detection: {output_file}")
                         print(f"CSV file shape: {new_df.shape}")
                         return True
                     else:
                         # Use default headers
-                        df.to_csv(output_file, index=False)
+                        with stage(profile, 'save'):
+                            df.to_csv(output_file, index=False)
+                        attempt(profile, f"{engine} with header=None", True)
+                        note(profile, 'rows', len(df))
                         print(f"Successfully converted to CSV format with default headers: {output_file}")
                         print(f"CSV file shape: {df.shape}")
                         return True
+                attempt(profile, f"{engine} with header=None", False, 'no rows')
             except Exception as sub_e:
                 print(f"Failed with {engine} and header=None: {str(sub_e)}")
+                attempt(profile, f"{engine} with header=None", False, sub_e)
     
     print("All conversion methods failed.")
     return False
@@ -79,13 +120,35 @@ def convert_excel_to_csv(input_file, output_file=None, sheet_name=0):
 def main():
     """Main function to parse arguments and convert Excel files."""
     parser = argparse.ArgumentParser(description='Convert Excel files to CSV format.')
-    parser.add_argument('input_file', help='Path to the input Excel file (.xls or .xlsx)')
-    parser.add_argument('-o', '--output', help='Path to the output CSV file (default: same name with .csv extension)')
+    parser.add_argument('inputs', nargs='+', metavar='input_file',
+                        help='Input Excel file (.xls or .xlsx), or directories and glob patterns for a batch')
+    parser.add_argument('-o', '--output', help='Output CSV file (default: same name with .csv extension), '
+                                               'or output directory for a batch (default: next to each input)')
     parser.add_argument('-s', '--sheet', type=int, default=0, help='Sheet index to convert (default: 0)')
+    parser.add_argument('-j', '--workers', type=int, help='Files converted at once in a batch (default: CPU count)')
+    parser.add_argument('--manifest', help=f'Batch manifest, used to resume an interrupted batch '
+                                           f'(default: {MANIFEST_NAME} in the output directory)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time spent in each stage and save it to <output>.profile.json')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='Also run under cProfile and dump the statistics to <output>.pstats (implies --profile)')
     
     args = parser.parse_args()
     
-    success = convert_excel_to_csv(args.input_file, args.output, args.sheet)
+    if is_batch(args.inputs):
+        files = expand_inputs(args.inputs)
+        if not files:
+            print("No Excel files to convert.")
+            sys.exit(1)
+        manifest = Manifest(args.manifest or os.path.join(args.output or '.', MANIFEST_NAME))
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+        job = partial(convert_excel_to_csv, sheet_name=args.sheet, profile=args.profile, cprofile=args.cprofile)
+        failed = run_batch(files, job, partial(output_path, output_dir=args.output, suffix='.csv'),
+                           args.workers, manifest, {'sheet': args.sheet})
+        sys.exit(1 if failed else 0)
+    
+    success = convert_excel_to_csv(args.inputs[0], args.output, args.sheet, args.profile, args.cprofile)
     
     if success:
         print("Conversion completed successfully.")
@@ -0,0 +1,180 @@
+"""
+Admission control for translation jobs.
+
+Each upload is given an estimated cost (memory, from the file size and the
+sheet dimensions recorded in the workbook) and is only started when it fits
+in the concurrency and memory budget. Jobs that do not fit wait for a short
+while and are then turned away so the client can retry later.
+
+The counters live in shared memory created when the app is imported. With
+gunicorn's ``preload_app`` they are created once in the master and inherited
+by every worker, so the budget applies to the whole service rather than to
+each worker separately. A job waiting for room checks again every
+``POLL_INTERVAL`` seconds rather than sleeping on a shared condition, which
+a worker killed while waiting would leave unusable.
+"""
+
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+
+from src.streaming import sheet_dimensions
+
+# Rough memory cost of a job, used to size the budget
+BASE_JOB_MEMORY = 32 * 1024 * 1024  # Interpreter work space for any job
+STREAMING_JOB_MEMORY = 64 * 1024 * 1024  # Row-by-row jobs stay flat
+PANDAS_BYTES_PER_CELL = 200  # DataFrame, input copy and output copy
+# Used when the workbook does not record its dimensions (e.g. .xls)
+DISK_BYTES_PER_CELL = {'.xlsx': 10, '.xls': 20}
+
+# Seconds to wait for the shared lock, which is only held for a few reads and writes
+LOCK_TIMEOUT = 5.0
+# Seconds between two checks for room while a job waits
+POLL_INTERVAL = 0.05
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def estimate_job_cost(file_path, streaming=False):
+    """Estimate the cells and peak memory needed to translate a file."""
+    file_size = os.path.getsize(file_path)
+    dimensions = sheet_dimensions(file_path) if file_path.lower().endswith('.xlsx') else None
+    if dimensions:
+        rows, columns = dimensions
+        cells = rows * columns
+    else:
+        extension = os.path.splitext(file_path)[1].lower()
+        cells = file_size // DISK_BYTES_PER_CELL.get(extension, 10)
+
+    if streaming:
+        memory = STREAMING_JOB_MEMORY
+    else:
+        memory = BASE_JOB_MEMORY + cells * PANDAS_BYTES_PER_CELL
+
+    return {'file_size': file_size, 'cells': cells, 'memory': memory}
+
+
+class AdmissionController:
+    """Process-shared budget of concurrent jobs and reserved memory.
+
+    Each admitted job holds a slot recording the pid of its worker and the
+    memory it reserved. The slot of a worker that dies before releasing it
+    (killed on timeout or out of memory) is reclaimed by ``reclaim``, called
+    from gunicorn's ``child_exit`` hook, and by ``admit`` when the budget
+    looks full. The lock is only held for a few reads and writes and is
+    always taken with a timeout; a lock left held by a dead worker is taken
+    over instead of blocking every other worker.
+    """
+
+    def __init__(self, max_jobs, memory_budget, queue_timeout=0, lock_timeout=LOCK_TIMEOUT):
+        self.max_jobs = max(1, max_jobs)
+        self.memory_budget = memory_budget
+        self.queue_timeout = queue_timeout
+        self.lock_timeout = lock_timeout
+        self._lock = multiprocessing.Lock()
+        # pid of the process holding the lock, to recover it if that process dies
+        self._lock_owner = multiprocessing.Value('i', 0, lock=False)
+        # One slot per job that may run at once: pid of its worker (0 if free) and memory
+        self._pids = multiprocessing.Array('i', self.max_jobs, lock=False)
+        self._memory = multiprocessing.Array('q', self.max_jobs, lock=False)
+
+    @contextmanager
+    def _locked(self):
+        if not self._lock.acquire(timeout=self.lock_timeout):
+            owner = self._lock_owner.value
+            if not owner or _is_alive(owner):
+                raise TimeoutError(f"Admission lock held by process {owner} for over {self.lock_timeout}s")
+            # The owner died while holding the lock and will never release it
+            print(f"DEBUG: Taking over the admission lock left by process {owner}")
+        self._lock_owner.value = os.getpid()
+        try:
+            yield
+        finally:
+            self._lock_owner.value = 0
+            self._lock.release()
+
+    def _active_jobs(self):
+        return sum(1 for pid in self._pids if pid)
+
+    def _reserved_memory(self):
+        return sum(memory for pid, memory in zip(self._pids, self._memory) if pid)
+
+    def _free_slot(self, memory):
+        """Return a free slot if a job of this size fits in the budget, else None."""
+        free = [slot for slot, pid in enumerate(self._pids) if not pid]
+        if not free:
+            return None
+        if len(free) == self.max_jobs:
+            # A job larger than the whole budget may still run on its own
+            return free[0]
+        return free[0] if self._reserved_memory() + memory <= self.memory_budget else None
+
+    def _reclaim_dead(self, pid=None):
+        """Free the slots of ``pid``, or of every process that no longer exists."""
+        for slot, owner in enumerate(self._pids):
+            if owner and (owner == pid if pid is not None else not _is_alive(owner)):
+                print(f"DEBUG: Reclaiming admission slot {slot} of process {owner}")
+                self._pids[slot] = 0
+                self._memory[slot] = 0
+
+    def admit(self, memory):
+        """Reserve room for a job, waiting up to queue_timeout seconds.
+
+        Returns the slot of the job if it may start, or None; the caller must
+        then call release() with that slot once it has finished.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        while True:
+            try:
+                with self._locked():
+                    slot = self._free_slot(memory)
+                    if slot is None:
+                        self._reclaim_dead()
+                        slot = self._free_slot(memory)
+                    if slot is not None:
+                        self._pids[slot] = os.getpid()
+                        self._memory[slot] = memory
+                        return slot
+            except TimeoutError as e:
+                print(f"DEBUG: {str(e)}")
+                return None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    def release(self, slot):
+        """Give back the room reserved by admit()."""
+        try:
+            with self._locked():
+                if self._pids[slot] == os.getpid():
+                    self._pids[slot] = 0
+                    self._memory[slot] = 0
+        except TimeoutError as e:
+            # The slot is freed by reclaim() once this worker exits
+            print(f"DEBUG: Could not release admission slot {slot}: {str(e)}")
+
+    def reclaim(self, pid):
+        """Free the slots of a worker that exited; called by gunicorn's child_exit hook."""
+        try:
+            with self._locked():
+                self._reclaim_dead(pid)
+        except TimeoutError as e:
+            print(f"DEBUG: Could not reclaim the admission slots of process {pid}: {str(e)}")
+
+    def status(self):
+        # Read without the lock: a snapshot is enough for /ready
+        return {
+            'active_jobs': self._active_jobs(),
+            'reserved_memory': self._reserved_memory(),
+            'max_jobs': self.max_jobs,
+            'memory_budget': self.memory_budget,
+        }
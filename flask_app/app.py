@@ -1,18 +1,63 @@
 import os
+import json
 import uuid
-from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory
+import tempfile
+import threading
+from flask import Flask, Request, make_response, render_template, request, redirect, url_for, flash, send_from_directory
 from werkzeug.utils import secure_filename
 import sys
 
-# Add the src directory to the Python path so we can import the ExcelProcessor
+# Add the src directory to the Python path so we can import the processing API
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.excel_processor import ExcelProcessor
+from src.excel_processor import read_workbook, translate_dataframe, write_workbook, warm_up
+from src.coverage import build_report, report_path, write_report
+from src.glossary import DEFAULT_LANGUAGE, LANGUAGE_NAMES, available_languages
+from src.translation_memory import MissRecorder
+from src.streaming import can_stream, stream_translate
+from src.translator import loaded_versions, watch_glossary
+from admission import AdmissionController, estimate_job_cost
+
+class SpooledRequest(Request):
+    """Request that spools uploaded files to disk in the upload folder.
+
+    Uploads stay in memory only up to UPLOAD_SPOOL_SIZE bytes; anything
+    larger is written to a temporary file as it arrives, so big workbooks
+    never sit in worker memory.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(
+            max_size=app.config['UPLOAD_SPOOL_SIZE'],
+            dir=app.config['UPLOAD_FOLDER'],
+        )
 
 app = Flask(__name__)
+app.request_class = SpooledRequest
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-for-translingoo')
 app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads')
 app.config['DOWNLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'downloads')
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB max file size
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', '300')) * 1024 * 1024
+app.config['UPLOAD_SPOOL_SIZE'] = 1024 * 1024  # Keep uploads up to 1 MB in memory
+app.config['UPLOAD_CHUNK_SIZE'] = 1024 * 1024  # Copy uploads to disk 1 MB at a time
+# .xlsx uploads above this size are translated row by row instead of through pandas
+app.config['STREAMING_THRESHOLD'] = int(os.environ.get('STREAMING_THRESHOLD_MB', '16')) * 1024 * 1024
+
+# Admission control: how many jobs may run at once across all workers, how
+# much memory they may reserve in total, and how long a job may wait for room
+app.config['MAX_CONCURRENT_JOBS'] = int(os.environ.get('MAX_CONCURRENT_JOBS', '2'))
+app.config['JOB_MEMORY_BUDGET'] = int(os.environ.get('JOB_MEMORY_BUDGET_MB', '2048')) * 1024 * 1024
+app.config['ADMISSION_QUEUE_TIMEOUT'] = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', '10'))
+app.config['ADMISSION_RETRY_AFTER'] = int(os.environ.get('ADMISSION_RETRY_AFTER', '30'))
+
+# Seconds between checks of the glossary/en_*.tsv files for changes; 0 disables reloading
+app.config['GLOSSARY_RELOAD_INTERVAL'] = float(os.environ.get('GLOSSARY_RELOAD_INTERVAL', '5'))
+
+# Created before gunicorn forks so all workers share the same budget
+admission = AdmissionController(
+    app.config['MAX_CONCURRENT_JOBS'],
+    app.config['JOB_MEMORY_BUDGET'],
+    app.config['ADMISSION_QUEUE_TIMEOUT'],
+)
 
 # Ensure the upload and download directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -20,12 +65,122 @@ os.makedirs(app.config['DOWNLOAD_FOLDER'], exist_ok=True)
 
 ALLOWED_EXTENSIONS = {'xls', 'xlsx'}
 
+# Set once the Excel engines and translation tables are loaded
+app.config['WARMED_UP'] = False
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+
+def warm_up_app():
+    """Load the processing engines, then let /ready report the app as ready."""
+    try:
+        warm_up()
+    except Exception as e:
+        print(f"DEBUG: Warm-up failed, /ready stays unavailable: {str(e)}")
+        return
+    app.config['WARMED_UP'] = True
+
+def start_warm_up():
+    """Warm up in the background; /ready answers 503 until it is done.
+
+    Runs on import, and again from gunicorn's post_fork: a thread started in
+    the master does not survive the fork, so a worker forked before the
+    master was warm finishes the warm-up itself.
+    """
+    global _warm_up_thread
+    with _warm_up_lock:
+        if not app.config['WARMED_UP'] and (_warm_up_thread is None or not _warm_up_thread.is_alive()):
+            _warm_up_thread = threading.Thread(target=warm_up_app, name='warm-up', daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+def wait_for_warm_up(timeout=None):
+    """Block until the warm-up started on import is done; returns whether it succeeded.
+
+    gunicorn's when_ready calls it, so with preload_app the workers are
+    forked warm and share the loaded engines and tables with the master.
+    """
+    thread = _warm_up_thread
+    if thread is not None:
+        thread.join(timeout)
+    return app.config['WARMED_UP']
+
+start_warm_up()
+
+def start_glossary_watcher():
+    """Reload the glossaries in the background when their source files change.
+
+    Must run in each serving process: gunicorn calls it from post_fork.
+    """
+    if app.config['GLOSSARY_RELOAD_INTERVAL'] > 0:
+        watch_glossary(app.config['GLOSSARY_RELOAD_INTERVAL'])
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def render_index():
+    languages = [(code, LANGUAGE_NAMES.get(code, code)) for code in available_languages()]
+    return render_template('index.html', max_upload_mb=app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024),
+                           languages=languages, default_language=DEFAULT_LANGUAGE)
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_index()
+
+@app.errorhandler(413)
+def file_too_large(error):
+    flash(f"File too large. The maximum upload size is {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)}MB", 'error')
+    return redirect(url_for('index'))
+
+@app.route('/ready')
+def ready():
+    if not app.config['WARMED_UP']:
+        return {'status': 'warming up'}, 503
+    return {'status': 'ready', 'glossaries': loaded_versions(), 'admission': admission.status()}, 200
+
+def translate_upload(upload_path, output_path, columns_to_translate, streaming, source_name=None, languages=None,
+                     reverse=False, auto_detect=False):
+    """Translate a saved upload, returning an error message on failure.
+
+    Untranslated values are recorded in the translation memory under
+    ``source_name``, the name the file was uploaded with, and a coverage
+    report is saved next to the output.
+    """
+    if streaming:
+        success, stats = stream_translate(upload_path, output_path, columns_to_translate, source_name=source_name,
+                                         languages=languages, reverse=reverse, auto_detect=auto_detect)
+        if not success:
+            return 'Error processing Excel file. Please check the console for details.'
+        return None
+    
+    # Read, translate and save through the stateless API so threads can share
+    # the compiled glossary
+    input_df = read_workbook(upload_path)
+    if input_df is None:
+        return 'Error loading Excel file. Please check if the file is valid.'
+    
+    recorder = MissRecorder(source_name or upload_path)
+    output_df, stats = translate_dataframe(input_df, columns_to_translate, recorder=recorder, languages=languages,
+                                           reverse=reverse, auto_detect=auto_detect)
+    if output_df is None:
+        return 'Error processing Excel file. Please check the console for details.'
+    
+    # Save the processed file
+    if not write_workbook(output_df, output_path):
+        return 'Error saving translated file'
+    
+    recorder.flush()
+    write_report(build_report(source_name or upload_path, output_path, stats, stats['glossary_version']), output_path)
+    return None
+
+def load_coverage(filename):
+    """Return the coverage report saved next to a translated file, if any."""
+    path = report_path(os.path.join(app.config['DOWNLOAD_FOLDER'], secure_filename(filename)))
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -48,10 +203,22 @@ def upload_file():
     if request.form.get('translate_message'):
         columns_to_translate.append('Message')
     
-    if not columns_to_translate:
+    auto_detect = bool(request.form.get('auto_detect'))
+    if not columns_to_translate and not auto_detect:
         flash('Please select at least one column to translate', 'error')
         return redirect(request.url)
     
+    languages = request.form.getlist('languages') or [DEFAULT_LANGUAGE]
+    unknown = [language for language in languages if language not in available_languages()]
+    if unknown:
+        flash(f"Unknown target language: {', '.join(unknown)}", 'error')
+        return redirect(request.url)
+    
+    reverse = bool(request.form.get('reverse'))
+    if reverse and len(languages) != 1:
+        flash('Select the one language the file is in to translate it back to English', 'error')
+        return redirect(request.url)
+    
     if file and allowed_file(file.filename):
         # Create unique filename
         original_filename = secure_filename(file.filename)
@@ -61,25 +228,34 @@ def upload_file():
         
         # Save the uploaded file
         upload_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(upload_path)
+        file.save(upload_path, buffer_size=app.config['UPLOAD_CHUNK_SIZE'])
         
-        # Process the file
-        processor = ExcelProcessor()
+        output_filename = f"{unique_id}_translated.xlsx"
+        output_path = os.path.join(app.config['DOWNLOAD_FOLDER'], output_filename)
         
-        if not processor.load_excel(upload_path):
-            flash('Error loading Excel file. Please check if the file is valid.', 'error')
-            return redirect(url_for('index'))
+        # Large workbooks are translated row by row to keep memory flat
+        streaming = can_stream(upload_path) and os.path.getsize(upload_path) > app.config['STREAMING_THRESHOLD']
         
-        if not processor.process_file(columns_to_translate):
-            flash('Error processing Excel file. Please check the console for details.', 'error')
-            return redirect(url_for('index'))
+        # Only start the job if it fits in the concurrency and memory budget
+        cost = estimate_job_cost(upload_path, streaming)
+        print(f"DEBUG: Estimated job cost: {cost}")
+        slot = admission.admit(cost['memory'])
+        if slot is None:
+            os.remove(upload_path)
+            flash('The server is busy translating other files. Please try again in a moment.', 'error')
+            response = make_response(render_index(), 503)
+            response.headers['Retry-After'] = str(app.config['ADMISSION_RETRY_AFTER'])
+            return response
         
-        # Save the processed file
-        output_filename = f"{unique_id}_translated.xlsx"
-        output_path = os.path.join(app.config['DOWNLOAD_FOLDER'], output_filename)
+        try:
+            # With nothing ticked, only the detected columns (or Description) are translated
+            error = translate_upload(upload_path, output_path, columns_to_translate or None, streaming,
+                                     original_filename, languages, reverse, auto_detect)
+        finally:
+            admission.release(slot)
         
-        if not processor.save_excel(output_path):
-            flash('Error saving translated file', 'error')
+        if error:
+            flash(error, 'error')
             return redirect(url_for('index'))
         
         flash('File processed successfully!', 'success')
@@ -91,7 +267,15 @@ def upload_file():
 @app.route('/download/<filename>')
 def download_file(filename):
     original_name = request.args.get('original_name', filename)
-    return render_template('download.html', filename=filename, original_name=original_name)
+    return render_template('download.html', filename=filename, original_name=original_name,
+                           coverage=load_coverage(filename))
+
+@app.route('/coverage/<filename>')
+def get_coverage(filename):
+    report = load_coverage(filename)
+    if report is None:
+        return {'error': 'No coverage report for this file'}, 404
+    return report
 
 @app.route('/get_file/<filename>')
 def get_file(filename):
@@ -99,4 +283,5 @@ def get_file(filename):
                               download_name=request.args.get('original_name', filename))
 
 if __name__ == '__main__':
+    start_glossary_watcher()
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
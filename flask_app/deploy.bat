@@ -25,6 +25,10 @@ REM Copy src directory from parent
 mkdir %BUILD_DIR%\src
 xcopy /E /I /Y ..\src\* %BUILD_DIR%\src\
 
+REM Copy the glossary source from parent
+mkdir %BUILD_DIR%\glossary
+copy /Y ..\glossary\*.tsv %BUILD_DIR%\glossary\
+
 echo Step 2: Building the Docker image...
 cd %BUILD_DIR%
 docker build -t translingoo .
@@ -33,6 +33,10 @@ cp -r ./* "$BUILD_DIR/"
 mkdir -p "$BUILD_DIR/src"
 cp -r ../src/* "$BUILD_DIR/src/"
 
+# Copy the glossary source from parent
+mkdir -p "$BUILD_DIR/glossary"
+cp ../glossary/*.tsv "$BUILD_DIR/glossary/"
+
 echo -e "${YELLOW}Step 2: Building the Docker image...${NC}"
 cd "$BUILD_DIR"
 docker build -t translingoo .
@@ -38,7 +38,7 @@ echo -e "${GREEN}Press Ctrl+C to stop the server.${NC}"
 # Run Flask with Gunicorn if available, otherwise use development server
 if command -v gunicorn &> /dev/null; then
     echo "Using Gunicorn server (recommended for production)"
-    gunicorn -w 4 -b 0.0.0.0:5000 app:app
+    gunicorn -c gunicorn.conf.py app:app
 else
     echo "Using Flask development server (not recommended for production)"
     export FLASK_APP=app.py
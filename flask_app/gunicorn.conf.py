@@ -0,0 +1,40 @@
+# Gunicorn settings for the Translingoo web application
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+# More than one thread switches to the gthread worker; the threads of a worker
+# share its compiled glossary, so fewer processes with more threads use less memory
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+
+# Import the app (and warm up the Excel engines and translation tables) in the
+# master process so every worker starts ready and shares those pages
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master before the first worker is forked: wait for the
+    # warm-up started on import so every worker inherits warm tables
+    from app import wait_for_warm_up
+    if wait_for_warm_up():
+        server.log.info("Translingoo warmed up, workers can serve /ready")
+    else:
+        server.log.warning("Translingoo warm-up failed, /ready will answer 503")
+
+
+def post_fork(server, worker):
+    # Threads started in the master do not survive the fork, so each worker
+    # watches the glossary source itself, and finishes warming up if needed
+    from app import start_glossary_watcher, start_warm_up
+    start_warm_up()
+    start_glossary_watcher()
+
+
+def child_exit(server, worker):
+    # A worker killed during a job (timeout, out of memory) never released its
+    # admission slot; give it back so the budget does not shrink for good
+    from app import admission
+    admission.reclaim(worker.pid)
+
+# Large uploads are streamed and translated row by row, which can take a while
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '300'))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Load test for the Translingoo web application.
+
+Builds synthetic alarm workbooks, starts the app locally (or uses one that is
+already running), posts the workbooks to /upload at a fixed concurrency and
+follows the redirects to the download page and /get_file. Prints throughput
+and latency percentiles for each stage, and can save them as JSON so two
+builds can be compared side by side.
+
+Everything runs offline on the local machine.
+
+Usage:
+    python loadtest.py --requests 50 --concurrency 4 --rows 2000
+    python loadtest.py --url http://127.0.0.1:5000 --json results.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+# The same synthetic alarm exports as the benchmarks
+from benchmarks.workbooks import make_workbook
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ['upload', 'download_page', 'get_file', 'total']
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server, port):
+    """Start the app on localhost with gunicorn or the Flask dev server."""
+    env = dict(os.environ)
+    if server == 'gunicorn':
+        env['GUNICORN_BIND'] = f"127.0.0.1:{port}"
+        cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']
+    else:
+        cmd = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--with-threads']
+    print(f"Starting server: {' '.join(cmd)}")
+    return subprocess.Popen(cmd, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(host, port, timeout=60):
+    """Poll /ready until the app has finished warming up."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/ready')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def _multipart(fields, file_field, filename, content):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f'Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n'.encode()
+    )
+    parts.append(content)
+    parts.append(f'\r\n--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def _request(host, port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(host, port, timeout=600)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, response.getheader('Location'), data
+    finally:
+        conn.close()
+
+
+def run_job(host, port, body, content_type):
+    """Upload one workbook and follow it through to the translated file."""
+    timings = {}
+    start = time.perf_counter()
+
+    status, location, _ = _request(host, port, 'POST', '/upload', body, {'Content-Type': content_type})
+    timings['upload'] = time.perf_counter() - start
+    if status != 302 or not location or '/download/' not in location:
+        return {'ok': False, 'status': status, 'timings': timings}
+    location = urlsplit(location)
+    download_path = location.path + (f"?{location.query}" if location.query else '')
+
+    stage_start = time.perf_counter()
+    status, _, _ = _request(host, port, 'GET', download_path)
+    timings['download_page'] = time.perf_counter() - stage_start
+    if status != 200:
+        return {'ok': False, 'status': status, 'timings': timings}
+
+    stage_start = time.perf_counter()
+    status, _, data = _request(host, port, 'GET', download_path.replace('/download/', '/get_file/', 1))
+    timings['get_file'] = time.perf_counter() - stage_start
+    timings['total'] = time.perf_counter() - start
+    return {'ok': status == 200 and len(data) > 0, 'status': status, 'timings': timings}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    # The smallest value with at least pct% of the values at or below it
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(results, elapsed):
+    summary = {
+        'requests': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'elapsed_s': elapsed,
+        'throughput_rps': sum(1 for r in results if r['ok']) / elapsed if elapsed else 0,
+        'stages': {},
+    }
+    for stage in STAGES:
+        values = [r['timings'][stage] for r in results if stage in r['timings']]
+        summary['stages'][stage] = {
+            'count': len(values),
+            'p50_ms': _ms(percentile(values, 50)),
+            'p95_ms': _ms(percentile(values, 95)),
+            'p99_ms': _ms(percentile(values, 99)),
+            'max_ms': _ms(max(values) if values else None),
+        }
+    statuses = {}
+    for r in results:
+        if not r['ok']:
+            statuses[str(r['status'])] = statuses.get(str(r['status']), 0) + 1
+    summary['failure_statuses'] = statuses
+    return summary
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def print_summary(summary):
+    print(f"\nRequests: {summary['requests']}  succeeded: {summary['succeeded']}  failed: {summary['failed']}")
+    if summary['failure_statuses']:
+        print(f"Failure statuses: {summary['failure_statuses']}")
+    print(f"Elapsed: {summary['elapsed_s']:.2f}s  throughput: {summary['throughput_rps']:.2f} jobs/s\n")
+    print(f"{'stage':<15}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, stats in summary['stages'].items():
+        cells = [stats['count']] + [stats[key] for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+        print(f"{stage:<15}" + ''.join(f"{'-' if c is None else c:>{7 if i == 0 else 10}}" for i, c in enumerate(cells)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Translingoo web application.')
+    parser.add_argument('--url', help='Base URL of a running app (default: start one locally)')
+    parser.add_argument('--server', choices=['gunicorn', 'flask'], default='gunicorn',
+                        help='Server to start when --url is not given (default: gunicorn)')
+    parser.add_argument('-n', '--requests', type=int, default=20, help='Number of jobs to submit (default: 20)')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='Jobs in flight at once (default: 4)')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000],
+                        help='Row counts of the generated workbooks, cycled through (default: 1000)')
+    parser.add_argument('--distinct-ratio', type=float, default=0.05,
+                        help='Distinct descriptions per row of the generated workbooks (default: 0.05)')
+    parser.add_argument('--json', help='Write the summary to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='translingoo_loadtest_')
+    payloads = []
+    for rows in args.rows:
+        path = make_workbook(workdir, rows, args.distinct_ratio)
+        with open(path, 'rb') as f:
+            fields = {'translate_description': 'on', 'translate_message': 'on'}
+            payloads.append(_multipart(fields, 'file', os.path.basename(path), f.read()))
+        print(f"Generated {path} ({os.path.getsize(path)} bytes)")
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', _free_port()
+        server = start_server(args.server, port)
+
+    try:
+        if not wait_until_ready(host, port):
+            print("Server did not become ready")
+            sys.exit(1)
+
+        lock = threading.Lock()
+        results = []
+
+        def submit(i):
+            body, content_type = payloads[i % len(payloads)]
+            result = run_job(host, port, body, content_type)
+            with lock:
+                results.append(result)
+
+        print(f"Submitting {args.requests} jobs with concurrency {args.concurrency}...")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(submit, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(results, elapsed)
+    summary['config'] = {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'rows': args.rows,
+        'distinct_ratio': args.distinct_ratio,
+        'server': 'external' if args.url else args.server,
+    }
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSaved summary to {args.json}")
+
+    sys.exit(0 if summary['failed'] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
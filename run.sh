@@ -16,10 +16,34 @@ if ! command -v docker &> /dev/null; then
     exit 1
 fi
 
+# The image is only rebuilt when the files it is built from change, and the
+# files are translated by a service that stays running between calls
+# (src/daemon.py), so a run does not pay for a build and a Python start-up
+IMAGE=excel-translator
+DAEMON=excel-translator-daemon
+PORT="${TRANSLINGOO_PORT:-8765}"
+ROOT="$(cd "$(dirname "$0")" && pwd)"
+
+inputs_hash() {
+    # Hash of the files the image is built from: Dockerfile, converter.py and the .py and
+    # .tsv files under src/ and glossary/. It is the first 16 hex digits of the SHA-256 of
+    # each path and content, in path order; run.bat computes the same hash
+    (cd "$ROOT" && find Dockerfile converter.py src glossary -type f \( -name '*.py' -o -name '*.tsv' -o -name Dockerfile \) \
+        -not -path '*/__pycache__/*' | LC_ALL=C sort | while IFS= read -r f; do echo "$f"; cat "$f"; done) \
+        | { command -v sha256sum > /dev/null && sha256sum || shasum -a 256; } | cut -c1-16
+}
+
+if [ "$1" = "--stop" ]; then
+    docker rm -f "$DAEMON" > /dev/null 2>&1
+    echo "Translation service stopped."
+    exit 0
+fi
+
 # Check for input file
 if [ -z "$1" ]; then
     echo -e "${RED}Please provide the path to the Excel file:${NC}"
     echo "Usage: ./run.sh /path/to/excelfile.xls [output_file.xlsx]"
+    echo "       ./run.sh --stop    (stop the translation service)"
     exit 1
 fi
 
@@ -49,23 +73,78 @@ fi
 echo -e "${YELLOW}Input file:${NC} $INPUT_PATH"
 echo -e "${YELLOW}Output will be saved to:${NC} $OUTPUT_FILE"
 
-# Build the Docker image
-echo -e "\n${YELLOW}Building the Docker image...${NC}"
-docker build -t excel-translator .
+# Build the Docker image if its inputs changed
+HASH=$(inputs_hash)
+if [ "$(docker image inspect -f '{{ index .Config.Labels "translingoo.inputs" }}' "$IMAGE" 2> /dev/null)" != "$HASH" ]; then
+    echo -e "\n${YELLOW}Building the Docker image...${NC}"
+    docker build --label "translingoo.inputs=$HASH" -t "$IMAGE" "$ROOT"
 
-if [ $? -ne 0 ]; then
-    echo -e "${RED}Failed to build Docker image.${NC}"
-    exit 1
+    if [ $? -ne 0 ]; then
+        echo -e "${RED}Failed to build Docker image.${NC}"
+        exit 1
+    fi
 fi
 
-# Run the container
+# Translate the file in a container of its own, which has no upload limit
+run_in_container() {
+    echo -e "\n${YELLOW}Processing the Excel file ($1, starting a container)...${NC}"
+    docker run --rm -v "$(dirname "$INPUT_PATH"):/data" -v "$(dirname "$OUTPUT_FILE"):/output" "$IMAGE" \
+        "/data/$(basename "$INPUT_PATH")" -o "/output/$(basename "$OUTPUT_FILE")"
+    if [ $? -ne 0 ]; then
+        echo -e "${RED}Failed to process the Excel file.${NC}"
+        exit 1
+    fi
+    echo -e "\n${GREEN}Success!${NC} File has been translated and saved to:"
+    echo "$OUTPUT_FILE"
+    exit 0
+}
+
+# curl sends the file to the service; without it, fall back to one container per file
+if ! command -v curl &> /dev/null; then
+    run_in_container "curl not found"
+fi
+
+# (Re)start the service if it is not running the current image
+IMAGE_ID=$(docker image inspect -f '{{.Id}}' "$IMAGE")
+if [ "$(docker inspect -f '{{.State.Running}} {{.Image}}' "$DAEMON" 2> /dev/null)" != "true $IMAGE_ID" ]; then
+    echo -e "\n${YELLOW}Starting the translation service...${NC}"
+    docker rm -f "$DAEMON" > /dev/null 2>&1
+    docker run -d --name "$DAEMON" -p "127.0.0.1:$PORT:8765" "$IMAGE" --serve 8765 --host 0.0.0.0 > /dev/null
+    if [ $? -ne 0 ]; then
+        echo -e "${RED}Failed to start the translation service.${NC}"
+        exit 1
+    fi
+fi
+for _ in $(seq 1 300); do
+    curl -sf "http://127.0.0.1:$PORT/health" > /dev/null && break
+    sleep 0.2
+done
+
+# Send the file; the output is written to a partial file and renamed when complete
 echo -e "\n${YELLOW}Processing the Excel file...${NC}"
-docker run --rm -v "$(dirname "$INPUT_PATH"):/data" excel-translator "/data/$(basename "$INPUT_PATH")" -o "/data/$(basename "$OUTPUT_FILE")"
+HEADERS=$(mktemp)
+STATUS=$(curl -sS -o "$OUTPUT_FILE.part" -D "$HEADERS" -w '%{http_code}' --data-binary @"$INPUT_PATH" \
+    -H "Content-Type: application/octet-stream" -H "X-Translingoo-Filename: $(basename "$INPUT_PATH")" \
+    "http://127.0.0.1:$PORT/translate")
 
-if [ $? -ne 0 ]; then
+if [ "$STATUS" = "413" ]; then
+    # Larger than the service accepts (TRANSLINGOO_MAX_UPLOAD_MB)
+    rm -f "$OUTPUT_FILE.part" "$HEADERS"
+    run_in_container "too large for the translation service"
+fi
+if [ "$STATUS" != "200" ]; then
     echo -e "${RED}Failed to process the Excel file.${NC}"
+    cat "$OUTPUT_FILE.part" 2> /dev/null
+    echo "See also: docker logs $DAEMON"
+    rm -f "$OUTPUT_FILE.part" "$HEADERS"
     exit 1
-else
-    echo -e "\n${GREEN}Success!${NC} File has been translated and saved to:"
-    echo "$OUTPUT_FILE"
-fi 
\ No newline at end of file
+fi
+mv "$OUTPUT_FILE.part" "$OUTPUT_FILE"
+# Coverage report, as written next to the output by converter.py
+REPORT_FILE="${OUTPUT_FILE%.*}.coverage.json"
+sed -n 's/^[Xx]-[Tt]ranslingoo-[Rr]eport: //p' "$HEADERS" | tr -d '\r' > "$REPORT_FILE"
+[ -s "$REPORT_FILE" ] || rm -f "$REPORT_FILE"
+rm -f "$HEADERS"
+
+echo -e "\n${GREEN}Success!${NC} File has been translated and saved to:"
+echo "$OUTPUT_FILE"
@@ -3,10 +3,10 @@
 
 a = Analysis(
     ['gui_wrapper.py'],
-    pathex=[],
+    pathex=['..'],
     binaries=[],
-    datas=[('Dockerfile', '.'), ('converter.py', '.'), ('README.md', '.')],
-    hiddenimports=[],
+    datas=[('README.md', '.'), ('../src', 'src'), ('../glossary/*.tsv', 'glossary')],
+    hiddenimports=['openpyxl', 'xlrd'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
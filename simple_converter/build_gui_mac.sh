@@ -14,10 +14,15 @@ pip3 install -r gui_requirements.txt
 
 # Build the executable
 echo "Building executable..."
+# The GUI translates in-process: the shared engine (--paths ..) and the Excel
+# engines pandas loads by name are bundled with it
 pyinstaller --name "Excel Translator" --windowed --onefile \
-    --add-data "Dockerfile:." \
-    --add-data "converter.py:." \
+    --paths .. \
+    --hidden-import openpyxl \
+    --hidden-import xlrd \
     --add-data "README.md:." \
+    --add-data "../src:src" \
+    --add-data "../glossary/*.tsv:glossary" \
     gui_wrapper.py
 
 echo "Build completed!"
@@ -14,7 +14,7 @@ pip install -r gui_requirements.txt
 
 :: Build the executable
 echo Building executable...
-pyinstaller --name "Excel Translator" --windowed --onefile --add-data "Dockerfile;." --add-data "converter.py;." --add-data "README.md;." gui_wrapper.py
+pyinstaller --name "Excel Translator" --windowed --onefile --paths .. --hidden-import openpyxl --hidden-import xlrd --add-data "README.md;." --add-data "..\src;src" --add-data "..\glossary\*.tsv;glossary" gui_wrapper.py
 
 echo Build completed!
 echo The executable is located in the "dist" folder.
@@ -8,13 +8,58 @@ import os
 import sys
 import argparse
 import re
+import signal
 import warnings
+from functools import partial
 
 # Suppress warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 warnings.filterwarnings('ignore', category=UserWarning, module='pandas')
 
-def convert_and_process(input_file, output_file=None, columns_to_translate=None):
+# The glossaries (glossary/en_*.tsv) and translation engine are shared with the
+# web app; in the Docker image they are copied next to this script
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from src.coverage import build_report, write_report
+from src.daemon import DEFAULT_PORT, TranslationServer
+from src.detection import detect_columns, sample_dataframe
+from src.excel_processor import insert_translated_columns, translate_column_languages, warm_up
+from src.glossary import available_languages, target_column_name
+from src.translation_memory import MissRecorder
+from src.translator import get_glossaries, watch_glossary
+
+def save_translated(df, columns_map, input_file, output_file, languages=None, reverse=False):
+    """Add the translated columns, save the file and write its coverage report.
+
+    Each translated column is inserted right after its source column, as in
+    the main converter (see insert_translated_columns).
+    """
+    glossaries = get_glossaries(languages, reverse)
+    recorder = MissRecorder(input_file)
+    stats = {'rows': len(df), 'coverage': {}, 'glossary_versions': {g.language: g.version for g in glossaries}}
+    for original_col, actual_col in columns_map.items():
+        print(f"Translating column: {actual_col}")
+        
+        # One new column per target language, translating each distinct value once
+        translated, _, counts = translate_column_languages(df[actual_col], glossaries, actual_col, recorder)
+        new_columns = []
+        for glossary in glossaries:
+            new_column_name = target_column_name(actual_col, glossary.language)
+            new_columns.append(translated[glossary.language].rename(new_column_name))
+            stats['coverage'][new_column_name] = counts[glossary.language]
+        df = insert_translated_columns(df, actual_col, new_columns)
+    
+    df.to_excel(output_file, index=False)
+    recorder.flush()
+    write_report(build_report(input_file, output_file, stats, glossaries[0].version), output_file)
+
+def detected_columns(df, columns_map, languages=None, reverse=False):
+    """Return columns_map with the columns the glossary knows added to it."""
+    detected = detect_columns(sample_dataframe(df), get_glossaries(languages, reverse)[0])
+    found = set(columns_map.values())
+    return dict(columns_map, **{col: col for col in detected if col not in found})
+
+def convert_and_process(input_file, output_file=None, columns_to_translate=None, languages=None, reverse=False,
+                        auto_detect=False):
     """Convert an Excel file and apply translations."""
     
     if not os.path.exists(input_file):
@@ -61,19 +106,12 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
                     if not found:
                         print(f"Warning: Column '{col}' not found in the Excel file")
                 
+                if auto_detect:
+                    columns_map = detected_columns(df, columns_map, languages, reverse)
+                
                 if columns_map:
-                    # Apply translations to each column
-                    for original_col, actual_col in columns_map.items():
-                        print(f"Translating column: {actual_col}")
-                        
-                        # Create a new column for translations
-                        new_column_name = f"{actual_col} Français"
-                        
-                        # Apply translation to each cell
-                        df[new_column_name] = df[actual_col].apply(lambda x: translate_text(x))
-                        
-                    # Save the result
-                    df.to_excel(output_file, index=False)
+                    # Translate, save and write the coverage report
+                    save_translated(df, columns_map, input_file, output_file, languages, reverse)
                     print(f"Successfully saved translated file: {output_file}")
                     return True
                 else:
@@ -114,19 +152,12 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
                             if not found:
                                 print(f"Warning: Column '{col}' not found in the Excel file")
                         
+                        if auto_detect:
+                            columns_map = detected_columns(df, columns_map, languages, reverse)
+                        
                         if columns_map:
-                            # Apply translations to each column
-                            for original_col, actual_col in columns_map.items():
-                                print(f"Translating column: {actual_col}")
-                                
-                                # Create a new column for translations
-                                new_column_name = f"{actual_col} Français"
-                                
-                                # Apply translation to each cell
-                                df[new_column_name] = df[actual_col].apply(lambda x: translate_text(x))
-                            
-                            # Save the result
-                            df.to_excel(output_file, index=False)
+                            # Translate, save and write the coverage report
+                            save_translated(df, columns_map, input_file, output_file, languages, reverse)
                             print(f"Successfully saved translated file: {output_file}")
                             return True
                         else:
@@ -138,105 +169,51 @@ def convert_and_process(input_file, output_file=None, columns_to_translate=None)
     print("All processing methods failed.")
     return False
 
-def translate_text(text):
-    """Translate text from English to French."""
-    if pd.isna(text) or text is None or str(text).strip() == '':
-        return text
-        
-    # Dictionary of translations
-    translations = {
-        # Common values in Description and Message columns
-        'ABSENCE OF REFERENCE VOLTAGE': 'ABSENCE DE TENSION DE REFERENCE',
-        'ABSENCE OF VOLTAGE': 'ABSENCE DE TENSION',
-        'DEAD INCOMING DEAD RUNNING': 'ENTRÉE HORS TENSION, FONCTIONNEMENT HORS TENSION',  
-        'DEAD INCOMING  DEAD RUNNING': 'ENTRÉE HORS TENSION, FONCTIONNEMENT HORS TENSION',  
-        'LIVE INCOMING LIVE RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT SOUS TENSION',   
-        'LIVE INCOMING  LIVE RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT SOUS TENSION',  
-        'CLOSE PERMISSIVE': 'AUTORISATION DE FERMETURE',
-        'PRESENE OF REFERENCE VOLTAGE': 'PRÉSENCE DE TENSION DE RÉFÉRENCE',
-        'PRASENCE OF VOLTAGE': 'PRÉSENCE DE TENSION',
-        'LIVE INCOMING  DEAD RUNNING': 'ENTRÉE SOUS TENSION, FONCTIONNEMENT HORS TENSION',
-        'POSSIBLE CLOSING': 'FERMETURE AUTORISEE',
-        'BUS-1 SELECT': 'SÉLECTION DU BUS-1',
-        'BUS-2 DESELECT': 'DÉSÉLECTION DU BUS-2',
-        'BAY L/R MODE': 'MODE LOCAL/DISTANT DE LA TRAVÉE',
-        'BAY L/R  MODE': 'MODE L/R TRAVEE',
-        'IINTERLOCK PERMISSIVE': 'VERROUILLAGE AUTORISÉ',
-        'CARRIER IN': 'PORTEUSE ENTRANTE',
-        'CARRIER OUT': 'PORTEUSE SORTANTE',
-        'EQUIPMENT BCU': 'EQUIPEMENT BCU',
-        'COMMUNICATION': 'COMMUNICATION',
-        'UNLOCKING RELAY ACTIVATED': 'RELAIS DEVERROUILLAGE ACTIVE',
-        'PROTECTION': 'PROTECTION',
-        'STAGE START': 'DEMARRAGE ETAPE',
-        'STAGE': 'ETAPE',
-        'TRIP CIRCUIT FAULT': 'DEFAUT CIRCUIT DE DECLENCHEMENT',
-        'I/L PERMISSIVE': 'PERMISSIF V/F',
-        'CLOSE I/L PERMISSIVE': 'PERMISSIF V/F FERMETURE',
-        'OPEN I/L PERMISSIVE': 'PERMISSIF V/F OUVERTURE',
-        
-        # Alarm/status values typically in Message column
-        'Set': 'Réglé',
-        'Set - App Ack': 'Réglé - App Ack',
-        'SET': 'RÉGLÉ',
-        'SET - APP ACK': 'RÉGLÉ - APP ACK',
-        'Reset': 'Réinitialiser',
-        'Reset - App Ack': 'Réinitialiser - App Ack',
-        'RESET': 'RÉINITIALISER',
-        'RESET - APP ACK': 'RÉINITIALISER - APP ACK',
-        'Operational': 'Opérationnel',
-        'OPERATIONAL': 'OPÉRATIONNEL',
-        'Alarm': 'Alarme',
-        'ALARM': 'ALARME',
-        'Normal': 'Normal',
-        'NORMAL': 'NORMAL',
-        'Operated': 'Opéré',
-        'OPERATED': 'OPÉRÉ',
-        'TRIP - App Ack': 'DÉCLENCHEMENT - App Ack',
-        'OPEN - App Ack': 'OUVERT - App Ack',
-        'OPEN - Clearing': 'OUVERT - Effacement',
-        'Fail - App Ack': 'Défaillance - App Ack',
-        'Fail - Clearing': 'Défaillance - Effacement',
-        'Faulty - Clearing': 'Défectueux - Effacement',
-        'Operated - Clearing': 'Opéré - Effacement',
-        'Operated - App Ack': 'Opéré - App Ack',
-        'OFF - App Ack': 'DÉSACTIVÉ - App Ack',
-        'Off - App Ack': 'Désactivé - App Ack',
-        'Trip': 'Déclenchement',
-        'Closed': 'Fermé',
-        'On Sync': 'En Synchronisation',
-        'Healthy': 'En Bon État',
-        'Operational Mode': 'Mode Opérationnel',
-        'Fail': 'Défaillance',
-        'Faulty': 'Défectueux',
-        'Off': 'Désactivé'
-    }
-    
-    # Try to find a direct match
-    text_str = str(text).strip().upper()
-    
-    if text_str in translations:
-        return translations[text_str]
-    
-    # Try with normalized spacing
-    normalized_text = ' '.join(text_str.split())
-    for key, value in translations.items():
-        if normalized_text == ' '.join(key.upper().split()):
-            return value
-    
-    # If no translation found, return original
-    return text
-
 def main():
     """Main function to parse arguments and process Excel files."""
     parser = argparse.ArgumentParser(description='Process Excel files and apply translations.')
-    parser.add_argument('input_file', help='Path to the input Excel file (.xls or .xlsx)')
+    parser.add_argument('input_file', nargs='?', help='Path to the input Excel file (.xls or .xlsx)')
     parser.add_argument('-o', '--output', help='Path to the output Excel file (default: input_name_translated.xlsx)')
     parser.add_argument('-c', '--columns', nargs='+', help='Columns to translate (default: Description Message)')
+    parser.add_argument('-l', '--languages', nargs='+', choices=available_languages(),
+                        help='Target languages, one column each (default: fr)')
+    parser.add_argument('-r', '--reverse', action='store_true',
+                        help='Translate from the language given with -l (default: fr) back to English')
+    parser.add_argument('-a', '--auto-detect', action='store_true',
+                        help='Translate the columns whose values are in the glossary, whatever their name')
     parser.add_argument('--skip-description', action='store_true', help='Skip translating the Description column')
     parser.add_argument('--skip-message', action='store_true', help='Skip translating the Message column')
+    parser.add_argument('--serve', type=int, nargs='?', const=DEFAULT_PORT, metavar='PORT',
+                        help=f'Keep running and translate the workbooks posted to http://HOST:PORT/translate '
+                             f'(default port: {DEFAULT_PORT})')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Address the translation service listens on (default: %(default)s)')
     
     args = parser.parse_args()
+    if args.reverse and args.languages and len(args.languages) > 1:
+        parser.error('--reverse takes a single language')
+    if args.input_file is None and args.serve is None:
+        parser.error('an input file or --serve is required')
+    
+    if args.serve is not None:
+        # run.sh and run.bat post each file here instead of starting a container per file
+        warm_up()
+        get_glossaries(args.languages, args.reverse)
+        watch_glossary()
+        job = partial(convert_and_process, columns_to_translate=args.columns, languages=args.languages,
+                      reverse=args.reverse, auto_detect=args.auto_detect)
+        server = TranslationServer(job, args.host, args.serve)
+        # PID 1 of a container ignores SIGTERM unless it installs a handler
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Translation service listening on http://{args.host}:{args.serve}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            print("Stopped serving.")
+        sys.exit(0)
     
     # Handle column selection based on skip arguments
     columns_to_translate = args.columns
@@ -255,7 +232,8 @@ def main():
     
     print(f"Columns to translate: {', '.join(columns_to_translate)}")
     
-    success = convert_and_process(args.input_file, args.output, columns_to_translate)
+    success = convert_and_process(args.input_file, args.output, columns_to_translate, args.languages, args.reverse,
+                                  args.auto_detect)
     
     if success:
         print("Processing completed successfully.")
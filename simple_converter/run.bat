@@ -10,10 +10,28 @@ if %ERRORLEVEL% neq 0 (
     exit /b 1
 )
 
+REM The image is only rebuilt when the files it is built from change, and the
+REM files are translated by a service that stays running between calls
+REM (src\daemon.py), so a run does not pay for a build and a Python start-up
+REM Not the names and port of the main run.bat, which builds a different image
+set IMAGE=simple-excel-translator
+set DAEMON=simple-excel-translator-daemon
+set PORT=%TRANSLINGOO_SIMPLE_PORT%
+if "%PORT%"=="" set PORT=8766
+REM The build context is the repository root so src\ and the glossary can be copied in
+set ROOT=%~dp0..\
+
+if "%~1"=="--stop" (
+    docker rm -f %DAEMON% >nul 2>nul
+    echo Translation service stopped.
+    exit /b 0
+)
+
 REM Check for input file
 if "%~1"=="" (
     echo Please provide the path to the Excel file:
     echo Usage: run.bat path\to\excelfile.xls [output_file.xlsx]
+    echo        run.bat --stop    ^(stop the translation service^)
     exit /b 1
 )
 
@@ -34,26 +52,94 @@ if "%~2"=="" (
 echo Input file: %INPUT_FILE%
 echo Output will be saved to: %OUTPUT_FILE%
 
-REM Build the Docker image
+REM Build the Docker image if its inputs changed (same hash as run.sh)
+set HASH=
+for /f %%h in ('powershell -NoProfile -Command "$root = (Resolve-Path -LiteralPath '%ROOT%.').Path; $files = @('simple_converter/Dockerfile', 'simple_converter/converter.py') + @(Get-ChildItem -LiteralPath (Join-Path $root 'src'), (Join-Path $root 'glossary') -Recurse -File | Where-Object { ($_.Extension -eq '.py' -or $_.Extension -eq '.tsv') -and $_.FullName -notlike '*__pycache__*' } | ForEach-Object { $_.FullName.Substring($root.Length + 1).Replace('\', '/') }); [Array]::Sort($files, [StringComparer]::Ordinal); $data = New-Object IO.MemoryStream; foreach ($file in $files) { [byte[]]$bytes = [Text.Encoding]::UTF8.GetBytes($file + [char]10) + [IO.File]::ReadAllBytes((Join-Path $root $file)); $data.Write($bytes, 0, $bytes.Length) }; (-join ([Security.Cryptography.SHA256]::Create().ComputeHash($data.ToArray()) | ForEach-Object { $_.ToString('x2') })).Substring(0, 16)"') do set HASH=%%h
+
+docker image inspect -f "{{json .Config.Labels}}" %IMAGE% 2>nul | findstr /c:"%HASH%" >nul 2>nul
+if "%HASH%"=="" goto build
+if %ERRORLEVEL% equ 0 goto built
+:build
 echo.
 echo Building the Docker image...
-docker build -t excel-translator .
+docker build --label "translingoo.inputs=%HASH%" -t %IMAGE% -f "%ROOT%simple_converter\Dockerfile" "%ROOT%."
 
 if %ERRORLEVEL% neq 0 (
     echo Failed to build Docker image.
     exit /b 1
 )
+:built
 
-REM Run the container
+REM curl ships with Windows 10 and later; without it, fall back to one container per file
+where curl >nul 2>nul
+if %ERRORLEVEL% equ 0 goto serve
 echo.
-echo Processing the Excel file...
-docker run --rm -v "%~dp1:/data" excel-translator "/data/%~nx1" -o "/data/%~nx2"
-
+echo Processing the Excel file (curl not found, starting a container)...
+:container
+REM A container of its own has no upload limit
+for %%F in ("%OUTPUT_FILE%") do set OUTPUT_DIR=%%~dpF
+for %%F in ("%OUTPUT_FILE%") do set OUTPUT_NAME=%%~nxF
+docker run --rm -v "%~dp1:/data" -v "%OUTPUT_DIR%:/output" %IMAGE% "/data/%~nx1" -o "/output/%OUTPUT_NAME%"
 if %ERRORLEVEL% neq 0 (
     echo Failed to process the Excel file.
     exit /b 1
-) else (
+)
+goto success
+
+:serve
+REM (Re)start the service if it is not running the current image
+set IMAGE_ID=
+set DAEMON_STATE=
+for /f "delims=" %%i in ('docker image inspect -f "{{.Id}}" %IMAGE%') do set IMAGE_ID=%%i
+for /f "delims=" %%s in ('docker inspect -f "{{.State.Running}} {{.Image}}" %DAEMON% 2^>nul') do set DAEMON_STATE=%%s
+if "%DAEMON_STATE%"=="true %IMAGE_ID%" goto started
+echo.
+echo Starting the translation service...
+docker rm -f %DAEMON% >nul 2>nul
+docker run -d --name %DAEMON% -p 127.0.0.1:%PORT%:8765 %IMAGE% --serve 8765 --host 0.0.0.0 >nul
+if %ERRORLEVEL% neq 0 (
+    echo Failed to start the translation service.
+    exit /b 1
+)
+:started
+set /a TRIES=0
+:wait_health
+curl -sf http://127.0.0.1:%PORT%/health >nul 2>nul
+if %ERRORLEVEL% equ 0 goto healthy
+set /a TRIES+=1
+if %TRIES% geq 60 goto healthy
+timeout /t 1 /nobreak >nul
+goto wait_health
+:healthy
+
+REM Send the file; the output is written to a partial file and renamed when complete
+echo.
+echo Processing the Excel file...
+set HEADERS=%TEMP%\translingoo_headers_%RANDOM%.txt
+set STATUS=
+for /f %%s in ('curl -sS -o "%OUTPUT_FILE%.part" -D "%HEADERS%" -w "%%{http_code}" --data-binary "@%INPUT_FILE%" -H "Content-Type: application/octet-stream" -H "X-Translingoo-Filename: %~nx1" http://127.0.0.1:%PORT%/translate') do set STATUS=%%s
+
+if "%STATUS%"=="413" (
+    REM Larger than the service accepts ^(TRANSLINGOO_MAX_UPLOAD_MB^)
+    del /q "%OUTPUT_FILE%.part" "%HEADERS%" 2>nul
     echo.
-    echo Success! File has been translated and saved to:
-    echo %OUTPUT_FILE%
-) 
\ No newline at end of file
+    echo Processing the Excel file ^(too large for the translation service, starting a container^)...
+    goto container
+)
+if not "%STATUS%"=="200" (
+    echo Failed to process the Excel file.
+    if exist "%OUTPUT_FILE%.part" type "%OUTPUT_FILE%.part"
+    echo See also: docker logs %DAEMON%
+    del /q "%OUTPUT_FILE%.part" "%HEADERS%" 2>nul
+    exit /b 1
+)
+move /y "%OUTPUT_FILE%.part" "%OUTPUT_FILE%" >nul
+REM Coverage report, as written next to the output by converter.py
+for %%F in ("%OUTPUT_FILE%") do set REPORT_FILE=%%~dpnF.coverage.json
+for /f "tokens=1,* delims= " %%a in ('findstr /b /i /c:"X-Translingoo-Report: " "%HEADERS%"') do echo %%b> "%REPORT_FILE%"
+del /q "%HEADERS%" 2>nul
+
+:success
+echo.
+echo Success! File has been translated and saved to:
+echo %OUTPUT_FILE%
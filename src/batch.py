@@ -0,0 +1,191 @@
+"""
+Batch processing of many workbooks on a process pool.
+
+The command-line converters accept directories and glob patterns as well as
+single files. The files are spread over a pool of worker processes, so a
+nightly run starts one interpreter per core instead of one per workbook.
+Every finished file is recorded in a JSON manifest with its checksum, its
+output and the settings of the job; when an interrupted run is started
+again, the files already done that have not changed since, with the same
+output and settings, are skipped.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+EXCEL_EXTENSIONS = ('.xls', '.xlsx', '.xlsm')
+MANIFEST_NAME = 'translingoo_manifest.json'
+
+# File statuses recorded in the manifest
+DONE = 'done'
+FAILED = 'failed'
+
+
+def is_batch(inputs):
+    """Return True unless the inputs name a single file."""
+    return len(inputs) != 1 or not os.path.isfile(inputs[0])
+
+
+def expand_inputs(inputs, extensions=EXCEL_EXTENSIONS, exclude_suffix=None):
+    """Return the files named by paths, directories and glob patterns, sorted.
+
+    Directories contribute the files directly inside them. Excel lock files
+    (``~$name.xlsx``) and names ending with ``exclude_suffix``, the outputs of
+    an earlier run, are left out.
+    """
+    files = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+            if not candidates:
+                print(f"Warning: No files match {pattern}")
+        for path in candidates:
+            name = os.path.basename(path)
+            if (os.path.isfile(path) and name.lower().endswith(extensions) and not name.startswith('~$')
+                    and not (exclude_suffix and name.endswith(exclude_suffix))):
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def output_path(input_path, output_dir=None, suffix='_translated.xlsx'):
+    """Return the output of an input file, next to it unless output_dir is given."""
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir or os.path.dirname(input_path), stem + suffix)
+
+
+def file_checksum(path):
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _normalize(settings):
+    """Return settings as they read back from the manifest (tuples become lists)."""
+    return json.loads(json.dumps(settings or {}, sort_keys=True))
+
+
+class Manifest:
+    """Status, checksum and job settings of every file of a batch, saved after each file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}
+        if self.path.exists():
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.files = json.load(f)['files']
+                print(f"Resuming from {self.path} ({len(self.files)} files recorded)")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Could not read manifest {self.path}, starting over: {str(e)}")
+
+    def is_done(self, input_path, output_file=None, settings=None):
+        """Return True if a file was translated with these settings and has not changed since.
+
+        A file done into another output, or with other settings (columns,
+        languages...), is done again. The checksum is only computed when the
+        size or modification time differs from the recorded one.
+        """
+        entry = self.files.get(input_path)
+        if entry is None or entry['status'] != DONE or not os.path.exists(entry['output']):
+            return False
+        if output_file is not None and os.path.abspath(entry['output']) != os.path.abspath(output_file):
+            return False
+        if entry.get('settings', {}) != _normalize(settings):
+            return False
+        size, mtime_ns = _signature(input_path)
+        if size == entry['size'] and mtime_ns == entry['mtime_ns']:
+            return True
+        if size != entry['size'] or file_checksum(input_path) != entry['checksum']:
+            return False
+        # Touched but unchanged: remember the new time to skip hashing next run
+        entry['mtime_ns'] = mtime_ns
+        return True
+
+    def record(self, input_path, **entry):
+        self.files[input_path] = entry
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically, so an interrupted run never leaves it half written."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.files}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _run_job(job, input_path, output_file):
+    """Run one job in a worker process; never raises."""
+    start = time.perf_counter()
+    try:
+        checksum = file_checksum(input_path)
+        size, mtime_ns = _signature(input_path)
+        success = bool(job(input_path, output_file))
+        error = None if success else 'processing failed'
+    except Exception as e:
+        checksum, size, mtime_ns = None, None, None
+        success, error = False, f"{type(e).__name__}: {str(e)}"
+    return {'status': DONE if success else FAILED, 'output': output_file, 'checksum': checksum,
+            'size': size, 'mtime_ns': mtime_ns, 'seconds': round(time.perf_counter() - start, 3),
+            'error': error, 'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+
+
+def run_batch(files, job, output_for, workers=None, manifest=None, settings=None):
+    """Run ``job(input_path, output_path)`` for every file on a process pool.
+
+    ``job`` must be picklable (a module-level function or a
+    ``functools.partial`` of one) and return True on success. ``settings``
+    are the options of the job that change its output; they are recorded in
+    the manifest, and files it records as done into the same output with the
+    same settings are skipped. Returns the number of files that failed.
+    """
+    pending = [path for path in files
+               if manifest is None or not manifest.is_done(path, output_for(path), settings)]
+    skipped = len(files) - len(pending)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    print(f"Processing {len(pending)} files with {workers} workers"
+          + (f" ({skipped} already done)" if skipped else ''))
+
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_job, job, path, output_for(path)): path for path in pending}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                entry = future.result()
+                if entry['status'] != DONE:
+                    failed += 1
+                if manifest is not None:
+                    manifest.record(path, settings=_normalize(settings), **entry)
+                print(f"[{done}/{len(pending)}] {entry['status']}: {path} ({entry['seconds']:.1f}s)"
+                      + (f" - {entry['error']}" if entry['error'] else ''))
+        except KeyboardInterrupt:
+            # Files already finished are in the manifest; the rest is redone on resume
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    print(f"Batch finished in {time.perf_counter() - start:.1f}s: "
+          f"{len(pending) - failed} done, {failed} failed, {skipped} skipped")
+    return failed
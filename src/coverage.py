@@ -0,0 +1,84 @@
+"""
+Per-file translation coverage reports.
+
+Every translated cell falls into one of five groups: translated by the
+glossary, kept because it is already French, empty, not text (numbers,
+dates and booleans, which are never translated), or left unmatched. The
+counts are taken from the map of distinct values each job builds anyway (or
+counted as rows stream past), so a report costs no extra pass over the data.
+It is written next to the output under the output's name with its extension
+replaced, ``out.coverage.json`` for ``out.xlsx``.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+TRANSLATED = 'translated'
+FRENCH = 'french'
+EMPTY = 'empty'
+UNMATCHED = 'unmatched'
+NON_TEXT = 'non_text'
+STATUSES = (TRANSLATED, FRENCH, EMPTY, NON_TEXT, UNMATCHED)
+
+REPORT_SUFFIX = '.coverage.json'
+
+
+def new_counts():
+    """Return zeroed cell counts for one column."""
+    return dict.fromkeys(STATUSES, 0)
+
+
+def summarize(counts):
+    """Add the row total and the covered share to a column's counts."""
+    summary = dict(new_counts(), **counts)
+    summary['rows'] = sum(summary[status] for status in STATUSES)
+    filled = summary['rows'] - summary[EMPTY] - summary[NON_TEXT]
+    # Share of non-empty text cells that came out in French
+    summary['coverage'] = round((summary[TRANSLATED] + summary[FRENCH]) / filled, 4) if filled else None
+    return summary
+
+
+def build_report(input_path, output_path, stats, glossary_version=None):
+    """Build the coverage report of one file from its job statistics."""
+    columns = {column: summarize(counts) for column, counts in stats.get('coverage', {}).items()}
+    totals = new_counts()
+    for counts in stats.get('coverage', {}).values():
+        for status in STATUSES:
+            totals[status] += counts.get(status, 0)
+    return {
+        'input_file': os.path.basename(str(input_path)),
+        'output_file': os.path.basename(str(output_path)),
+        'glossary_version': glossary_version,
+        # One version per target language when a job writes several
+        'glossary_versions': stats.get('glossary_versions', {}),
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        # Rows written to the output; 'truncated' tells whether the input had more
+        'rows': stats.get('rows'),
+        'truncated': stats.get('truncated', False),
+        'seconds': round(stats.get('seconds', 0.0), 3),
+        'columns': columns,
+        'total': summarize(totals),
+    }
+
+
+def report_path(output_path):
+    """Return the report of a translated file: ``out.coverage.json`` for ``out.xlsx``."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + REPORT_SUFFIX)
+
+
+def write_report(report, output_path):
+    """Write a report next to the translated file and return its path."""
+    path = report_path(output_path)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"DEBUG: Could not write coverage report: {str(e)}")
+        return None
+    total = report['total']
+    print(f"DEBUG: Coverage {total['coverage']} ({total[TRANSLATED]} translated, {total[FRENCH]} French, "
+          f"{total[EMPTY]} empty, {total[NON_TEXT]} not text, {total[UNMATCHED]} unmatched); report saved to {path}")
+    return path
@@ -0,0 +1,229 @@
+"""
+Translation daemon: a warm converter behind a local HTTP port.
+
+``run.sh`` and ``run.bat`` used to build the image and start a new container
+for every file, paying for the build check, the Python start-up,
+the pandas import and the glossary load each time. ``converter.py --serve``
+instead keeps one process running with all of that loaded, and the scripts
+send it one request per file.
+
+The service is plain HTTP on a TCP port rather than a Unix socket: a socket
+inside the container cannot be reached from the host through Docker
+Desktop, while a port published on ``127.0.0.1`` can, on every platform.
+
+``GET /health``
+    ``{"status": "ok", "glossary_versions": {...}, "active_jobs": n, "jobs_total": n}``
+    once warm: the jobs running now and those handled since the start.
+``POST /translate``
+    The workbook is the request body and its name the ``X-Translingoo-Filename``
+    header (the extension picks the reader). ``columns`` and ``languages`` may
+    be repeated in the query string, ``reverse=1`` and ``auto_detect=1`` are
+    flags. The answer is the translated ``.xlsx`` with the coverage report as
+    ASCII JSON in ``X-Translingoo-Report``, or a 422 with the end of the job
+    log when the translation failed. Workbooks larger than
+    ``TRANSLINGOO_MAX_UPLOAD_MB`` (default 200, 0 for no limit) get a 413;
+    the scripts then translate them in a container of their own.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+try:
+    from .batch import EXCEL_EXTENSIONS
+    from .coverage import report_path
+    from .glossary import available_languages
+    from .translator import get_glossaries
+except ImportError:
+    from batch import EXCEL_EXTENSIONS
+    from coverage import report_path
+    from glossary import available_languages
+    from translator import get_glossaries
+
+DEFAULT_PORT = 8765
+FILENAME_HEADER = 'X-Translingoo-Filename'
+REPORT_HEADER = 'X-Translingoo-Report'
+# Request bodies are read into memory; 0 turns the limit off
+MAX_UPLOAD_BYTES = int(float(os.environ.get('TRANSLINGOO_MAX_UPLOAD_MB', '200')) * 1024 * 1024)
+# Lines of the job log sent back when a translation fails
+LOG_TAIL_LINES = 20
+
+
+class _ThreadLog:
+    """``sys.stdout`` stand-in that also keeps what each job thread prints.
+
+    The converter reports errors with print; the lines are passed through
+    to the daemon's own output and kept to explain a failed request.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.lines = []
+        return self.local.lines
+
+    def release(self):
+        self.local.lines = None
+
+    def write(self, text):
+        lines = getattr(self.local, 'lines', None)
+        if lines is not None:
+            lines.append(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'Translingoo'
+
+    def _send(self, status, body, content_type='text/plain; charset=utf-8', headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != '/health':
+            self._send(404, 'Not found\n')
+            return
+        self._send(200, json.dumps(self.server.health()), 'application/json')
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/translate':
+            self._send(404, 'Not found\n')
+            return
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self._send(411, 'Content-Length is required\n')
+            return
+        if MAX_UPLOAD_BYTES and int(length) > MAX_UPLOAD_BYTES:
+            self._send(413, f'Workbooks are limited to {MAX_UPLOAD_BYTES} bytes\n')
+            return
+        filename = os.path.basename(self.headers.get(FILENAME_HEADER, ''))
+        try:
+            # http.server decodes headers as Latin-1; curl sends the name as UTF-8
+            filename = filename.encode('latin-1').decode('utf-8')
+        except UnicodeError:
+            pass
+        if not filename.lower().endswith(EXCEL_EXTENSIONS):
+            self._send(400, f'{FILENAME_HEADER} must name an Excel file\n')
+            return
+        try:
+            options = parse_options(url.query)
+        except ValueError as e:
+            self._send(400, f'{str(e)}\n')
+            return
+        body = self.rfile.read(int(length))
+
+        success, log, output, report = self.server.translate(filename, body, options)
+        if not success:
+            self._send(422, ''.join(log[-LOG_TAIL_LINES:]) or 'Translation failed\n')
+            return
+        # Quoted as RFC 6266 asks, so quotes or line breaks in the name cannot break the header
+        output_name = quote(f"{os.path.splitext(filename)[0]}_translated.xlsx")
+        headers = {'Content-Disposition': f"attachment; filename*=UTF-8''{output_name}"}
+        if report is not None:
+            headers[REPORT_HEADER] = json.dumps(report, separators=(',', ':'))
+        self._send(200, output, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', headers)
+
+    def log_message(self, format, *args):
+        print(f"DEBUG: {self.address_string()} {format % args}")
+
+
+def parse_options(query):
+    """Turn the query string of ``/translate`` into the job's keyword arguments."""
+    params = parse_qs(query)
+    options = {
+        'columns_to_translate': params.get('columns') or None,
+        'languages': params.get('languages') or None,
+        'reverse': params.get('reverse', ['0'])[-1] in ('1', 'true', 'yes'),
+        'auto_detect': params.get('auto_detect', ['0'])[-1] in ('1', 'true', 'yes'),
+    }
+    unknown = [language for language in options['languages'] or [] if language not in available_languages()]
+    if unknown:
+        raise ValueError(f"Unknown languages: {', '.join(unknown)}")
+    if options['reverse'] and options['languages'] and len(options['languages']) > 1:
+        raise ValueError('reverse takes a single language')
+    return options
+
+
+class TranslationServer(ThreadingHTTPServer):
+    """Serve ``job(input, output, **options)`` (``convert_and_process``) over HTTP.
+
+    Like ``FolderWatcher``, the job runs in this process, so whatever was
+    loaded before ``serve_forever`` stays warm. At most ``workers`` jobs run
+    at once; further requests wait for a free slot.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, job, host='127.0.0.1', port=DEFAULT_PORT, workers=1):
+        super().__init__((host, port), _Handler)
+        self.job = job
+        self.slots = threading.BoundedSemaphore(max(1, workers))
+        # Jobs running now, and jobs handled since the start
+        self.active_jobs = 0
+        self.jobs_total = 0
+        self.jobs_lock = threading.Lock()
+        self.log = sys.stdout if isinstance(sys.stdout, _ThreadLog) else _ThreadLog(sys.stdout)
+        sys.stdout = self.log
+
+    def health(self):
+        return {'status': 'ok', 'glossary_versions': {g.language: g.version for g in get_glossaries()},
+                'active_jobs': self.active_jobs, 'jobs_total': self.jobs_total}
+
+    def translate(self, filename, body, options):
+        """Run the job on an uploaded workbook; return ``(success, log lines, output bytes, report)``."""
+        workdir = tempfile.mkdtemp(prefix='translingoo-daemon-')
+        input_path = os.path.join(workdir, filename)
+        output_path = os.path.join(workdir, 'output', f"{os.path.splitext(filename)[0]}_translated.xlsx")
+        os.makedirs(os.path.dirname(output_path))
+        with open(input_path, 'wb') as f:
+            f.write(body)
+        lines = self.log.capture()
+        try:
+            with self.slots:
+                with self.jobs_lock:
+                    self.active_jobs += 1
+                    self.jobs_total += 1
+                start = time.perf_counter()
+                try:
+                    success = bool(self.job(input_path, output_path, **options))
+                except Exception as e:
+                    print(f"Error: Failed to translate {filename}: {str(e)}")
+                    success = False
+                finally:
+                    with self.jobs_lock:
+                        self.active_jobs -= 1
+                print(f"{'Translated' if success else 'Failed'}: {filename} in {time.perf_counter() - start:.2f}s")
+            if not success or not os.path.exists(output_path):
+                return False, lines, None, None
+            with open(output_path, 'rb') as f:
+                output = f.read()
+            report = None
+            if os.path.exists(report_path(output_path)):
+                with open(report_path(output_path), encoding='utf-8') as f:
+                    report = json.load(f)
+            return True, lines, output, report
+        finally:
+            self.log.release()
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,88 @@
+"""
+Detection of the columns worth translating.
+
+Exports from other systems do not always call their columns "Description"
+and "Message". ``detect_columns`` samples the first rows of every column and
+measures how many of the sampled text cells the glossary translates, the
+way the translator itself would (fuzzy and suffix matches included); the
+columns above a threshold are translated along with the ones asked for (see
+``merge_columns``). Each distinct value is looked up once, and columns that
+hold mostly numbers or dates are skipped before any lookup, so detection
+stays fast on wide sheets. The values looked up are cached, so the ones that
+are translated afterwards cost nothing more.
+"""
+
+import os
+from collections import Counter
+
+try:
+    from .coverage import FRENCH, TRANSLATED
+except ImportError:
+    from coverage import FRENCH, TRANSLATED
+
+# Rows sampled from the top of each column
+SAMPLE_ROWS = 500
+# Share of the sampled text cells the glossary must know
+THRESHOLD = float(os.environ.get('TRANSLINGOO_DETECT_THRESHOLD', '0.3'))
+# Columns where fewer of the filled cells are text are not considered
+MIN_TEXT_SHARE = 0.5
+
+
+def _is_text(value):
+    return isinstance(value, str) and value.strip() != ''
+
+
+def hit_rate(values, glossary):
+    """Return the share of text values (counted per cell) that come out in the target language."""
+    counts = Counter(value for value in values if _is_text(value))
+    if not counts:
+        return 0.0
+    known = sum(rows for value, rows in counts.items() if glossary.lookup(value)[1] in (TRANSLATED, FRENCH))
+    return known / sum(counts.values())
+
+
+def detect_columns(columns, glossary, threshold=THRESHOLD):
+    """Return the names of the columns the glossary can translate, in order.
+
+    ``columns`` maps each column name to a sample of its values.
+    """
+    selected = []
+    for name, values in columns.items():
+        filled = [value for value in values if value is not None and value == value and str(value).strip()]
+        texts = [value for value in filled if _is_text(value)]
+        if not texts or len(texts) < MIN_TEXT_SHARE * len(filled):
+            continue
+        rate = hit_rate(texts, glossary)
+        print(f"DEBUG: Column '{name}': {rate:.0%} of sampled values in the glossary")
+        if rate >= threshold:
+            selected.append(name)
+    print(f"DEBUG: Detected columns to translate: {selected}")
+    return selected
+
+
+def merge_columns(selected, detected, available):
+    """Return the columns to translate when detection is on.
+
+    The ``selected`` columns the sheet has (names compared case-insensitively
+    against ``available``) come first, followed by the detected ones not
+    already among them; detection adds columns, it never drops one that was
+    asked for. Without a selection, the detected columns are used alone.
+    """
+    names = {str(name).lower(): name for name in available}
+    columns = [names[str(name).lower()] for name in selected or [] if str(name).lower() in names]
+    chosen = {str(name).lower() for name in columns}
+    columns += [name for name in detected if str(name).lower() not in chosen]
+    print(f"DEBUG: Translating columns {columns}")
+    return columns
+
+
+def sample_dataframe(df, rows=SAMPLE_ROWS):
+    """Return ``{column: values}`` for the first rows of a DataFrame's text columns."""
+    sample = df.head(rows).select_dtypes(exclude=['number', 'datetime', 'bool'])
+    return {name: sample[name].tolist() for name in sample.columns if 'Unnamed' not in str(name)}
+
+
+def sample_rows(header, rows):
+    """Return ``{column: values}`` for rows given as tuples (see streaming.py)."""
+    return {name: [row[i] if i < len(row) else None for row in rows]
+            for i, name in enumerate(header) if not name.startswith('Unnamed')}
@@ -0,0 +1,155 @@
+"""
+Approximate matching of misspelled terms against the glossary.
+
+Alarm exports contain typos ("PRASENCE OF VOLTAGE", "IINTERLOCK PERMISSIVE")
+that used to be listed in the glossary one by one. FuzzyMatcher finds the
+closest glossary term instead, using a trigram index over the normalized keys
+so a lookup only compares the query with the few terms that could be close.
+
+A match is only accepted when it is close (``max_distance`` edits), confident
+(``min_confidence``, the share of characters that did not need an edit),
+unambiguous, and only corrects real words: numbers must match and edits must
+fall in words of at least four letters, so "BAY 1 TRIP" never becomes the
+translation of "BAY 2 TRIP", nor "DISJONCTEUR QB1" that of "DISJONCTEUR QD1".
+"""
+
+import re
+import threading
+
+DIGITS = re.compile(r'\d+')
+# Shortest word a typo may be corrected in; shorter tokens are usually codes
+MIN_WORD_LENGTH = 4
+
+
+def edit_distance(a, b, limit=None):
+    """Levenshtein distance between two strings.
+
+    With ``limit``, stops early and returns ``limit + 1`` as soon as the
+    distance is known to be larger.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def corrects_words_only(key, term):
+    """Return True if key and term only differ inside ordinary words."""
+    if DIGITS.findall(key) != DIGITS.findall(term):
+        return False
+    key_words, term_words = key.split(), term.split()
+    if len(key_words) != len(term_words):
+        # A space was added or dropped; the edit distance already bounds it
+        return True
+    return all(a == b or (a.isalpha() and b.isalpha() and min(len(a), len(b)) >= MIN_WORD_LENGTH)
+               for a, b in zip(key_words, term_words))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to the words that contain them.
+
+    One edit changes at most three trigrams, so a word within ``d`` edits of
+    the query shares at least ``len(trigrams(query)) - 3 * d`` of them. Only
+    the few words that pass this count, and the length check, are compared
+    with the full edit distance.
+    """
+
+    def __init__(self, words=()):
+        self._postings = {}
+        self._words = []
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        position = len(self._words)
+        self._words.append(word)
+        for gram in trigrams(word):
+            self._postings.setdefault(gram, []).append(position)
+
+    def search(self, word, max_distance):
+        """Return ``[(distance, word), ...]`` for words within max_distance."""
+        grams = trigrams(word)
+        needed = len(grams) - 3 * max_distance
+        if needed <= 0:
+            # Too short for the index to narrow anything down
+            positions = range(len(self._words))
+        else:
+            counts = {}
+            for gram in grams:
+                for position in self._postings.get(gram, ()):
+                    counts[position] = counts.get(position, 0) + 1
+            positions = [position for position, count in counts.items() if count >= needed]
+
+        found = []
+        for position in positions:
+            candidate = self._words[position]
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+        return found
+
+    def __len__(self):
+        return len(self._words)
+
+
+class FuzzyMatcher:
+    """Find the glossary term closest to a normalized key.
+
+    The index is built on the first lookup, so a glossary that never sees a
+    miss never pays for it.
+    """
+
+    def __init__(self, terms, max_distance=2, min_confidence=0.9):
+        self.terms = terms
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _get_index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = TrigramIndex(self.terms)
+        return self._index
+
+    def match(self, key):
+        """Return ``(term, confidence)`` for the best match of key, or None."""
+        # Confidence can only reach the threshold within this many edits
+        max_distance = min(self.max_distance, int(len(key) * (1 - self.min_confidence) + 1e-9))
+        if max_distance < 1:
+            return None
+
+        candidates = [(distance, term) for distance, term in self._get_index().search(key, max_distance)
+                      if corrects_words_only(key, term)]
+        if not candidates:
+            return None
+
+        best_distance = min(distance for distance, _ in candidates)
+        best = [term for distance, term in candidates if distance == best_distance]
+        if len({self.terms[term] for term in best}) > 1:
+            # Equally close terms with different translations: do not guess
+            return None
+
+        term = min(best)
+        confidence = 1 - best_distance / max(len(key), len(term))
+        if confidence < self.min_confidence:
+            return None
+        return term, confidence
@@ -0,0 +1,340 @@
+"""
+Glossary source files and their compiled, memory-mapped snapshots.
+
+The glossary is kept in one tab-separated source file per target language
+(``glossary/en_fr.tsv``, ``glossary/en_es.tsv``, ...). ``compile_glossary``
+turns each into a compact binary snapshot with normalized, sorted keys, and
+``load_snapshot`` memory-maps that snapshot. Lookups binary-search the mapped
+file directly, so start-up time and memory use do not grow with the number of
+terms, and every process that maps the same snapshot shares its pages.
+
+Usage:
+    python -m src.glossary compile [source.tsv] [-o snapshot.tlg]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+GLOSSARY_DIR = Path(os.environ.get('TRANSLINGOO_GLOSSARY_DIR',
+                                   Path(__file__).resolve().parent.parent / 'glossary'))
+DEFAULT_LANGUAGE = 'fr'
+# Language of the glossary keys, and target of reverse translations
+SOURCE_LANGUAGE = 'en'
+SNAPSHOT_SUFFIX = '.tlg'
+
+# Suffix of the column added for each target language ("Description Français")
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'fr': 'Français',
+    'es': 'Español',
+    'ar': 'العربية',
+}
+
+
+def source_path(language=DEFAULT_LANGUAGE):
+    """Return the glossary source file of a target language."""
+    return GLOSSARY_DIR / f"en_{language}.tsv"
+
+
+def available_languages():
+    """Return the target languages that have a glossary source file, default first."""
+    languages = (path.stem[len('en_'):] for path in GLOSSARY_DIR.glob('en_*.tsv'))
+    return sorted(languages, key=lambda language: (language != DEFAULT_LANGUAGE, language))
+
+
+def target_column_name(column, language=DEFAULT_LANGUAGE):
+    """Name of the column holding the translation of ``column``."""
+    return f"{column} {LANGUAGE_NAMES.get(language, language.upper())}"
+
+
+DEFAULT_SOURCE = source_path(DEFAULT_LANGUAGE)
+
+MAGIC = b'TLGS'
+FORMAT_VERSION = 2  # 2: adds the suffixes section
+
+# Header: magic, format version, number of sections, SHA-1 of the source
+HEADER = struct.Struct('<4sHH20s')
+# Section directory entry: name, kind, entry count, offset of its index
+SECTION = struct.Struct('<24sBxxxII')
+# Index entry: key offset, key length, value offset, value length
+ENTRY = struct.Struct('<IIII')
+
+# mkstemp creates files readable by their owner only; snapshots get the
+# usual permissions instead, so a service user can read what a deploy built
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+SNAPSHOT_MODE = 0o666 & ~_UMASK
+
+# Section kinds
+MAP = 0  # Normalized keys sorted for binary search
+LIST = 1  # Entries kept in source order
+
+SECTIONS = {
+    'terms': MAP,
+    'suffixes': MAP,
+    'special_cases': LIST,
+    'known_patterns': LIST,
+    'french_indicators': LIST,
+    'english_indicators': LIST,
+}
+
+
+def normalize_key(text):
+    """Uppercase a term and collapse runs of whitespace."""
+    return ' '.join(str(text).upper().split())
+
+
+def read_source(path):
+    """Parse a glossary source file into ``{section: [(key, value), ...]}``."""
+    sections = {name: [] for name in SECTIONS}
+    current = 'terms'
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            if line.startswith('[') and line.rstrip().endswith(']'):
+                current = line.strip()[1:-1]
+                if current not in SECTIONS:
+                    raise ValueError(f"{path}:{line_number}: unknown section [{current}]")
+                continue
+            key, _, value = line.partition('\t')
+            if SECTIONS[current] == MAP and not value:
+                raise ValueError(f"{path}:{line_number}: expected 'source<TAB>translation'")
+            sections[current].append((key, value))
+    return sections
+
+
+def _compile_terms(entries):
+    """Normalize term keys; a key already in normal form wins over variants."""
+    terms = {}
+    for key, value in entries:
+        if key == normalize_key(key):
+            terms.setdefault(key, value)
+    for key, value in entries:
+        terms.setdefault(normalize_key(key), value)
+    return sorted(terms.items(), key=lambda item: item[0].encode('utf-8'))
+
+
+def write_snapshot(sections, path, digest):
+    """Write compiled sections to ``path`` atomically."""
+    names = list(SECTIONS)
+    blob = bytearray()
+    indexes = []
+    for name in names:
+        entries = sections[name]
+        if SECTIONS[name] == MAP:
+            entries = _compile_terms(entries)
+        index = bytearray()
+        for key, value in entries:
+            key_bytes = key.encode('utf-8')
+            value_bytes = value.encode('utf-8')
+            index += ENTRY.pack(len(blob), len(key_bytes), len(blob) + len(key_bytes), len(value_bytes))
+            blob += key_bytes + value_bytes
+        indexes.append((name, len(entries), index))
+
+    offset = HEADER.size + SECTION.size * len(names)
+    directory = bytearray()
+    for name, count, index in indexes:
+        directory += SECTION.pack(name.encode('ascii'), SECTIONS[name], count, offset)
+        offset += len(index)
+    blob_offset = offset
+
+    data = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, len(names), digest))
+    data += directory
+    for _, _, index in indexes:
+        # Make key/value offsets absolute now that the blob position is known
+        for i in range(0, len(index), ENTRY.size):
+            key_off, key_len, value_off, value_len = ENTRY.unpack_from(index, i)
+            ENTRY.pack_into(index, i, key_off + blob_offset, key_len, value_off + blob_offset, value_len)
+        data += index
+    data += blob
+
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, SNAPSHOT_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def source_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def default_snapshot_path(source):
+    return Path(source).with_suffix(SNAPSHOT_SUFFIX)
+
+
+def compile_glossary(source=DEFAULT_SOURCE, snapshot=None):
+    """Compile a glossary source file into a binary snapshot."""
+    snapshot = Path(snapshot) if snapshot else default_snapshot_path(source)
+    sections = read_source(source)
+    write_snapshot(sections, snapshot, source_digest(source))
+    print(f"DEBUG: Compiled {source} to {snapshot} ({len(sections['terms'])} terms)")
+    return snapshot
+
+
+class SnapshotMap:
+    """Read-only mapping over a MAP section of a snapshot."""
+
+    def __init__(self, snapshot, count, index_offset):
+        self._mm = snapshot._mm
+        self._count = count
+        self._index_offset = index_offset
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self._mm, self._index_offset + i * ENTRY.size)
+
+    def _key_bytes(self, i):
+        key_off, key_len, _, _ = self._entry(i)
+        return self._mm[key_off:key_off + key_len]
+
+    def _value(self, i):
+        _, _, value_off, value_len = self._entry(i)
+        return self._mm[value_off:value_off + value_len].decode('utf-8')
+
+    def _find(self, key):
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_bytes(low) == target:
+            return low
+        return None
+
+    def get(self, key, default=None):
+        i = self._find(key)
+        return default if i is None else self._value(i)
+
+    def __getitem__(self, key):
+        i = self._find(key)
+        if i is None:
+            raise KeyError(key)
+        return self._value(i)
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key_bytes(i).decode('utf-8')
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        for i in range(self._count):
+            yield self._key_bytes(i).decode('utf-8'), self._value(i)
+
+
+class GlossarySnapshot:
+    """A memory-mapped glossary snapshot."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, section_count, digest = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} glossary snapshot")
+        self.digest = digest
+        self._sections = {}
+        for i in range(section_count):
+            name, kind, count, index_offset = SECTION.unpack_from(self._mm, HEADER.size + i * SECTION.size)
+            self._sections[name.rstrip(b'\0').decode('ascii')] = (kind, count, index_offset)
+
+    @property
+    def version(self):
+        """Short identifier of the source the snapshot was compiled from."""
+        return self.digest.hex()[:12]
+
+    def section(self, name):
+        """Return a MAP section as a SnapshotMap, a LIST section as a list."""
+        kind, count, index_offset = self._sections[name]
+        section = SnapshotMap(self, count, index_offset)
+        if kind == MAP:
+            return section
+        return [(section._key_bytes(i).decode('utf-8'), section._value(i)) for i in range(count)]
+
+    def close(self):
+        self._mm.close()
+
+
+def _is_stale(source, snapshot):
+    if not snapshot.exists():
+        return True
+    try:
+        with open(snapshot, 'rb') as f:
+            header = f.read(HEADER.size)
+        magic, version, _, digest = HEADER.unpack(header)
+    except (OSError, struct.error):
+        return True
+    return magic != MAGIC or version != FORMAT_VERSION or digest != source_digest(source)
+
+
+def load_snapshot(source=DEFAULT_SOURCE, snapshot=None):
+    """Memory-map the snapshot of a glossary, compiling it first if needed.
+
+    The snapshot is rebuilt when it is missing or was compiled from a
+    different version of the source. If the glossary directory is read-only,
+    the snapshot is compiled into the temporary directory instead.
+    """
+    source = Path(source)
+    snapshot = Path(snapshot) if snapshot else default_snapshot_path(source)
+    if source.exists() and _is_stale(source, snapshot):
+        try:
+            compile_glossary(source, snapshot)
+        except OSError:
+            snapshot = Path(tempfile.gettempdir()) / f"translingoo-{source_digest(source).hex()[:12]}{SNAPSHOT_SUFFIX}"
+            if _is_stale(source, snapshot):
+                compile_glossary(source, snapshot)
+    return GlossarySnapshot(snapshot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the Translingoo glossary.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_parser = subparsers.add_parser('compile', help='Compile glossary source files into snapshots')
+    compile_parser.add_argument('source', nargs='?',
+                                help='Glossary source file (default: every glossary/en_*.tsv)')
+    compile_parser.add_argument('-o', '--output',
+                                help='Snapshot path, only with a source (default: next to the source, .tlg)')
+    args = parser.parse_args()
+    if args.command == 'compile' and args.output and not args.source:
+        # Every language would be compiled into the same file
+        parser.error('-o/--output needs a single source file')
+
+    if args.command == 'compile':
+        sources = [args.source] if args.source else [source_path(language) for language in available_languages()]
+        try:
+            for source in sources:
+                compile_glossary(source, args.output)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
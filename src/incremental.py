@@ -0,0 +1,207 @@
+"""
+Watermarks for incremental re-translation of append-only logs.
+
+Alarm logs grow by appending rows. When a log is translated with
+``incremental=True`` (``converter.py --incremental``), a watermark is written
+next to the output, ``<output>.watermark.json``: the number of source rows
+already translated, a running SHA-1 of those rows, the settings of the run
+and the cumulative coverage counts. The next run checks the first rows of the
+source against the hash and only translates the rows after them.
+
+The new rows are written to a small workbook of their own and spliced into
+the sheet XML of the previous output, so the earlier rows are copied as bytes
+rather than parsed and written again by openpyxl. The streaming writer stores
+strings inline, which is what makes this possible; an output it cannot splice
+(styles or layout differ) is merged row by row instead.
+
+Anything that would make the earlier rows differ from a full run (another
+header or column selection, a new glossary version, an output edited since,
+rows changed or removed at the top of the log) discards the watermark and the
+file is translated in full.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+
+WATERMARK_SUFFIX = '.watermark.json'
+# 2: cells that are not text are counted apart from the unmatched ones
+WATERMARK_VERSION = 2
+
+
+def watermark_path(output_path):
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + WATERMARK_SUFFIX)
+
+
+def new_digest():
+    return hashlib.sha1()
+
+
+def update_digest(digest, row):
+    """Add one source row to a running hash; trailing empty cells are ignored."""
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    digest.update(repr(tuple(row[:end])).encode('utf-8'))
+    digest.update(b'\n')
+
+
+def hashing(rows, digest):
+    """Yield rows unchanged, adding each one to ``digest`` as it goes by."""
+    for row in rows:
+        update_digest(digest, row)
+        yield row
+
+
+def _output_signature(output_path):
+    stat = os.stat(output_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_watermark(output_path, settings):
+    """Return the watermark of an earlier run with the same settings, or None."""
+    path = watermark_path(output_path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            watermark = json.load(f)
+        if watermark.get('version') != WATERMARK_VERSION:
+            reason = 'written by another version'
+        elif watermark['settings'] != settings:
+            reason = 'the header, columns or glossary changed'
+        elif not os.path.exists(output_path) or watermark['output'] != _output_signature(output_path):
+            reason = 'the output was modified since'
+        else:
+            return watermark
+    except (OSError, ValueError, KeyError) as e:
+        reason = f"it could not be read ({str(e)})"
+    print(f"DEBUG: Ignoring watermark {path}: {reason}")
+    return None
+
+
+def previous_coverage(watermark):
+    """Return a copy of the cumulative coverage counts of a watermark."""
+    return copy.deepcopy(watermark['coverage'])
+
+
+def save_watermark(output_path, settings, rows, digest, columns, coverage, detected_columns=None):
+    """Record that the first ``rows`` source rows are translated in ``output_path``."""
+    path = watermark_path(output_path)
+    watermark = {
+        'version': WATERMARK_VERSION,
+        'settings': settings,
+        'rows': rows,
+        'sha1': digest.hexdigest(),
+        # Columns translated, after detection, and the detected ones for the stats
+        'columns': columns,
+        'detected_columns': detected_columns,
+        'coverage': coverage,
+        'output': _output_signature(output_path),
+    }
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(watermark, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"DEBUG: Could not write watermark: {str(e)}")
+        return None
+    print(f"DEBUG: Watermark at {rows} rows saved to {path}")
+    return path
+
+
+ROW_NUMBER = re.compile(rb'<row r="(\d+)"')
+CELL_REFERENCE = re.compile(rb'<c r="([A-Z]+)(\d+)"')
+SHEET_DATA_END = b'</sheetData>'
+
+
+def _shift_rows(xml, offset):
+    """Renumber the rows (and their cell references) of a sheet XML fragment."""
+    xml = ROW_NUMBER.sub(lambda m: b'<row r="%d"' % (int(m.group(1)) + offset), xml)
+    return CELL_REFERENCE.sub(lambda m: b'<c r="%s%d"' % (m.group(1), int(m.group(2)) + offset), xml)
+
+
+def _sheet_name(archive):
+    names = [name for name in archive.namelist() if name.startswith('xl/worksheets/sheet')]
+    return names[0] if len(names) == 1 else None
+
+
+def _splice(previous_path, chunk_path, previous_rows, merged_path):
+    """Copy ``previous_path`` with the data rows of ``chunk_path`` added at the end.
+
+    Returns False, without writing anything useful, if the two workbooks were
+    not written the same way.
+    """
+    with zipfile.ZipFile(previous_path) as previous, zipfile.ZipFile(chunk_path) as chunk:
+        sheet = _sheet_name(previous)
+        if sheet is None or sheet != _sheet_name(chunk) or previous.read('xl/styles.xml') != chunk.read('xl/styles.xml'):
+            return False
+        chunk_xml = chunk.read(sheet)
+        header_end = chunk_xml.find(b'</row>') + len(b'</row>')
+        rows_end = chunk_xml.rfind(SHEET_DATA_END)
+        if header_end < len(b'</row>') or rows_end < header_end:
+            return False
+        # Chunk row 2 follows the last data row of the previous output
+        new_rows = _shift_rows(chunk_xml[header_end:rows_end], previous_rows)
+
+        with zipfile.ZipFile(merged_path, 'w', zipfile.ZIP_DEFLATED) as merged:
+            for item in previous.infolist():
+                if item.filename != sheet:
+                    merged.writestr(item, previous.read(item.filename))
+                    continue
+                info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with previous.open(item) as source, merged.open(info, 'w', force_zip64=True) as target:
+                    head = source.read(1024 * 1024)
+                    # Same header row, and no <dimension> that would need updating
+                    if not head.startswith(chunk_xml[:header_end]):
+                        return False
+                    tail = head
+                    for block in iter(lambda: source.read(1024 * 1024), b''):
+                        tail += block
+                        if len(tail) > 2 * 1024 * 1024:
+                            target.write(tail[:-65536])
+                            tail = tail[-65536:]
+                    end = tail.rfind(SHEET_DATA_END)
+                    if end < 0:
+                        return False
+                    target.write(tail[:end])
+                    target.write(new_rows)
+                    target.write(tail[end:])
+    return True
+
+
+def _merge_rows(previous_path, chunk_path, merged_path):
+    """Copy the rows of both workbooks into a new one with openpyxl."""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for path, skip in ((previous_path, 0), (chunk_path, 1)):
+        source = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            for row in source.active.iter_rows(min_row=1 + skip, values_only=True):
+                ws.append(row)
+        finally:
+            source.close()
+    wb.save(merged_path)
+
+
+def append_workbook(previous_path, chunk_path, previous_rows):
+    """Turn ``chunk_path`` (a header and new rows) into the previous output plus those rows."""
+    fd, merged_path = tempfile.mkstemp(dir=Path(chunk_path).parent, suffix=Path(chunk_path).suffix)
+    os.close(fd)
+    try:
+        if not _splice(previous_path, chunk_path, previous_rows, merged_path):
+            print("DEBUG: Output cannot be appended to in place, copying its rows")
+            _merge_rows(previous_path, chunk_path, merged_path)
+        os.replace(merged_path, chunk_path)
+    except BaseException:
+        if os.path.exists(merged_path):
+            os.remove(merged_path)
+        raise
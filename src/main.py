@@ -1,17 +1,46 @@
+import os
+import queue
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
-from excel_processor import ExcelProcessor
+from concurrent.futures import ThreadPoolExecutor
+from excel_processor import ExcelProcessor, warm_up
+from progress import Cancelled, Progress, describe, fraction
+
+# Milliseconds between two reads of the progress queue
+POLL_INTERVAL = 100
+
+
+def default_output(input_path, output_dir=None):
+    """Return ``<name>_translated.xlsx`` in output_dir, or next to the input."""
+    path = Path(input_path)
+    return str(Path(output_dir or path.parent) / f"{path.stem}_translated.xlsx")
+
 
 class ExcelTranslatorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Translingoo")
-        self.processor = ExcelProcessor()
+        
+        # Files picked with Browse; the entry shows them joined with "; "
+        self.input_paths = []
+        # Files of the current run, in the order they were queued
+        self.jobs = []
+        # The worker posts (kind, job, ...) tuples here; only the Tk thread
+        # reads them and touches the widgets
+        self.events = queue.Queue()
+        # One worker, so the files are processed one after the other in the
+        # order they were queued
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="process")
         
         # Configure the main window
-        self.root.geometry("600x450")
+        self.root.geometry("600x650")
         self.setup_ui()
+        
+        # Load pandas and the glossaries while the user picks files
+        self.executor.submit(warm_up)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(POLL_INTERVAL, self.poll_events)
 
     def setup_ui(self):
         # Create and pack widgets
@@ -19,13 +48,13 @@ class ExcelTranslatorApp:
         frame.pack(expand=True, fill='both')
 
         # Input file selection
-        tk.Label(frame, text="Input Excel File:").pack(anchor='w')
+        tk.Label(frame, text="Input Excel Files:").pack(anchor='w')
         self.input_path_var = tk.StringVar()
         tk.Entry(frame, textvariable=self.input_path_var, width=50).pack(fill='x', pady=(0, 10))
         tk.Button(frame, text="Browse", command=self.browse_input).pack(anchor='w')
 
-        # Output file selection
-        tk.Label(frame, text="Output Excel File:").pack(anchor='w', pady=(20, 0))
+        # Output file selection; a folder when several files are selected
+        tk.Label(frame, text="Output Excel File or Folder:").pack(anchor='w', pady=(20, 0))
         self.output_path_var = tk.StringVar()
         tk.Entry(frame, textvariable=self.output_path_var, width=50).pack(fill='x', pady=(0, 10))
         tk.Button(frame, text="Browse", command=self.browse_output).pack(anchor='w')
@@ -49,24 +78,50 @@ class ExcelTranslatorApp:
             variable=self.translate_message_var
         ).pack(anchor='w')
 
-        # Process button
-        tk.Button(frame, text="Process File", command=self.process_file).pack(pady=20)
+        # Process and cancel buttons
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=(5, 15))
+        tk.Button(button_frame, text="Process Files", command=self.process_file).pack(side='left', padx=5)
+        self.cancel_button = tk.Button(button_frame, text="Cancel", command=self.cancel_jobs, state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
+
+        # Queued and processed files with their progress
+        self.job_list = ttk.Treeview(frame, columns=("status",), height=5)
+        self.job_list.heading("#0", text="File")
+        self.job_list.heading("status", text="Progress")
+        self.job_list.column("#0", width=250)
+        self.job_list.column("status", width=250)
+        self.job_list.pack(expand=True, fill='both')
+
+        # Progress of the whole run
+        self.progress_bar = ttk.Progressbar(frame, orient='horizontal', mode='determinate', maximum=100)
+        self.progress_bar.pack(fill='x', pady=(10, 0))
 
         # Status label
         self.status_var = tk.StringVar(value="Ready")
-        tk.Label(frame, textvariable=self.status_var).pack()
+        tk.Label(frame, textvariable=self.status_var).pack(pady=(5, 0))
 
     def browse_input(self):
-        filename = filedialog.askopenfilename(
+        filenames = filedialog.askopenfilenames(
             filetypes=[("Excel files", "*.xlsx *.xls")]
         )
-        if filename:
-            self.input_path_var.set(filename)
-            # Auto-generate output path
-            output_path = str(Path(filename).parent / f"{Path(filename).stem}_translated{Path(filename).suffix}")
-            self.output_path_var.set(output_path)
+        if filenames:
+            self.input_paths = list(filenames)
+            self.input_path_var.set("; ".join(self.input_paths))
+            # Auto-generate output path; several files go next to their
+            # originals unless an output folder is chosen
+            if len(self.input_paths) == 1:
+                self.output_path_var.set(default_output(self.input_paths[0]))
+            elif not os.path.isdir(self.output_path_var.get()):
+                self.output_path_var.set("")
 
     def browse_output(self):
+        if len(self.input_files()) > 1:
+            directory = filedialog.askdirectory(title="Save Processed Files In")
+            if directory:
+                self.output_path_var.set(directory)
+            return
+
         filename = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             filetypes=[("Excel files", "*.xlsx")]
@@ -74,11 +129,19 @@ class ExcelTranslatorApp:
         if filename:
             self.output_path_var.set(filename)
 
+    def input_files(self):
+        """Return the files picked with Browse, or the single path typed in the entry."""
+        text = self.input_path_var.get().strip()
+        if self.input_paths and text == "; ".join(self.input_paths):
+            return list(self.input_paths)
+        return [text] if text else []
+
     def process_file(self):
-        input_path = self.input_path_var.get()
-        output_path = self.output_path_var.get()
+        """Queue the selected files; they are processed in the background."""
+        input_files = self.input_files()
+        output_path = self.output_path_var.get().strip()
 
-        if not input_path or not output_path:
+        if not input_files or (len(input_files) == 1 and not output_path):
             messagebox.showerror("Error", "Please select both input and output files")
             return
             
@@ -93,24 +156,124 @@ class ExcelTranslatorApp:
             messagebox.showerror("Error", "Please select at least one column to translate")
             return
 
-        self.status_var.set("Processing...")
-        self.root.update()
+        # A new run starts with an empty list unless files are still queued
+        if not self.jobs:
+            self.job_list.delete(*self.job_list.get_children())
+            self.progress_bar['value'] = 0
 
-        # Process the file
-        if not self.processor.load_excel(input_path):
-            self.status_var.set("Error loading file")
-            return
+        for input_path in input_files:
+            if len(input_files) == 1 and not os.path.isdir(output_path):
+                job_output = output_path
+            else:
+                job_output = default_output(input_path, output_path if os.path.isdir(output_path) else None)
+            self.submit_job(input_path, job_output, columns_to_translate)
+
+        self.cancel_button.config(state='normal')
+        self.update_status()
+
+    def submit_job(self, input_path, output_path, columns_to_translate):
+        """Queue one file on the worker and add it to the list."""
+        job = {'input': input_path, 'output': output_path, 'fraction': 0.0, 'finished': False,
+               'item': self.job_list.insert("", tk.END, text=Path(input_path).name, values=("Queued",))}
+        # Called on the worker thread
+        job['progress'] = Progress(lambda stage, done, total: self.events.put(("progress", job, stage, done, total)))
+        job['future'] = self.executor.submit(self.run_job, job, columns_to_translate)
+        self.jobs.append(job)
 
-        if not self.processor.process_file(columns_to_translate):
-            self.status_var.set("Error processing file")
+    def run_job(self, job, columns_to_translate):
+        """Load, translate and save one file on the worker thread; the outcome goes to the event queue."""
+        processor = ExcelProcessor()
+        progress = job['progress']
+        try:
+            if not processor.load_excel(job['input'], progress):
+                outcome = "Error loading file"
+            elif not processor.process_file(columns_to_translate, progress=progress):
+                outcome = "Error processing file"
+            elif not processor.save_excel(job['output'], progress):
+                outcome = "Error saving file"
+            else:
+                outcome = "done"
+        except Cancelled:
+            # Raised before the save starts, so no partial output is left behind
+            outcome = "cancelled"
+        except Exception as e:
+            outcome = f"Error: {str(e)}"
+        self.events.put(("finished", job, outcome))
+
+    def poll_events(self):
+        """Apply what the worker reported since the last poll (Tk thread only)."""
+        try:
+            while True:
+                event = self.events.get_nowait()
+                job = event[1]
+                if job['finished']:
+                    continue
+                if event[0] == "progress":
+                    job['fraction'] = fraction(*event[2:])
+                    self.job_list.set(job['item'], "status", describe(*event[2:]))
+                else:
+                    self.finish_job(job, event[2])
+                self.update_status()
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL, self.poll_events)
+
+    def finish_job(self, job, outcome):
+        job['finished'] = True
+        job['outcome'] = outcome
+        job['fraction'] = 1.0
+        status = {"done": "Processing complete!", "cancelled": "Cancelled"}.get(outcome, outcome)
+        self.job_list.set(job['item'], "status", status)
+        if all(j['finished'] for j in self.jobs):
+            self.run_finished()
+
+    def update_status(self):
+        """Show the progress of the current run, all of its files together."""
+        if not self.jobs:
             return
+        self.progress_bar['value'] = 100 * sum(job['fraction'] for job in self.jobs) / len(self.jobs)
+        finished = sum(job['finished'] for job in self.jobs)
+        if finished < len(self.jobs):
+            self.status_var.set(f"Processing file {finished + 1} of {len(self.jobs)}...")
 
-        if not self.processor.save_excel(output_path):
-            self.status_var.set("Error saving file")
+    def run_finished(self):
+        """Summarize once every file of the run is finished and get ready for the next run."""
+        outcomes = [job['outcome'] for job in self.jobs]
+        self.jobs = []
+        self.cancel_button.config(state='disabled')
+
+        if outcomes.count("done") == len(outcomes):
+            self.status_var.set("Processing complete!")
+            messagebox.showinfo("Success", f"{len(outcomes)} file(s) processed successfully!")
             return
+        summary = f"{outcomes.count('done')} of {len(outcomes)} files processed"
+        failed = len(outcomes) - outcomes.count("done") - outcomes.count("cancelled")
+        if failed:
+            summary += f", {failed} failed"
+        if outcomes.count("cancelled"):
+            summary += f", {outcomes.count('cancelled')} cancelled"
+        self.status_var.set(summary)
+        if failed:
+            messagebox.showerror("Error", summary)
+
+    def cancel_jobs(self):
+        """Cancel the run: queued files are dropped, the running one stops at its next row count."""
+        for job in self.jobs:
+            if job['finished']:
+                continue
+            job['progress'].cancel()
+            if job['future'].cancel():
+                # Never started, so the worker will not report it
+                self.events.put(("finished", job, "cancelled"))
+        self.status_var.set("Cancelling...")
 
-        self.status_var.set("Processing complete!")
-        messagebox.showinfo("Success", "File processed successfully!")
+    def close(self):
+        """Stop the running file and close the window without waiting for it."""
+        for job in self.jobs:
+            job['progress'].cancel()
+            job['future'].cancel()
+        self.executor.shutdown(wait=False)
+        self.root.destroy()
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,155 @@
+"""
+Translation of delimited text in shell pipelines.
+
+Reads CSV or TSV from standard input and writes it to standard output with a
+translated column inserted after each selected one, the same layout as the
+Excel tools. Rows are read, translated and written one at a time through
+buffered streams, so memory use does not grow with the input and nothing is
+written to disk except the translation memory. Log messages go to standard
+error, keeping standard output for the data.
+
+Usage:
+    zcat alarms.csv.gz | translingoo-translate -c Description | gzip > alarms_fr.csv.gz
+    python -m src.pipe -c Description Message -l fr es -d ';' < export.csv > export_fr.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+import time
+from itertools import chain, islice
+
+try:
+    from .coverage import summarize
+    from .detection import SAMPLE_ROWS, detect_columns, merge_columns, sample_rows
+    from .glossary import available_languages
+    from .streaming import coverage_observer, find_header, translate_rows
+    from .translation_memory import MissRecorder
+    from .translator import get_glossaries
+except ImportError:
+    from coverage import summarize
+    from detection import SAMPLE_ROWS, detect_columns, merge_columns, sample_rows
+    from glossary import available_languages
+    from streaming import coverage_observer, find_header, translate_rows
+    from translation_memory import MissRecorder
+    from translator import get_glossaries
+
+DELIMITERS = ',;\t|'
+# Size of the reads from standard input and of the output buffer
+BUFFER_SIZE = 64 * 1024
+
+
+def sniff_delimiter(line):
+    """Return the most frequent of the usual delimiters in a header line (default: comma)."""
+    counts = {delimiter: line.count(delimiter) for delimiter in DELIMITERS}
+    delimiter = max(counts, key=counts.get)
+    return delimiter if counts[delimiter] else ','
+
+
+def translate_stream(source, target, columns_to_translate=None, languages=None, reverse=False,
+                     auto_detect=False, delimiter=None, source_name='stdin'):
+    """Translate delimited text from the text stream ``source`` into ``target``.
+
+    The first row holding a known column name (or else the first row) is
+    the header. ``delimiter`` defaults to the one found in the first line.
+    Returns ``(success, stats)`` like ``stream_translate``.
+    """
+    selected = columns_to_translate
+    if columns_to_translate is None:
+        columns_to_translate = ["Description"]
+    glossaries = get_glossaries(languages, reverse)
+    start = time.perf_counter()
+    stats = {'rows': 0, 'coverage': {}, 'seconds': 0.0, 'detected_columns': None,
+             'glossary_versions': {g.language: g.version for g in glossaries}}
+
+    first_line = source.readline()
+    if not first_line:
+        print("DEBUG: No input")
+        return False, stats
+    if delimiter is None:
+        delimiter = sniff_delimiter(first_line)
+        print(f"DEBUG: Using delimiter {delimiter!r}")
+    header, rows = find_header(csv.reader(chain([first_line], source), delimiter=delimiter))
+
+    if auto_detect:
+        # The sampled rows are put back in front of the rest
+        sample = list(islice(rows, SAMPLE_ROWS))
+        rows = chain(sample, rows)
+        stats['detected_columns'] = detect_columns(sample_rows(header, sample), glossaries[0])
+        if stats['detected_columns']:
+            columns_to_translate = merge_columns(selected, stats['detected_columns'], header)
+
+    recorder = MissRecorder(source_name)
+    translators = [(g.language, g.column_translate) for g in glossaries]
+    out_header, out_rows = translate_rows(header, rows, columns_to_translate,
+                                          observe=coverage_observer(glossaries, stats['coverage'], recorder),
+                                          translators=translators)
+    if out_header is None:
+        print(f"Error: Columns {columns_to_translate} not all found in {header}")
+        return False, stats
+
+    writer = csv.writer(target, delimiter=delimiter, lineterminator='\n')
+    writer.writerow(out_header)
+    count = 0
+    for row in out_rows:
+        writer.writerow(row)
+        count += 1
+    target.flush()
+    recorder.flush()
+    stats['rows'] = count
+    stats['seconds'] = time.perf_counter() - start
+    return True, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translate CSV/TSV from standard input to standard output.')
+    parser.add_argument('-c', '--columns', nargs='+', help='Columns to translate (default: Description)')
+    parser.add_argument('-l', '--languages', nargs='+', choices=available_languages(),
+                        help='Target languages, one column each (default: fr)')
+    parser.add_argument('-r', '--reverse', action='store_true',
+                        help='Translate from the language given with -l (default: fr) back to English')
+    parser.add_argument('-a', '--auto-detect', action='store_true',
+                        help='Translate the columns whose values are in the glossary, whatever their name')
+    parser.add_argument('-d', '--delimiter', help="Field delimiter, 'tab' for TSV (default: detected)")
+    parser.add_argument('--encoding', default='utf-8-sig', help='Input encoding (default: utf-8, with or without BOM)')
+    parser.add_argument('--source-name', default='stdin', help='File name recorded with untranslated values')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Do not log to standard error')
+    args = parser.parse_args()
+    if args.reverse and args.languages and len(args.languages) > 1:
+        parser.error('--reverse takes a single language')
+    delimiter = '\t' if args.delimiter in ('tab', '\\t') else args.delimiter
+    if delimiter is not None and len(delimiter) != 1:
+        parser.error('--delimiter must be a single character')
+
+    source = io.open(sys.stdin.fileno(), 'r', buffering=BUFFER_SIZE, encoding=args.encoding,
+                     newline='', closefd=False)
+    target = io.open(sys.stdout.fileno(), 'w', buffering=BUFFER_SIZE, encoding='utf-8',
+                     newline='', closefd=False)
+    log = open(os.devnull, 'w') if args.quiet else sys.stderr
+    try:
+        # The translation engine logs with print; keep standard output for the data
+        with contextlib.redirect_stdout(log):
+            success, stats = translate_stream(source, target, args.columns, args.languages, args.reverse,
+                                              args.auto_detect, delimiter, args.source_name)
+    except BrokenPipeError:
+        # The reader went away (``| head``): stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    except (UnicodeDecodeError, csv.Error) as e:
+        print(f"Error: Could not read the input: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    if not success:
+        print("Processing failed.", file=sys.stderr)
+        sys.exit(1)
+    for column, counts in stats['coverage'].items():
+        print(f"{column}: coverage {summarize(counts)['coverage']}", file=log)
+    print(f"Translated {stats['rows']} rows in {stats['seconds']:.1f}s", file=log)
+
+
+if __name__ == "__main__":
+    main()
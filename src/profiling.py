@@ -0,0 +1,208 @@
+"""
+Per-stage timing of a translation job, for attaching to bug reports.
+
+A Profile records the wall-clock and CPU time of each stage of a job
+(importing pandas, loading, header detection, translation, saving...), the
+reading paths tried and the one that succeeded, and facts such as the number
+of distinct values per column and the glossary hit counters. It is printed
+as a table and saved next to the output as ``<output>.profile.json``; with
+``cprofile=True`` the whole job also runs under cProfile and the statistics
+are dumped to ``<output>.pstats``, to be read with ``python -m pstats``.
+
+Functions that take a ``profile`` argument get None unless profiling was
+asked for (``converter.py --profile``, ``ExcelProcessor(profile=True)``), and
+the module-level ``stage``, ``note`` and ``attempt`` helpers then do nothing.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+PROFILE_SUFFIX = '.profile.json'
+PSTATS_SUFFIX = '.pstats'
+# Rules listed per glossary from its hit counters
+HIT_RULES = 10
+
+
+def _sibling(output_path, suffix):
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + suffix)
+
+
+def profile_path(output_path):
+    return _sibling(output_path, PROFILE_SUFFIX)
+
+
+def pstats_path(output_path):
+    return _sibling(output_path, PSTATS_SUFFIX)
+
+
+class Profile:
+    """Wall and CPU time per stage of one job, plus notes about the run.
+
+    A stage entered several times (one engine after another, one column
+    after another) accumulates its times and counts its calls. CPU time is
+    that of the whole process, so it includes any other threads.
+    """
+
+    def __init__(self, cprofile=False):
+        self.stages = {}
+        self.info = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._started = None
+        self._profiler = None
+        if cprofile:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._started = (time.perf_counter(), time.process_time())
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if self._started is None:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.wall += time.perf_counter() - self._started[0]
+        self.cpu += time.process_time() - self._started[1]
+        self._started = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time the body of a ``with`` block as the stage ``name``."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            entry['wall'] += time.perf_counter() - wall
+            entry['cpu'] += time.process_time() - cpu
+            entry['calls'] += 1
+
+    def note(self, key, value):
+        self.info[key] = value
+
+    def attempt(self, path, success, error=None):
+        """Record a way of reading the file that was tried, and whether it worked."""
+        entry = {'path': path, 'success': success}
+        if error is not None:
+            entry['error'] = str(error)
+        self.info.setdefault('attempts', []).append(entry)
+        if success:
+            self.info['path'] = path
+
+    def note_glossaries(self, glossaries):
+        """Record the glossary versions and how their rules resolved the values."""
+        self.info['glossary_hits'] = {g.language: g.hit_counters(HIT_RULES) for g in glossaries}
+        self.info['glossary_versions'] = {g.language: g.version for g in glossaries}
+
+    def report(self, input_path=None, output_path=None):
+        """Return the profile as a dict that can be saved as JSON."""
+        return {
+            'input_file': os.path.basename(str(input_path)) if input_path is not None else None,
+            'output_file': os.path.basename(str(output_path)) if output_path is not None else None,
+            'input_bytes': os.path.getsize(input_path) if input_path and os.path.exists(input_path) else None,
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'wall': round(self.wall, 6),
+            'cpu': round(self.cpu, 6),
+            'stages': [{'stage': name, 'wall': round(entry['wall'], 6), 'cpu': round(entry['cpu'], 6),
+                        'calls': entry['calls']} for name, entry in self.stages.items()],
+            'info': self.info,
+        }
+
+    def format_table(self, input_path=None):
+        """Return the stages and notes as a table for the terminal."""
+        title = f"Profile of {os.path.basename(str(input_path))}" if input_path is not None else "Profile"
+        lines = [f"{title}: {self.wall:.3f}s wall, {self.cpu:.3f}s CPU",
+                 f"{'Stage':<32} {'Wall (s)':>9} {'CPU (s)':>9} {'Calls':>6} {'Share':>7}"]
+        staged = 0.0
+        for name, entry in self.stages.items():
+            staged += entry['wall']
+            share = f"{100 * entry['wall'] / self.wall:.1f}%" if self.wall else ''
+            lines.append(f"{name:<32} {entry['wall']:>9.3f} {entry['cpu']:>9.3f} {entry['calls']:>6} {share:>7}")
+        if self.wall and self.stages:
+            # Stages can nest, in which case this is only a lower bound
+            lines.append(f"{'(outside stages)':<32} {max(self.wall - staged, 0.0):>9.3f}")
+        for attempt in self.info.get('attempts', []):
+            outcome = 'ok' if attempt['success'] else ': '.join(['failed'] + ([attempt['error']] if 'error' in attempt else []))
+            lines.append(f"Tried {attempt['path']}: {outcome}")
+        for key, value in self.info.items():
+            if key in ('attempts', 'glossary_hits'):
+                continue
+            if isinstance(value, dict):
+                value = ', '.join(f"{k} {v}" for k, v in value.items())
+            lines.append(f"{key.replace('_', ' ').capitalize()}: {value}")
+        for language, hits in self.info.get('glossary_hits', {}).items():
+            stages = ', '.join(f"{stage} {count}" for stage, count in hits['stages'].items() if count)
+            lines.append(f"Glossary {language} hits: {stages or 'none'}")
+        return '\n'.join(lines)
+
+    def save(self, output_path, input_path=None):
+        """Print the table and write the JSON (and pstats) files next to ``output_path``.
+
+        Returns the path of the JSON file, or None if it could not be written.
+        """
+        self.stop()
+        print(self.format_table(input_path))
+        report = self.report(input_path, output_path)
+        try:
+            if self._profiler is not None:
+                report['pstats'] = str(pstats_path(output_path))
+                self._profiler.dump_stats(report['pstats'])
+            path = profile_path(output_path)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        except OSError as e:
+            print(f"DEBUG: Could not write profile: {str(e)}")
+            return None
+        print(f"DEBUG: Profile saved to {path}" + (f" and {report['pstats']}" if 'pstats' in report else ''))
+        return path
+
+
+def start_profile(enabled=False, cprofile=False):
+    """Return a started Profile if asked for (``cprofile`` implies it), else None."""
+    if not (enabled or cprofile):
+        return None
+    return Profile(cprofile).start()
+
+
+def distinct_observer(observe, distinct):
+    """Wrap a translate_rows ``observe`` callback to collect each column's distinct values.
+
+    ``distinct`` maps column names to sets; only used when profiling, since
+    it keeps every distinct value in memory.
+    """
+    def observe_distinct(value, column):
+        values = distinct.get(column)
+        if values is None:
+            values = distinct[column] = set()
+        values.add(value)
+        observe(value, column)
+
+    return observe_distinct
+
+
+def stage(profile, name):
+    """``profile.stage(name)``, or a context that does nothing if profile is None."""
+    return profile.stage(name) if profile is not None else nullcontext()
+
+
+def note(profile, key, value):
+    if profile is not None:
+        profile.note(key, value)
+
+
+def attempt(profile, path, success, error=None):
+    if profile is not None:
+        profile.attempt(path, success, error)
@@ -0,0 +1,110 @@
+"""
+Progress reporting and cancellation of a translation job, for the GUIs.
+
+A Progress is handed down through a job like a profile (see profiling.py):
+the engine announces each stage (loading, translating, saving) and, while
+translating, the rows done out of the rows to do. Every report is passed to
+``callback(stage, done, total)``; the GUIs put it on a ``queue.Queue`` that
+the Tk loop polls, since Tk widgets may only be touched from the main
+thread. Reports within a stage are throttled to one per ``interval``
+seconds.
+
+The same object carries the cancel flag. The engine checks it at each
+report and raises ``Cancelled``, which derives from BaseException like
+KeyboardInterrupt so that the readers' ``except Exception`` fallbacks do not
+swallow it. A save that has started is not interrupted.
+
+Functions that take a ``progress`` argument get None when nobody is
+watching, and the module-level helpers then do nothing.
+"""
+
+import threading
+import time
+
+# Seconds between two row counts sent to the callback
+INTERVAL = 0.1
+# Share of a job done when each stage starts; translating takes most of it
+STAGE_SHARES = {'load': 0.0, 'translate': 0.1, 'save': 0.9}
+STAGE_NAMES = {'load': "Loading", 'translate': "Translating", 'save': "Saving"}
+
+
+class Cancelled(BaseException):
+    """Raised inside a job whose Progress was cancelled."""
+
+
+class Progress:
+    """Stage and row counts of one job, sent to ``callback``, and its cancel flag."""
+
+    def __init__(self, callback=None, interval=INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.stage = None
+        self.done = 0
+        self.total = None
+        self._cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    def start_stage(self, name, total=None):
+        """Begin a stage; ``total`` is the number of rows it handles, if known."""
+        self.check()
+        self.stage = name
+        self.done = 0
+        self.total = total
+        self._report()
+
+    def advance(self, rows=1):
+        """Count ``rows`` more rows done in the current stage."""
+        self.check()
+        self.done += rows
+        now = time.monotonic()
+        if now - self._last_report >= self.interval or (self.total is not None and self.done >= self.total):
+            self._report(now)
+
+    def _report(self, now=None):
+        self._last_report = now if now is not None else time.monotonic()
+        if self.callback is not None:
+            self.callback(self.stage, self.done, self.total)
+
+    def cancel(self):
+        """Ask the job to stop; safe to call from any thread."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check(self):
+        if self._cancel_event.is_set():
+            raise Cancelled()
+
+
+def start_stage(progress, name, total=None):
+    if progress is not None:
+        progress.start_stage(name, total)
+
+
+def advance(progress, rows=1):
+    if progress is not None:
+        progress.advance(rows)
+
+
+def check(progress):
+    """Raise Cancelled if the job was cancelled."""
+    if progress is not None:
+        progress.check()
+
+
+def fraction(stage, done, total):
+    """Return the share of a job done, from 0 to 1, at a report of the callback."""
+    share = STAGE_SHARES.get(stage, 0.0)
+    if stage == 'translate' and total:
+        return share + (STAGE_SHARES['save'] - share) * min(done / total, 1.0)
+    return share
+
+
+def describe(stage, done, total):
+    """Return a report of the callback as a short status text."""
+    name = STAGE_NAMES.get(stage, stage)
+    if stage == 'translate' and total:
+        return f"{name} {100 * done // total}% ({done:,} / {total:,} rows)"
+    return f"{name}..."
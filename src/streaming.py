@@ -0,0 +1,384 @@
+"""
+Row-by-row processing of large .xlsx workbooks.
+
+ExcelProcessor loads the whole sheet into a DataFrame, which is fine for the
+usual alarm exports but not for yearly exports of a few hundred megabytes.
+The functions here read the sheet with openpyxl in read-only mode and write
+the result in write-only mode, so memory use stays flat whatever the size
+of the workbook. Small files can be handled by the standard-library reader
+and writer of xlsx.py instead, which start faster.
+"""
+
+import os
+import re
+import tempfile
+import time
+import zipfile
+from itertools import chain, islice
+from pathlib import Path
+
+try:
+    from .coverage import UNMATCHED, build_report, new_counts, write_report
+    from .detection import SAMPLE_ROWS, detect_columns, merge_columns, sample_rows
+    from .excel_processor import MAX_OUTPUT_ROWS
+    from .glossary import DEFAULT_LANGUAGE, target_column_name
+    from .incremental import append_workbook, hashing, load_watermark, new_digest, previous_coverage, save_watermark, update_digest
+    from .profiling import distinct_observer, note, stage
+    from .translation_memory import MissRecorder
+    from .translator import get_glossaries, translate_text
+    from .xlsx import SheetWriter, column_number, first_sheet_path
+    from .xlsx import iter_rows as iter_rows_lightweight
+except ImportError:
+    from coverage import UNMATCHED, build_report, new_counts, write_report
+    from detection import SAMPLE_ROWS, detect_columns, merge_columns, sample_rows
+    from excel_processor import MAX_OUTPUT_ROWS
+    from glossary import DEFAULT_LANGUAGE, target_column_name
+    from incremental import append_workbook, hashing, load_watermark, new_digest, previous_coverage, save_watermark, update_digest
+    from profiling import distinct_observer, note, stage
+    from translation_memory import MissRecorder
+    from translator import get_glossaries, translate_text
+    from xlsx import SheetWriter, column_number, first_sheet_path
+    from xlsx import iter_rows as iter_rows_lightweight
+
+# Same keywords ExcelProcessor.load_excel uses to find the header row
+HEADER_KEYWORDS = ['Description', 'Message', 'Origin', 'Type']
+HEADER_SEARCH_ROWS = 20
+
+STREAMABLE_EXTENSIONS = {'.xlsx', '.xlsm'}
+
+
+def can_stream(file_path):
+    """Return True if the file can be read by the streaming reader."""
+    return Path(file_path).suffix.lower() in STREAMABLE_EXTENSIONS
+
+
+def sheet_dimensions(file_path):
+    """Return ``(rows, columns)`` of the first sheet from the workbook metadata.
+
+    Only the ``<dimension>`` element at the top of the sheet XML is read, so
+    this is cheap even for very large files. Returns None if the file is not
+    an .xlsx workbook or does not record its dimensions.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open(first_sheet_path(archive)) as sheet:
+                head = sheet.read(64 * 1024).decode('utf-8', 'replace')
+    except Exception as e:
+        print(f"DEBUG: Could not read sheet dimensions: {str(e)}")
+        return None
+
+    match = re.search(r'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"', head)
+    if not match:
+        return None
+    first_col, first_row, last_col, last_row = match.groups()
+    last_col = last_col or first_col
+    last_row = last_row or first_row
+    return (int(last_row) - int(first_row) + 1,
+            column_number(last_col) - column_number(first_col) + 1)
+
+
+def iter_rows(file_path, sheet_name=None):
+    """Yield the cell values of each row of a worksheet as tuples."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb[wb.sheetnames[0]]
+        for row in ws.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def header_index(rows):
+    """Return the position of the header row among the first rows, or 0 if none has a keyword.
+
+    The converters reading with pandas use it too, so that every path picks
+    the same header row.
+    """
+    for i, row in enumerate(islice(rows, HEADER_SEARCH_ROWS)):
+        if any(str(value) in HEADER_KEYWORDS for value in row if value is not None):
+            print(f"DEBUG: Found header at row {i}")
+            return i
+    print("DEBUG: Using first row as header")
+    return 0
+
+
+def find_header(rows):
+    """Locate the header row among the first rows of an iterator.
+
+    Returns ``(header, rows)`` where ``header`` is the list of cleaned column
+    names and ``rows`` is an iterator over the data rows that follow it.
+    """
+    rows = iter(rows)
+    leading = list(islice(rows, HEADER_SEARCH_ROWS))
+    if not leading:
+        return [], rows
+    index = header_index(leading)
+    return _clean_header(leading[index]), chain(leading[index + 1:], rows)
+
+
+def _clean_header(row):
+    """Strip column names and name empty ones the way pandas does."""
+    return [str(value).strip() if value is not None else f"Unnamed: {i}"
+            for i, value in enumerate(row)]
+
+
+def match_columns(header, columns_to_translate):
+    """Map requested column names onto header positions (case-insensitive)."""
+    lower_columns = {name.lower(): i for i, name in reversed(list(enumerate(header)))}
+    positions = {}
+    for col in columns_to_translate:
+        if col in header:
+            positions[col] = header.index(col)
+        elif col.lower() in lower_columns:
+            positions[col] = lower_columns[col.lower()]
+            print(f"DEBUG: Found case-insensitive match for '{col}': '{header[positions[col]]}'")
+        else:
+            print(f"DEBUG: Column not found: '{col}'")
+    return positions
+
+
+def translate_rows(header, rows, columns_to_translate, translate=translate_text, observe=None,
+                   translators=None, skip_missing=False):
+    """Insert translated columns after each selected column.
+
+    ``translators`` is a list of ``(language, new_translate)`` pairs, one
+    column being inserted for each (default: ``translate`` into French);
+    ``new_translate()`` is called once per selected column and returns the
+    function translating its values, so each column can keep its own stage
+    hits (see ``CompiledGlossary.column_translate``).
+    ``observe(value, column)`` is called for every value of the selected
+    columns. Returns the output header and an iterator over the output rows,
+    or ``(None, None)`` if any of the requested columns is missing (with
+    ``skip_missing``, only if all of them are).
+    """
+    positions = match_columns(header, columns_to_translate)
+    if not positions or (len(positions) != len(columns_to_translate) and not skip_missing):
+        return None, None
+
+    if translators is None:
+        translators = [(DEFAULT_LANGUAGE, lambda: translate)]
+    translated_positions = set(positions.values())
+    functions = {i: [new_translate() for _, new_translate in translators] for i in translated_positions}
+    out_header = []
+    for i, name in enumerate(header):
+        out_header.append(name)
+        if i in translated_positions:
+            out_header.extend(target_column_name(name, language) for language, _ in translators)
+
+    width = len(header)
+
+    def _translated():
+        for row in rows:
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            out_row = []
+            for i, value in enumerate(row):
+                out_row.append(value)
+                if i in translated_positions:
+                    out_row.extend(function(value) for function in functions[i])
+                    if observe is not None:
+                        observe(value, header[i])
+            yield out_row
+
+    return out_header, _translated()
+
+
+def limit_rows(rows, max_rows, stats):
+    """Yield rows up to ``max_rows`` in all, setting ``stats['truncated']`` if any row is left over.
+
+    ``stats['rows']`` rows are taken as already written, as after a watermark.
+    """
+    yield from islice(rows, max(max_rows - stats['rows'], 0))
+    if next(rows, None) is not None:
+        stats['truncated'] = True
+        print(f"DEBUG: Truncated to {max_rows} rows")
+
+
+def coverage_observer(glossaries, coverage, recorder):
+    """Return an ``observe`` callback for translate_rows.
+
+    It counts the status of every value in ``coverage``, keyed by target
+    column, and adds the untranslated ones to ``recorder``.
+    """
+    def observe(value, column):
+        for g in glossaries:
+            target = target_column_name(column, g.language)
+            counts = coverage.get(target)
+            if counts is None:
+                counts = coverage[target] = new_counts()
+            status = g.classify(value)
+            counts[status] += 1
+            if status == UNMATCHED:
+                recorder.add(value, column, 1, g.language)
+
+    return observe
+
+
+def stream_translate(input_path, output_path, columns_to_translate=None, max_rows=MAX_OUTPUT_ROWS, glossary=None,
+                     source_name=None, languages=None, reverse=False, auto_detect=False, incremental=False,
+                     lightweight=False, skip_missing=False, profile=None):
+    """Translate a workbook row by row without loading it into memory.
+
+    One column is added per target language in ``languages`` (default:
+    French), or for ``glossary`` alone if one is given; ``reverse``
+    translates the single language given back to English instead. With
+    ``auto_detect``, the columns the glossary can translate in the first
+    rows (see detection.py) are added to ``columns_to_translate``. With
+    ``incremental``, a log translated before into ``output_path`` only has
+    the rows appended since translated (see incremental.py). With
+    ``lightweight``, the workbooks are read and written without openpyxl
+    (see xlsx.py), which is faster to start for small files; the call fails
+    on workbooks that need openpyxl. With ``skip_missing``, requested
+    columns that are not in the sheet are left out instead of failing.
+    The output is cut to ``max_rows`` rows, the same limit as
+    ``translate_file`` (None keeps every row).
+    The stages are timed in ``profile`` if one is given (see profiling.py);
+    reading, translating and writing the rows are one stage, as each row
+    goes through all three before the next one is read.
+
+    Untranslated values are recorded in the translation memory under
+    ``source_name`` (default: the input file name), and a coverage report is
+    written next to the output. Returns ``(success, stats)`` like
+    ``translate_file``.
+    """
+    selected = columns_to_translate
+    if columns_to_translate is None:
+        columns_to_translate = ["Description"]
+    # Use one glossary version for the whole file, even if it is reloaded meanwhile
+    with stage(profile, 'load glossaries'):
+        glossaries = [glossary] if glossary is not None else get_glossaries(languages, reverse)
+    start = time.perf_counter()
+    stats = {'rows': 0, 'columns': [], 'coverage': {}, 'truncated': False, 'seconds': 0.0,
+             'glossary_version': glossaries[0].version,
+             'glossary_versions': {g.language: g.version for g in glossaries}, 'detected_columns': None}
+
+    lightweight = lightweight and not incremental
+    read_rows = iter_rows_lightweight if lightweight else iter_rows
+    note(profile, 'engine', 'xlsx.py' if lightweight else 'openpyxl read-only')
+    try:
+        print(f"\nDEBUG: Streaming {input_path} to {output_path}")
+        with stage(profile, 'header detection'):
+            header, rows = find_header(read_rows(input_path))
+        if not header:
+            print("DEBUG: Workbook is empty")
+            return False, stats
+
+        settings = {'header': header, 'columns': columns_to_translate, 'auto_detect': auto_detect,
+                    'reverse': reverse, 'glossary_versions': stats['glossary_versions']}
+        digest = new_digest()
+        watermark = load_watermark(output_path, settings) if incremental else None
+        if watermark is not None:
+            # The rows translated last time must still be the first rows of the log
+            with stage(profile, 'check watermark'):
+                skipped = 0
+                for row in islice(rows, watermark['rows']):
+                    update_digest(digest, row)
+                    skipped += 1
+                if skipped != watermark['rows'] or digest.hexdigest() != watermark['sha1']:
+                    print("DEBUG: Rows before the watermark changed, translating the whole file")
+                    watermark = None
+                    digest = new_digest()
+                    header, rows = find_header(iter_rows(input_path))
+        if incremental:
+            note(profile, 'watermark_rows', watermark['rows'] if watermark is not None else None)
+
+        if watermark is not None:
+            first_new = next(rows, None)
+            stats['rows'] = watermark['rows']
+            stats['coverage'] = previous_coverage(watermark)
+            stats['detected_columns'] = watermark['detected_columns']
+            if first_new is None:
+                print(f"DEBUG: No rows appended since the watermark, {output_path} is up to date")
+                stats['seconds'] = time.perf_counter() - start
+                return True, stats
+            rows = chain([first_new], rows)
+            columns_to_translate = watermark['columns']
+            print(f"DEBUG: Translating the rows after row {watermark['rows']} only")
+        elif auto_detect:
+            # The sampled rows are put back in front of the rest
+            with stage(profile, 'detect columns'):
+                sample = list(islice(rows, SAMPLE_ROWS))
+                rows = chain(sample, rows)
+                stats['detected_columns'] = detect_columns(sample_rows(header, sample), glossaries[0])
+            if stats['detected_columns']:
+                columns_to_translate = merge_columns(selected, stats['detected_columns'], header)
+        if max_rows is not None:
+            # Cut before translating, so rows that are dropped are not counted
+            rows = limit_rows(rows, max_rows, stats)
+        if incremental:
+            rows = hashing(rows, digest)
+
+        recorder = MissRecorder(source_name or input_path)
+        coverage = stats['coverage']
+        translators = [(g.language, g.column_translate) for g in glossaries]
+        observe = coverage_observer(glossaries, coverage, recorder)
+        distinct = {}
+        if profile is not None:
+            observe = distinct_observer(observe, distinct)
+        out_header, out_rows = translate_rows(header, rows, columns_to_translate, observe=observe,
+                                              translators=translators, skip_missing=skip_missing)
+        if out_header is None:
+            print(f"DEBUG: Available columns: {header}")
+            return False, stats
+
+        if lightweight:
+            ws = SheetWriter(output_path)
+        else:
+            import openpyxl
+
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet()
+        ws.append(out_header)
+        # With a watermark only the new rows are written here, then appended
+        count = copied = watermark['rows'] if watermark is not None else 0
+        try:
+            with stage(profile, 'read, translate and write rows'):
+                for row in out_rows:
+                    ws.append(row)
+                    count += 1
+        except BaseException:
+            if lightweight:
+                ws.discard()
+            raise
+        with stage(profile, 'save'):
+            if lightweight:
+                ws.close()
+            elif incremental:
+                # The previous output stays intact if the run is interrupted
+                fd, tmp_path = tempfile.mkstemp(dir=Path(output_path).parent, suffix=Path(output_path).suffix)
+                os.close(fd)
+                try:
+                    wb.save(tmp_path)
+                    if watermark is not None:
+                        append_workbook(output_path, tmp_path, copied)
+                    os.replace(tmp_path, output_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            else:
+                wb.save(output_path)
+        with stage(profile, 'record misses'):
+            recorder.flush()
+        print(f"DEBUG: Streamed {count} rows" + (f" ({count - copied} new)" if watermark is not None else ''))
+        stats['rows'] = count
+        stats['columns'] = [name for name in header if target_column_name(name, glossaries[0].language) in coverage]
+        stats['seconds'] = time.perf_counter() - start
+        with stage(profile, 'report'):
+            write_report(build_report(source_name or input_path, output_path, stats, stats['glossary_version']), output_path)
+            if incremental:
+                save_watermark(output_path, settings, count, digest, columns_to_translate, coverage,
+                               stats['detected_columns'])
+        if profile is not None:
+            profile.note('rows', count)
+            profile.note('distinct_values', {column: len(values) for column, values in distinct.items()})
+            profile.note_glossaries(glossaries)
+        return True, stats
+
+    except Exception as e:
+        print(f"\nDEBUG: Error while streaming:")
+        print(f"- Error type: {type(e).__name__}")
+        print(f"- Error message: {str(e)}")
+        return False, stats
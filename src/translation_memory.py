@@ -0,0 +1,217 @@
+"""
+Translation memory of the values the glossary could not translate.
+
+Each job collects its misses (value, column, target language and number of
+rows) in memory
+with a MissRecorder and writes them to a local SQLite database in one
+transaction when the job ends, so recording never touches the per-value
+translation path. The database is kept in the user's data directory, so it
+survives upgrades and the temporary directory a packaged GUI runs from. ``report`` ranks the gaps by the number of rows they left
+untranslated, to show which glossary entries would help the most.
+
+Usage:
+    python -m src.translation_memory report [--limit 20] [--column Message] [--language es]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+try:
+    from .glossary import DEFAULT_LANGUAGE
+except ImportError:
+    from glossary import DEFAULT_LANGUAGE
+
+
+def user_data_dir():
+    """Return the per-user directory Translingoo keeps its data in."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Application Support'
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share'
+    return Path(base) / 'translingoo'
+
+
+def default_db():
+    """Return the database misses are recorded in; TRANSLINGOO_MISSES_DB set to '' turns recording off."""
+    return os.environ.get('TRANSLINGOO_MISSES_DB', str(user_data_dir() / 'misses.sqlite3'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS misses (
+    value TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    language TEXT NOT NULL DEFAULT 'fr',
+    rows INTEGER NOT NULL,
+    jobs INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (value, source_file, column_name, language)
+)
+"""
+
+# Databases created before misses were kept per target language
+MIGRATE = """
+ALTER TABLE misses RENAME TO misses_old;
+{schema};
+INSERT INTO misses (value, source_file, column_name, rows, jobs, first_seen, last_seen)
+SELECT value, source_file, column_name, rows, jobs, first_seen, last_seen FROM misses_old;
+DROP TABLE misses_old;
+""".format(schema=SCHEMA.strip())
+
+UPSERT = """
+INSERT INTO misses (value, source_file, column_name, language, rows, jobs, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+ON CONFLICT (value, source_file, column_name, language) DO UPDATE SET
+    rows = rows + excluded.rows,
+    jobs = jobs + 1,
+    last_seen = excluded.last_seen
+"""
+
+
+class TranslationMemory:
+    """SQLite store of untranslated values, safe to share between processes."""
+
+    def __init__(self, path=None):
+        self.path = Path(path if path is not None else default_db())
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30)
+            # WAL lets gunicorn workers write while a report is being read
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(misses)")]
+            if 'language' not in columns:
+                connection.executescript("BEGIN;" + MIGRATE + "COMMIT;")
+            self._local.connection = connection
+        return connection
+
+    def record(self, source_file, misses):
+        """Add ``{(value, column, language): rows}`` seen in one job of source_file."""
+        if not misses:
+            return
+        now = time.time()
+        connection = self._connect()
+        with connection:
+            connection.executemany(UPSERT, [
+                (str(value), source_file, column, language, rows, now, now)
+                for (value, column, language), rows in misses.items()
+            ])
+
+    def top_misses(self, limit=20, column=None, language=None):
+        """Return the values that left the most rows untranslated.
+
+        Each result is a dict with the value, the rows and jobs it appeared
+        in, the number of distinct source files, the columns it was in and
+        the target languages it is missing from.
+        """
+        query = """
+            SELECT value, SUM(rows) AS total_rows, SUM(jobs), COUNT(DISTINCT source_file),
+                   GROUP_CONCAT(DISTINCT column_name), GROUP_CONCAT(DISTINCT language), MAX(last_seen)
+            FROM misses
+            {where}
+            GROUP BY value
+            ORDER BY total_rows DESC, value
+            LIMIT ?
+        """
+        conditions, params = [], []
+        if column:
+            conditions.append("column_name = ?")
+            params.append(column)
+        if language:
+            conditions.append("language = ?")
+            params.append(language)
+        query = query.format(where="WHERE " + " AND ".join(conditions) if conditions else "")
+        params.append(limit)
+        return [
+            {'value': value, 'rows': rows, 'jobs': jobs, 'files': files,
+             'columns': columns.split(','), 'languages': languages.split(','), 'last_seen': last_seen}
+            for value, rows, jobs, files, columns, languages, last_seen in self._connect().execute(query, params)
+        ]
+
+    def totals(self):
+        """Return the number of distinct untranslated values and their rows."""
+        distinct, rows = self._connect().execute(
+            "SELECT COUNT(DISTINCT value), COALESCE(SUM(rows), 0) FROM misses").fetchone()
+        return {'distinct_values': distinct, 'rows': rows}
+
+
+_memories = {}
+_memories_lock = threading.Lock()
+
+
+def get_translation_memory(path=None):
+    """Return the shared TranslationMemory for a path (default: default_db()), or None if disabled."""
+    if path is None:
+        path = default_db()
+    if not path:
+        return None
+    with _memories_lock:
+        if path not in _memories:
+            _memories[path] = TranslationMemory(path)
+        return _memories[path]
+
+
+class MissRecorder:
+    """Collects the misses of one job and writes them all at once."""
+
+    def __init__(self, source_file, memory=None):
+        self.source_file = os.path.basename(str(source_file))
+        self.memory = memory if memory is not None else get_translation_memory()
+        self.misses = Counter()
+
+    def add(self, value, column, rows=1, language=DEFAULT_LANGUAGE):
+        self.misses[(value, column, language)] += rows
+
+    def flush(self):
+        """Write the collected misses; errors are logged, never raised."""
+        if self.memory is None or not self.misses:
+            return 0
+        try:
+            self.memory.record(self.source_file, self.misses)
+        except (sqlite3.Error, OSError) as e:
+            print(f"DEBUG: Could not record untranslated values: {str(e)}")
+            return 0
+        count = len(self.misses)
+        print(f"DEBUG: Recorded {count} untranslated values from {self.source_file}")
+        self.misses = Counter()
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the values the glossary could not translate.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    report_parser = subparsers.add_parser('report', help='Rank untranslated values by rows affected')
+    report_parser.add_argument('--db', default=default_db(), help='Translation memory database (default: %(default)s)')
+    report_parser.add_argument('-n', '--limit', type=int, default=20, help='Number of values to show (default: 20)')
+    report_parser.add_argument('--column', help='Only count misses in this column')
+    report_parser.add_argument('--language', help='Only count misses of this target language (fr, es, ...)')
+    args = parser.parse_args()
+
+    if not args.db or not Path(args.db).exists():
+        print("No untranslated values have been recorded yet.")
+        sys.exit(0)
+
+    memory = TranslationMemory(args.db)
+    totals = memory.totals()
+    print(f"{totals['distinct_values']} untranslated values, {totals['rows']} rows in total\n")
+    print(f"{'rows':>8}{'jobs':>7}{'files':>7}  {'columns':<22}{'languages':<11}value")
+    for miss in memory.top_misses(args.limit, args.column, args.language):
+        print(f"{miss['rows']:>8}{miss['jobs']:>7}{miss['files']:>7}  {','.join(miss['columns']):<22}"
+              f"{','.join(miss['languages']):<11}{miss['value']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,635 @@
+"""
+Lookup of technical English terms in French and other target languages.
+
+The terms come from the glossary snapshot of each target language (see
+``glossary.py``), which is memory-mapped once per process and wrapped in an
+immutable CompiledGlossary (see ``get_glossary``). The glossary holds no per-request state, so a single
+instance is shared by every thread, and the Flask app can load it in the
+gunicorn master before workers are forked.
+
+A GlossaryWatcher can reload the glossary while the service runs: the new
+version is compiled in the background and replaces the shared instance in a
+single reference swap. Jobs that already hold the old instance finish with
+it, and only the cached translations the new version changes are dropped.
+"""
+
+import os
+import re
+import threading
+from collections import Counter
+from functools import partial
+
+try:
+    from .coverage import EMPTY, FRENCH, NON_TEXT, TRANSLATED, UNMATCHED
+    from .fuzzy import FuzzyMatcher, edit_distance
+    from .glossary import (DEFAULT_LANGUAGE, SOURCE_LANGUAGE, available_languages, load_snapshot, normalize_key,
+                           source_path)
+except ImportError:
+    from coverage import EMPTY, FRENCH, NON_TEXT, TRANSLATED, UNMATCHED
+    from fuzzy import FuzzyMatcher, edit_distance
+    from glossary import (DEFAULT_LANGUAGE, SOURCE_LANGUAGE, available_languages, load_snapshot, normalize_key,
+                          source_path)
+
+# Fuzzy matching of misspelled terms (see fuzzy.py); a distance of 0 turns it off
+FUZZY_MAX_DISTANCE = int(os.environ.get('TRANSLINGOO_FUZZY_DISTANCE', '2'))
+FUZZY_MIN_CONFIDENCE = float(os.environ.get('TRANSLINGOO_FUZZY_CONFIDENCE', '0.9'))
+
+# Cached in place of a translation for text that is already French
+KEEP_FRENCH = object()
+_UNCACHED = object()
+
+# Stages of the translation pipeline, in order of precedence: when several
+# stages match a string, the first one listed gives its translation
+STAGES = ('pattern', 'suffix', 'special_case', 'french', 'term', 'fuzzy', 'miss')
+# Single probes that a column may try in another order; fuzzy matching scans
+# the terms and always comes last
+REORDERED_STAGES = ('pattern', 'suffix', 'special_case', 'french', 'term')
+
+
+class StageHits:
+    """Stages that resolved the strings of one column, and the order to try them in.
+
+    Each column being translated gets its own (see
+    ``CompiledGlossary.column_translate``), so the glossary shared by every
+    thread is not written to; the stages a column hits most are tried first
+    for its next strings.
+    """
+
+    def __init__(self):
+        self.stages = Counter()
+
+    def add(self, stage):
+        self.stages[stage] += 1
+
+    def order(self):
+        # sorted() is stable, so stages hit as often keep their precedence
+        return sorted(REORDERED_STAGES, key=lambda stage: -self.stages[stage]) + ['fuzzy']
+
+
+class CompiledGlossary:
+    """Immutable, thread-safe lookup structures built from a glossary.
+
+    ``terms`` maps normalized source terms (see ``normalize_key``) to their
+    translation; it is usually the memory-mapped terms section of a snapshot.
+    ``suffixes`` maps status suffixes such as "APP ACK" to their translation,
+    so "Set - App Ack" is translated from "SET" and "APP ACK" rather than
+    needing an entry of its own.
+    Translations of distinct strings are cached on the instance, so the
+    cache is dropped together with the glossary that produced it. Strings
+    without a translation go to a separate negative cache, so misses never
+    take the room of translations nor run through the pipeline twice.
+    """
+
+    __slots__ = ('terms', 'suffixes', 'known_patterns', 'special_cases', 'french_indicators',
+                 'english_indicators', 'language', 'version', 'fuzzy', '_suffix_pattern', '_cache',
+                 '_misses', '_cache_size', '_fuzzy_hits', '_stage_hits', '_rule_hits', '_hits_lock',
+                 '_claimed_terms')
+
+    def __init__(self, terms, special_cases, known_patterns, french_indicators,
+                 english_indicators, suffixes=(), language=DEFAULT_LANGUAGE, version=None,
+                 cache_size=65536, fuzzy_max_distance=FUZZY_MAX_DISTANCE,
+                 fuzzy_min_confidence=FUZZY_MIN_CONFIDENCE):
+        set_attr = object.__setattr__
+        set_attr(self, 'terms', terms)
+        set_attr(self, 'language', language)
+        suffixes = {normalize_key(suffix): translation for suffix, translation in dict(suffixes).items()}
+        set_attr(self, 'suffixes', suffixes)
+        set_attr(self, '_suffix_pattern', _compile_suffix_pattern(suffixes))
+        set_attr(self, 'fuzzy', FuzzyMatcher(terms, fuzzy_max_distance, fuzzy_min_confidence)
+                 if fuzzy_max_distance > 0 else None)
+        set_attr(self, 'version', version)
+        # Both are matched case-insensitively, so they are keyed by upper case
+        set_attr(self, 'known_patterns', {
+            pattern.upper(): translation for pattern, translation in reversed(list(known_patterns))})
+        set_attr(self, 'special_cases', {
+            case.upper(): translation for case, translation in reversed(list(special_cases))})
+        set_attr(self, 'french_indicators', frozenset(french_indicators))
+        set_attr(self, 'english_indicators', frozenset(english_indicators))
+        set_attr(self, '_cache', {})
+        set_attr(self, '_misses', set())
+        set_attr(self, '_cache_size', cache_size)
+        # Cached strings that were translated by a fuzzy match
+        set_attr(self, '_fuzzy_hits', set())
+        # Profiling counters of every thread (see hit_counters)
+        set_attr(self, '_stage_hits', Counter())
+        set_attr(self, '_rule_hits', Counter())
+        set_attr(self, '_hits_lock', threading.Lock())
+        # Terms that a stage of higher precedence also matches; any other term
+        # may be returned as soon as it is found (see _translate_string)
+        set_attr(self, '_claimed_terms', frozenset(
+            key for key in terms
+            if key in self.known_patterns or self._compose(key) is not None
+            or self._special_case(key) is not None or self.is_french(key)))
+
+    @classmethod
+    def from_snapshot(cls, snapshot, **options):
+        """Build a glossary over the sections of a GlossarySnapshot."""
+        return cls(
+            snapshot.section('terms'),
+            snapshot.section('special_cases'),
+            snapshot.section('known_patterns'),
+            [word for word, _ in snapshot.section('french_indicators')],
+            [word for word, _ in snapshot.section('english_indicators')],
+            suffixes=snapshot.section('suffixes').items(),
+            version=snapshot.version,
+            **options
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledGlossary is immutable")
+
+    def is_french(self, text):
+        """Check if text contains French-specific words/patterns"""
+        words = text.upper().split()
+        
+        # If any word is explicitly English, return False
+        if any(word in self.english_indicators for word in words):
+            return False
+        
+        french_word_count = sum(1 for word in words if word in self.french_indicators)
+        total_words = len(words)
+        
+        return (french_word_count / total_words) > 0.3 if total_words > 0 else False
+
+    def _special_case(self, upper_text):
+        """Return the special case equal to the text or to its leading words, or None."""
+        case = upper_text
+        end = len(upper_text)
+        while case not in self.special_cases:
+            # Try ever shorter runs of leading words, longest first
+            end = upper_text.rfind(' ', 0, end)
+            if end <= 0:
+                return None
+            case = upper_text[:end].rstrip()
+        return case
+
+    def _compose(self, text):
+        """Translate "<state> - <suffix>" from its parts.
+
+        Returns ``(suffix, translation)``, or None if the text is not a known
+        state followed by a known suffix.
+        """
+        if self._suffix_pattern is None:
+            return None
+        match = self._suffix_pattern.match(text)
+        if match is None:
+            return None
+        base, separator, suffix = match.group('base', 'separator', 'suffix')
+        base_translation = self.terms.get(normalize_key(base))
+        if base_translation is None:
+            return None
+        suffix_key = normalize_key(suffix)
+        return suffix_key, (match_case(base, base_translation) + separator
+                            + match_case(suffix, self.suffixes[suffix_key]))
+
+    def _hit(self, stage, rule=None, hits=None):
+        with self._hits_lock:
+            self._stage_hits[stage] += 1
+            if rule is not None:
+                self._rule_hits[(stage, rule)] += 1
+        if hits is not None:
+            hits.add(stage)
+
+    def _match(self, stage, original_text, stripped_text, upper_text, key):
+        """Run one stage on a string; return ``(translation, rule, how)`` or None."""
+        if stage == 'pattern':
+            # Exact matches including spaces (more specific)
+            pattern = original_text.rstrip().upper()
+            translation = self.known_patterns.get(pattern)
+            return None if translation is None else (translation, pattern, "pattern with spaces")
+        if stage == 'suffix':
+            # A state followed by a suffix ("Set - App Ack") is translated part by part
+            composed = self._compose(stripped_text)
+            return None if composed is None else (composed[1], composed[0], "state and suffix")
+        if stage == 'special_case':
+            case = self._special_case(upper_text)
+            return None if case is None else (self.special_cases[case], case, "special case")
+        if stage == 'french':
+            return (KEEP_FRENCH, None, None) if self.is_french(key) else None
+        if stage == 'term':
+            translation = self.terms.get(key)
+            return None if translation is None else (translation, key, None)
+        # Finally, look for a close match in case the term is misspelled
+        if self.fuzzy is None:
+            return None
+        match = self.fuzzy.match(key)
+        if match is None:
+            return None
+        term, confidence = match
+        return self.terms[term], term, f"fuzzy match '{term}', confidence {confidence:.2f}"
+
+    def _translate_string(self, original_text, hits=None):
+        """Translate a single string.
+
+        The stages are tried in the order of the column's ``hits`` (see
+        StageHits), or in order of precedence. A stage tried before its turn
+        only wins if no stage of higher precedence matches too, so the order
+        never changes a translation; an exact term that no other stage can
+        match, in its normal spacing, is returned after a single probe.
+        Returns None when no translation is known and KEEP_FRENCH when the
+        text is already French.
+        """
+        stripped_text = original_text.strip()
+        upper_text = stripped_text.upper()
+        # Normalize the text by removing extra spaces (both within and at the end)
+        key = normalize_key(upper_text)
+        tried = set()
+        result = None
+        for stage in (hits.order() if hits is not None else STAGES[:-1]):
+            tried.add(stage)
+            result = self._match(stage, original_text, stripped_text, upper_text, key)
+            if result is None:
+                continue
+            if (stage == 'term' and key not in self._claimed_terms
+                    and original_text.rstrip().upper() == key):
+                # Every stage before it would have seen this same key
+                break
+            for higher in STAGES[:STAGES.index(stage)]:
+                if higher not in tried:
+                    tried.add(higher)
+                    higher_result = self._match(higher, original_text, stripped_text, upper_text, key)
+                    if higher_result is not None:
+                        stage, result = higher, higher_result
+                        break
+            break
+        
+        if result is None:
+            self._hit('miss', hits=hits)
+            print(f"DEBUG: No translation found for '{original_text}', keeping original")
+            return None
+        translation, rule, how = result
+        self._hit(stage, rule, hits)
+        if translation is KEEP_FRENCH:
+            print(f"DEBUG: Keeping French text: '{original_text}'")
+        elif how is None:
+            print(f"DEBUG: Translated '{original_text}' → '{translation}'")
+        else:
+            print(f"DEBUG: Translated '{original_text}' → '{translation}' ({how})")
+        if stage == 'fuzzy':
+            with self._hits_lock:
+                self._fuzzy_hits.add(original_text)
+        return translation
+
+    def _cached_translate(self, text, hits=None):
+        translated = self._cache.get(text, _UNCACHED)
+        if translated is not _UNCACHED:
+            return translated
+        if text in self._misses:
+            return None
+        translated = self._translate_string(text, hits)
+        # Once full, the caches keep the strings seen first; alarm exports
+        # repeat a small set of values, so those are the ones worth keeping
+        if translated is None:
+            if len(self._misses) < self._cache_size:
+                self._misses.add(text)
+        elif len(self._cache) < self._cache_size:
+            self._cache[text] = translated
+        return translated
+
+    def lookup(self, text, hits=None):
+        """Return the output value of a cell and its status, in one cache probe.
+
+        The status is TRANSLATED, FRENCH, EMPTY, NON_TEXT or UNMATCHED; the
+        output is the cell itself unless it was translated. Numbers, dates
+        and other cells that are not text are never looked up, so they are
+        neither counted nor recorded as misses. ``hits`` are the StageHits
+        of the column the cell is in, if it is counted.
+        """
+        if is_missing(text) or str(text).strip() == '':
+            return text, EMPTY
+        if not isinstance(text, str):
+            return text, NON_TEXT
+        translated = self._cached_translate(str(text), hits)
+        if translated is None:
+            return text, UNMATCHED
+        if translated is KEEP_FRENCH:
+            return text, FRENCH
+        return translated, TRANSLATED
+
+    def translate(self, text, hits=None):
+        """Translate a cell value from English to French, keeping it if unknown."""
+        # Hot path for values already cached; lookup() would build a tuple
+        translated = self._cache.get(text) if isinstance(text, str) else None
+        if translated is None:
+            return self.lookup(text, hits)[0]
+        return text if translated is KEEP_FRENCH else translated
+
+    def column_translate(self):
+        """Return ``translate`` for the cells of one column, with the column's own StageHits."""
+        return partial(self.translate, hits=StageHits())
+
+    def classify(self, text):
+        """Return how a value is handled: TRANSLATED, FRENCH, EMPTY, NON_TEXT or UNMATCHED."""
+        return self.lookup(text)[1]
+
+    def hit_counters(self, rules=20):
+        """Return how the distinct strings seen so far were resolved, for profiling.
+
+        ``stages`` counts the strings resolved by each stage of the pipeline
+        (see STAGES), ``rules`` lists the most used patterns, suffixes,
+        special cases and terms as ``(stage, rule, count)``, and ``cached``
+        gives the sizes of the translation and negative caches.
+        """
+        with self._hits_lock:
+            return {
+                'stages': {stage: self._stage_hits[stage] for stage in STAGES},
+                'rules': [(stage, rule, count) for (stage, rule), count in self._rule_hits.most_common(rules)],
+                'cached': {'translations': len(self._cache), 'misses': len(self._misses)},
+            }
+
+    def knows(self, text):
+        """Return True if the glossary has a translation for a value.
+
+        Only exact lookups are made (no fuzzy matching) and nothing is cached
+        or logged, so any number of values can be probed, as column
+        detection does (see detection.py).
+        """
+        if is_missing(text):
+            return False
+        text = str(text)
+        stripped_text = text.strip()
+        if not stripped_text:
+            return False
+        upper_text = stripped_text.upper()
+        return (text.rstrip().upper() in self.known_patterns
+                or self._compose(stripped_text) is not None
+                or self._special_case(upper_text) is not None
+                or normalize_key(upper_text) in self.terms)
+
+    def is_miss(self, text):
+        """Return True if a non-empty value has no translation (French text is not a miss)."""
+        return self.classify(text) == UNMATCHED
+
+    def changed_terms(self, previous):
+        """Return the normalized terms added, removed or retranslated since ``previous``."""
+        return {key for key, _ in set(self.terms.items()) ^ set(previous.terms.items())}
+
+    def inherit_cache(self, previous):
+        """Copy the cached translations of an older glossary that still hold.
+
+        Every entry is dropped if the patterns, special cases, suffixes or
+        language indicators changed; otherwise only the entries for changed terms are,
+        along with fuzzy matches and misses, which any change could affect.
+        Returns the number of entries copied.
+        """
+        if (self.known_patterns != previous.known_patterns
+                or self.special_cases != previous.special_cases
+                or self.suffixes != previous.suffixes
+                or self.french_indicators != previous.french_indicators
+                or self.english_indicators != previous.english_indicators):
+            return 0
+        
+        changed = self.changed_terms(previous)
+        with previous._hits_lock:
+            fuzzy_hits = set(previous._fuzzy_hits)
+        for text, translated in list(previous._cache.items()):
+            if len(self._cache) >= self._cache_size:
+                break
+            if normalize_key(text) in changed:
+                continue
+            if changed and self.fuzzy is not None and text in fuzzy_hits:
+                continue
+            self._cache.setdefault(text, translated)
+        if not changed or self.fuzzy is None:
+            for text in list(previous._misses):
+                if len(self._misses) >= self._cache_size:
+                    break
+                if normalize_key(text) not in changed:
+                    self._misses.add(text)
+        return len(self._cache) + len(self._misses)
+
+    def reverse(self):
+        """Build the glossary that translates this one's translations back to English.
+
+        Terms, suffixes, special cases and known patterns are inverted once
+        (see ``invert_entries``). The language indicators are not carried
+        over: they describe French text, so the reverse glossary keeps no
+        value as already English and reports it as unmatched instead.
+        Translations put words in another order, so a special case can end up
+        leading a whole translated term ("ALARME 24" for "24 ALARM"); such
+        terms are added as special cases of their own, which are matched
+        before leading words, so they still come back whole.
+        """
+        terms = {key: source for key, (_, source) in invert_entries(self.terms.items()).items()}
+        suffixes = {key: source for key, (_, source) in invert_entries(self.suffixes.items()).items()}
+
+        def cased(entries):
+            # Special cases and patterns keep the casing of the translation they match
+            return [(translation, match_case(translation, source))
+                    for translation, source in invert_entries(entries.items(), str.upper).values()]
+
+        special_cases = cased(self.special_cases)
+        cases = {case.upper() for case, _ in special_cases}
+        for key, source in terms.items():
+            words = key.split()
+            if key not in cases and any(' '.join(words[:end]) in cases for end in range(1, len(words))):
+                special_cases.append((key, source))
+        return CompiledGlossary(terms, special_cases, cased(self.known_patterns), (), (),
+                                suffixes=suffixes, language=SOURCE_LANGUAGE, version=self.version,
+                                cache_size=self._cache_size)
+
+
+def invert_entries(entries, normalize=normalize_key):
+    """Map each translation back to one source term.
+
+    Returns ``{normalized translation: (translation, source)}``. When several
+    source terms share a translation, the one least like the translation
+    wins: the others are French spellings or typos the glossary accepts as
+    input ("OPÉRATIONNEL", "ABSENCE TENSION"), not the English term. Ties go
+    to the shortest source, then the first in alphabetical order, so the
+    result never depends on the order of the glossary.
+    """
+    ranked = {}
+    for source, translation in entries:
+        key = normalize(translation)
+        rank = (-edit_distance(normalize(source), key), len(source), source)
+        if key not in ranked or rank < ranked[key][0]:
+            ranked[key] = (rank, translation, source)
+    return {key: (translation, source) for key, (_, translation, source) in ranked.items()}
+
+
+def _compile_suffix_pattern(suffixes):
+    """Build the pattern that splits "<state> - <suffix>" into its parts."""
+    if not suffixes:
+        return None
+    # Longest first so "APP ACK" wins over a shorter suffix such as "ACK"
+    alternatives = '|'.join(r'\s+'.join(re.escape(word) for word in suffix.split())
+                            for suffix in sorted(suffixes, key=len, reverse=True))
+    return re.compile(rf"^(?P<base>.*?\S)(?P<separator>\s*-\s*)(?P<suffix>{alternatives})\s*$",
+                      re.IGNORECASE)
+
+
+def match_case(source, translation):
+    """Give a translation the casing of the text it replaces."""
+    if source.isupper():
+        return translation.upper()
+    if source.islower():
+        return translation.lower()
+    if source.istitle():
+        return translation.title()
+    return translation
+
+
+_glossaries = {}
+_glossary_lock = threading.Lock()
+
+
+def get_glossary(language=DEFAULT_LANGUAGE):
+    """Return the shared compiled glossary of a target language.
+
+    The snapshot is mapped on first use. Callers that translate many values
+    (a whole file) should call this once and keep the result, so a reload in
+    the middle of the job cannot mix two glossary versions in one output.
+    """
+    glossary = _glossaries.get(language)
+    if glossary is None:
+        with _glossary_lock:
+            glossary = _glossaries.get(language)
+            if glossary is None:
+                glossary = CompiledGlossary.from_snapshot(load_snapshot(source_path(language)), language=language)
+                _glossaries[language] = glossary
+    return glossary
+
+
+_reverse_glossaries = {}
+
+
+def get_reverse_glossary(language=DEFAULT_LANGUAGE):
+    """Return the shared glossary translating text in ``language`` back to English.
+
+    It is inverted from the current glossary of that language the first time
+    it is needed, and again after that glossary is reloaded.
+    """
+    glossary = get_glossary(language)
+    reverse = _reverse_glossaries.get(language)
+    if reverse is None or reverse.version != glossary.version:
+        with _glossary_lock:
+            reverse = _reverse_glossaries.get(language)
+            if reverse is None or reverse.version != glossary.version:
+                reverse = glossary.reverse()
+                _reverse_glossaries[language] = reverse
+                print(f"DEBUG: Built {language} to English glossary ({len(reverse.terms)} terms)")
+    return reverse
+
+
+def get_glossaries(languages=None, reverse=False):
+    """Return the glossaries of several target languages (default: French only).
+
+    With ``reverse``, return the glossary translating the single language
+    given back to English.
+    """
+    languages = languages or [DEFAULT_LANGUAGE]
+    if reverse:
+        if len(languages) != 1:
+            raise ValueError("Text can only be translated back to English from one language at a time")
+        return [get_reverse_glossary(languages[0])]
+    return [get_glossary(language) for language in languages]
+
+
+def loaded_versions():
+    """Return ``{language: version}`` for the glossaries loaded in this process."""
+    return {language: glossary.version for language, glossary in sorted(_glossaries.items())}
+
+
+def reload_glossary(language=DEFAULT_LANGUAGE):
+    """Compile a glossary source again and swap it in if it changed.
+
+    The new glossary is fully built, and given the still-valid cached
+    translations of the current one, before the shared reference is replaced.
+    Returns the new glossary, or None if nothing changed or the source could
+    not be compiled (the current glossary then stays in use).
+    """
+    current = get_glossary(language)
+    try:
+        glossary = CompiledGlossary.from_snapshot(load_snapshot(source_path(language)), language=language)
+    except (OSError, ValueError) as e:
+        print(f"DEBUG: Could not reload {language} glossary, keeping version {current.version}: {str(e)}")
+        return None
+    if glossary.version == current.version:
+        return None
+    
+    kept = glossary.inherit_cache(current)
+    with _glossary_lock:
+        _glossaries[language] = glossary
+    print(f"DEBUG: Reloaded {language} glossary {current.version} → {glossary.version} "
+          f"({len(glossary.changed_terms(current))} terms changed, {kept} cached translations kept)")
+    return glossary
+
+
+class GlossaryWatcher(threading.Thread):
+    """Background thread that reloads glossaries when their source changes.
+
+    The source files of the languages loaded in this process are polled
+    every ``interval`` seconds, which needs no extra dependency and works on
+    network and container volumes alike.
+    """
+
+    def __init__(self, interval=5.0):
+        super().__init__(name='glossary-watcher', daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._signatures = {language: self._stat(language) for language in list(_glossaries)}
+
+    def _stat(self, language):
+        try:
+            stat = os.stat(source_path(language))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for language in list(_glossaries):
+                signature = self._stat(language)
+                if language not in self._signatures:
+                    # Loaded after the watcher started
+                    self._signatures[language] = signature
+                elif signature is not None and signature != self._signatures[language]:
+                    self._signatures[language] = signature
+                    reload_glossary(language)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_watcher = None
+
+
+def watch_glossary(interval=5.0):
+    """Start the glossary watcher for this process, once.
+
+    Threads do not survive fork, so gunicorn workers must call this after
+    they are forked rather than relying on one started in the master.
+    """
+    global _watcher
+    with _glossary_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = GlossaryWatcher(interval)
+            _watcher.start()
+    return _watcher
+
+
+def is_missing(value):
+    """Return True for None, NaN and other empty cell markers."""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pandas.NA refuses to be coerced to bool
+        return True
+
+
+def is_french(text):
+    """Check if text contains French-specific words/patterns"""
+    return get_glossary().is_french(text)
+
+
+def translate_text(text, glossary=None):
+    """Translate a cell value from English to French, keeping it if unknown."""
+    return (glossary or get_glossary()).translate(text)
+
+
+def warm_up():
+    """Compile the glossaries ahead of the first translation request."""
+    return get_glossaries(available_languages() or None)
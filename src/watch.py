@@ -0,0 +1,193 @@
+"""
+Drop-folder mode: translate workbooks as they land in a directory.
+
+``FolderWatcher`` keeps one process running with the glossaries loaded, so a
+file dropped into the watched folder is translated seconds after it has been
+written, without paying interpreter and glossary start-up per file. On Linux
+the folder is watched with inotify (through ctypes, no extra dependency);
+elsewhere, and as a safety net on network shares where inotify events never
+arrive, the folder is rescanned every ``interval`` seconds.
+
+A file is only picked up once its size and modification time have not changed
+for ``settle`` seconds. Its output is written to a staging directory and moved
+into the output folder when complete, and the original is moved to
+``processed/`` or ``failed/`` inside the watched folder.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import shutil
+import sys
+import threading
+import time
+
+try:
+    from .batch import EXCEL_EXTENSIONS, expand_inputs, output_path
+    from .coverage import report_path
+    from .profiling import profile_path, pstats_path
+except ImportError:
+    from batch import EXCEL_EXTENSIONS, expand_inputs, output_path
+    from coverage import report_path
+    from profiling import profile_path, pstats_path
+
+PROCESSED_DIR = 'processed'
+FAILED_DIR = 'failed'
+STAGING_DIR = '.translingoo-partial'
+
+# inotify events that can mean a new file is complete
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+
+class _Inotify:
+    """Minimal inotify wrapper: wait until something happened in a directory."""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f'inotify_add_watch failed for {path}')
+
+    def wait(self, timeout):
+        """Block until an event arrives or the timeout expires; True on events."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        # The events only trigger a rescan, so they are drained, not parsed
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify(path):
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return _Inotify(path)
+    except (OSError, AttributeError) as e:
+        print(f"DEBUG: inotify unavailable, polling instead: {str(e)}")
+        return None
+
+
+def _move(path, directory):
+    """Move a file into a directory without overwriting an earlier file of the same name."""
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, os.path.basename(path))
+    if os.path.exists(target):
+        stem, extension = os.path.splitext(os.path.basename(path))
+        target = os.path.join(directory, f"{stem}_{time.strftime('%Y%m%d-%H%M%S')}{extension}")
+    shutil.move(path, target)
+    return target
+
+
+class FolderWatcher:
+    """Translate every workbook dropped into ``watch_dir`` with ``job(input, output)``.
+
+    ``job`` runs in this process, so the glossaries loaded before ``run`` is
+    called stay warm from one file to the next.
+    """
+
+    def __init__(self, watch_dir, job, output_dir=None, suffix='_translated.xlsx',
+                 extensions=EXCEL_EXTENSIONS, settle=2.0, interval=5.0):
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = os.path.abspath(output_dir or os.path.join(self.watch_dir, 'translated'))
+        self.job = job
+        self.suffix = suffix
+        self.extensions = extensions
+        self.settle = settle
+        self.interval = interval
+        # Path -> (size, mtime_ns, time that signature was first seen)
+        self._pending = {}
+        self._stop_event = threading.Event()
+
+    def _candidates(self):
+        return expand_inputs([self.watch_dir], self.extensions, exclude_suffix=self.suffix)
+
+    def _ready_files(self):
+        """Return the files whose size and time have been stable for ``settle`` seconds."""
+        now = time.monotonic()
+        ready = []
+        candidates = set(self._candidates())
+        for path in list(self._pending):
+            if path not in candidates:
+                del self._pending[path]
+        for path in sorted(candidates):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self._pending.get(path)
+            if previous is None or previous[:2] != signature:
+                self._pending[path] = signature + (now,)
+            elif now - previous[2] >= self.settle:
+                ready.append(path)
+        return ready
+
+    def process(self, input_path):
+        """Translate one file, publish its output and move the original away."""
+        final_output = output_path(input_path, self.output_dir, self.suffix)
+        staging = os.path.join(self.output_dir, STAGING_DIR)
+        os.makedirs(staging, exist_ok=True)
+        staged_output = os.path.join(staging, os.path.basename(final_output))
+        start = time.perf_counter()
+        try:
+            success = bool(self.job(input_path, staged_output))
+        except Exception as e:
+            print(f"Error: Failed to translate {input_path}: {str(e)}")
+            success = False
+
+        self._pending.pop(input_path, None)
+        # Readers of the output folder never see a half-written workbook;
+        # profiles (converter.py --profile) are published for failed files too
+        staged_files = [(staged_output, final_output),
+                        (report_path(staged_output), report_path(final_output))] if success else []
+        staged_files += [(path(staged_output), path(final_output)) for path in (profile_path, pstats_path)]
+        for staged, final in staged_files:
+            if os.path.exists(staged):
+                os.replace(staged, final)
+        if success:
+            moved = _move(input_path, os.path.join(self.watch_dir, PROCESSED_DIR))
+            print(f"Translated {os.path.basename(input_path)} -> {final_output} "
+                  f"in {time.perf_counter() - start:.1f}s")
+        else:
+            moved = _move(input_path, os.path.join(self.watch_dir, FAILED_DIR))
+            print(f"Failed: {os.path.basename(input_path)} moved to {moved}")
+        return success
+
+    def run(self):
+        """Watch the folder until ``stop`` is called or the process is interrupted."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        inotify = _open_inotify(self.watch_dir)
+        print(f"Watching {self.watch_dir} ({'inotify' if inotify else 'polling'}), "
+              f"translations go to {self.output_dir}")
+        try:
+            while not self._stop_event.is_set():
+                for path in self._ready_files():
+                    if self._stop_event.is_set():
+                        break
+                    self.process(path)
+                # Come back soon while a file is still being written
+                timeout = min(self.settle, self.interval) if self._pending else self.interval
+                if inotify is not None:
+                    inotify.wait(timeout)
+                else:
+                    self._stop_event.wait(timeout)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def stop(self):
+        self._stop_event.set()
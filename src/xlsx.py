@@ -0,0 +1,321 @@
+"""
+Minimal .xlsx reader and writer on the standard library.
+
+openpyxl imports numpy whenever it is installed, so reading a small export
+with it takes longer than translating it. ``iter_rows`` and ``SheetWriter``
+handle the first worksheet of a workbook with ``zipfile`` and ``xml.etree``
+only, for the command-line fast path on small files. They cover what alarm
+exports contain (shared and inline strings, numbers, booleans, dates and
+formula results); anything else raises ``UnsupportedWorkbook`` so that the
+caller can fall back to openpyxl, and the values read are the ones openpyxl
+would return.
+"""
+
+import datetime
+import os
+import re
+import tempfile
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+EPOCH_1900 = datetime.datetime(1899, 12, 30)
+EPOCH_1904 = datetime.datetime(1904, 1, 1)
+# Excel counts a 29 February 1900; earlier dates are left to openpyxl
+EARLIEST_DATETIME = datetime.datetime(1900, 3, 1)
+
+# Built-in number formats that openpyxl reads as dates or times
+BUILTIN_DATE_FORMATS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47}
+# Quoted text and bracketed parts other than elapsed time ([h], [mm], [ss])
+FORMAT_NOISE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+DATE_LETTERS = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+# Elapsed time, which openpyxl reads as a timedelta
+ELAPSED_FORMAT = re.compile(r'\[(hh?|mm?|ss?)\]')
+# Characters XML 1.0 does not allow, which openpyxl refuses to write too
+ILLEGAL_CHARACTERS = re.compile(r'[\000-\010\013\014\016-\037]')
+
+# Number format of datetimes written, the one openpyxl uses
+DATETIME_FORMAT = 'yyyy-mm-dd h:mm:ss'
+
+
+class UnsupportedWorkbook(ValueError):
+    """The workbook uses a feature this reader or writer does not handle."""
+
+
+def first_sheet_path(archive):
+    """Return the archive path of the first worksheet of an .xlsx file."""
+    workbook = archive.read('xl/workbook.xml').decode('utf-8', 'replace')
+    rels = archive.read('xl/_rels/workbook.xml.rels').decode('utf-8', 'replace')
+    sheet = re.search(r'<sheet\b[^>]*\br:id="([^"]+)"', workbook)
+    if sheet:
+        for rel in re.finditer(r'<Relationship\b[^>]*>', rels):
+            if f'Id="{sheet.group(1)}"' in rel.group(0):
+                target = re.search(r'Target="([^"]+)"', rel.group(0)).group(1)
+                return target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+    return 'xl/worksheets/sheet1.xml'
+
+
+def column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def _text(element):
+    """Text of a string item: plain, or the runs of rich text without phonetic hints."""
+    plain = element.find(f'{NS}t')
+    if plain is not None:
+        return plain.text or ''
+    return ''.join(run.findtext(f'{NS}t') or '' for run in element.iter(f'{NS}r'))
+
+
+def _shared_strings(archive):
+    try:
+        source = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with source:
+        for _, element in iterparse(source):
+            if element.tag == f'{NS}si':
+                strings.append(_text(element))
+                element.clear()
+    return strings
+
+
+def _is_date_format(code):
+    code = FORMAT_NOISE.sub('', code.split(';')[0])
+    return DATE_LETTERS.search(code) is not None
+
+
+def _date_styles(archive):
+    """Map the indexes of the cell styles that format numbers as dates to
+    whether the format is an elapsed time, which iter_rows does not read.
+    """
+    try:
+        source = archive.open('xl/styles.xml')
+    except KeyError:
+        return {}
+    custom = {}
+    styles = []
+    with source:
+        for _, element in iterparse(source):
+            if element.tag == f'{NS}numFmt':
+                custom[int(element.get('numFmtId'))] = element.get('formatCode', '')
+            elif element.tag == f'{NS}cellXfs':
+                styles = [int(xf.get('numFmtId', 0)) for xf in element.findall(f'{NS}xf')]
+    dates = {}
+    for index, format_id in enumerate(styles):
+        code = custom.get(format_id)
+        if format_id in BUILTIN_DATE_FORMATS or (code is not None and _is_date_format(code)):
+            dates[index] = format_id == 46 or bool(code and ELAPSED_FORMAT.search(code.split(';')[0]))
+    return dates
+
+
+def _from_excel(value, epoch):
+    """Datetime of an Excel serial number, like openpyxl (millisecond precision)."""
+    if value < 60:
+        # Times of day and the 1900 leap year bug; leave those to openpyxl
+        raise UnsupportedWorkbook(f"date serial {value}")
+    day, fraction = divmod(value, 1)
+    return epoch + datetime.timedelta(days=day) + datetime.timedelta(milliseconds=round(fraction * 86400000))
+
+
+def _number(text):
+    if '.' in text or 'E' in text or 'e' in text:
+        return float(text)
+    return int(text)
+
+
+def iter_rows(file_path):
+    """Yield the cell values of each row of the first worksheet as tuples.
+
+    Rows are padded to the width recorded in the sheet dimensions and
+    missing rows are yielded as empty ones, as openpyxl does in read-only
+    mode.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        workbook = archive.read('xl/workbook.xml').decode('utf-8', 'replace')
+        epoch = EPOCH_1904 if re.search(r'date1904="(1|true)"', workbook) else EPOCH_1900
+        strings = _shared_strings(archive)
+        date_styles = _date_styles(archive)
+        width = None
+        expected = 1
+        with archive.open(first_sheet_path(archive)) as source:
+            for _, element in iterparse(source):
+                tag = element.tag
+                if tag == f'{NS}dimension':
+                    match = re.fullmatch(r'[A-Z]+\d+(?::([A-Z]+)\d+)?', element.get('ref', ''))
+                    if match and match.group(1):
+                        width = column_number(match.group(1))
+                    continue
+                if tag != f'{NS}row':
+                    continue
+                number = int(element.get('r', expected))
+                empty = (None,) * (width or 0)
+                while expected < number:
+                    yield empty
+                    expected += 1
+                values = {}
+                position = 0
+                for cell in element.iter(f'{NS}c'):
+                    reference = cell.get('r')
+                    position = column_number(reference.rstrip('0123456789')) if reference else position + 1
+                    kind = cell.get('t', 'n')
+                    if kind == 'inlineStr':
+                        inline = cell.find(f'{NS}is')
+                        values[position] = _text(inline) if inline is not None else None
+                        continue
+                    value = cell.findtext(f'{NS}v') or None
+                    if value is None:
+                        continue
+                    if kind == 'n':
+                        value = _number(value)
+                        elapsed = date_styles.get(int(cell.get('s', 0)))
+                        if elapsed:
+                            raise UnsupportedWorkbook("elapsed time format")
+                        if elapsed is not None:
+                            value = _from_excel(value, epoch)
+                    elif kind == 's':
+                        value = strings[int(value)]
+                    elif kind == 'b':
+                        value = bool(int(value))
+                    elif kind not in ('str', 'e'):
+                        raise UnsupportedWorkbook(f"cell type {kind!r}")
+                    values[position] = value
+                element.clear()
+                row_width = width or (max(values) if values else 0)
+                yield tuple(values.get(column) for column in range(1, row_width + 1))
+                expected = number + 1
+
+
+def _column_letters(number):
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>')
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet" sheetId="1" r:id="rId1"/></sheets></workbook>')
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '<Relationship Id="rId2" Target="styles.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+    '</Relationships>')
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    f'<numFmts count="1"><numFmt numFmtId="164" formatCode="{DATETIME_FORMAT}"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+SHEET_START = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+               '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+SHEET_END = '</sheetData></worksheet>'
+
+
+def _escape(text):
+    # xml.sax.saxutils.escape would import urllib and ssl
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _cell(reference, value):
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        if value != value or value in (float('inf'), float('-inf')):
+            raise UnsupportedWorkbook(f"number {value}")
+        return f'<c r="{reference}"><v>{value!r}</v></c>'
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None or value < EARLIEST_DATETIME:
+            raise UnsupportedWorkbook(f"datetime {value}")
+        serial = (value - EPOCH_1900) / datetime.timedelta(days=1)
+        return f'<c r="{reference}" s="1"><v>{serial!r}</v></c>'
+    if not isinstance(value, str):
+        raise UnsupportedWorkbook(f"value of type {type(value).__name__}")
+    if ILLEGAL_CHARACTERS.search(value):
+        raise UnsupportedWorkbook("control character in text")
+    space = ' xml:space="preserve"' if value != value.strip() else ''
+    return f'<c r="{reference}" t="inlineStr"><is><t{space}>{_escape(value)}</t></is></c>'
+
+
+class SheetWriter:
+    """Write rows to a single-sheet workbook, saved to ``path`` by ``close``.
+
+    The workbook is built in a temporary file next to ``path``, so a failed
+    run never leaves a partial output behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.xlsx')
+        os.close(fd)
+        self._archive = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        self._sheet = self._archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self._sheet.write(SHEET_START.encode('utf-8'))
+        self._rows = 0
+        self._letters = []
+
+    def append(self, row):
+        self._rows += 1
+        while len(self._letters) < len(row):
+            self._letters.append(_column_letters(len(self._letters) + 1))
+        cells = ''.join(_cell(f'{self._letters[i]}{self._rows}', value)
+                        for i, value in enumerate(row) if value is not None)
+        self._sheet.write(f'<row r="{self._rows}">{cells}</row>'.encode('utf-8'))
+
+    def close(self):
+        try:
+            self._sheet.write(SHEET_END.encode('utf-8'))
+            self._sheet.close()
+            for name, content in (('[Content_Types].xml', CONTENT_TYPES), ('_rels/.rels', ROOT_RELS),
+                                  ('xl/workbook.xml', WORKBOOK), ('xl/_rels/workbook.xml.rels', WORKBOOK_RELS),
+                                  ('xl/styles.xml', STYLES)):
+                self._archive.writestr(name, content)
+            self._archive.close()
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self):
+        """Drop the workbook being written."""
+        try:
+            self._sheet.close()
+            self._archive.close()
+        except (OSError, ValueError):
+            pass
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
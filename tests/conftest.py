@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# The tests import the converters and src/ from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def misses_db(tmp_path, monkeypatch):
+    """Record the misses of each test in its own database, never in the user's."""
+    path = str(tmp_path / 'misses.sqlite3')
+    monkeypatch.setenv('TRANSLINGOO_MISSES_DB', path)
+    return path
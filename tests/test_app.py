@@ -0,0 +1,25 @@
+import os
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip('flask')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'flask_app'))
+import app as flask_app  # noqa: E402
+
+
+def test_ready_answers_503_until_warm_up_finishes(monkeypatch):
+    assert flask_app.wait_for_warm_up(120)
+    release = threading.Event()
+    monkeypatch.setattr(flask_app, 'warm_up', lambda: release.wait(10))
+    monkeypatch.setitem(flask_app.app.config, 'WARMED_UP', False)
+    client = flask_app.app.test_client()
+
+    thread = flask_app.start_warm_up()
+    assert client.get('/ready').status_code == 503
+    release.set()
+    thread.join(10)
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'ready'
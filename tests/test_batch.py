@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import openpyxl
+
+from benchmarks.workbooks import make_workbook
+from src.batch import MANIFEST_NAME
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_converter(*args, failed=False):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'converter.py'), *args],
+                            capture_output=True, text=True, cwd=ROOT)
+    assert (result.returncode != 0) is failed, result.stdout + result.stderr
+    return result.stdout
+
+
+def header(path):
+    return [cell.value for cell in next(openpyxl.load_workbook(path, read_only=True).active.iter_rows(max_row=1))]
+
+
+def test_batch_redoes_files_when_languages_change(tmp_path):
+    inputs, outputs = tmp_path / 'in', tmp_path / 'out'
+    inputs.mkdir()
+    make_workbook(str(inputs), 50)
+    make_workbook(str(inputs), 60)
+
+    assert '2 done, 0 failed, 0 skipped' in run_converter(str(inputs), '-o', str(outputs))
+    assert '0 done, 0 failed, 2 skipped' in run_converter(str(inputs), '-o', str(outputs))
+
+    assert '2 done, 0 failed, 0 skipped' in run_converter(str(inputs), '-o', str(outputs), '-l', 'fr', 'es')
+    for output in outputs.glob('*.xlsx'):
+        assert 'Description Español' in header(output)
+    with open(outputs / MANIFEST_NAME, encoding='utf-8') as f:
+        entries = json.load(f)['files'].values()
+    assert all(entry['settings']['languages'] == ['fr', 'es'] for entry in entries)
+
+    assert '0 done, 0 failed, 2 skipped' in run_converter(str(inputs), '-o', str(outputs), '-l', 'fr', 'es')
+
+
+def test_batch_redoes_changed_missing_and_failed_files(tmp_path):
+    inputs, outputs = tmp_path / 'in', tmp_path / 'out'
+    inputs.mkdir()
+    first = make_workbook(str(inputs), 50)
+    second = make_workbook(str(inputs), 60)
+    broken = inputs / 'broken.xlsx'
+    broken.write_bytes(b'not a workbook')
+
+    assert '2 done, 1 failed, 0 skipped' in run_converter(str(inputs), '-o', str(outputs), failed=True)
+
+    # Touched but identical: still skipped
+    os.utime(first)
+    assert '0 done, 1 failed, 2 skipped' in run_converter(str(inputs), '-o', str(outputs), failed=True)
+
+    os.remove(outputs / (os.path.splitext(os.path.basename(first))[0] + '_translated.xlsx'))
+    os.replace(make_workbook(str(tmp_path), 70), second)
+    os.remove(broken)
+    assert '2 done, 0 failed, 0 skipped' in run_converter(str(inputs), '-o', str(outputs))
+    assert '0 done, 0 failed, 2 skipped' in run_converter(str(inputs), '-o', str(outputs))
@@ -0,0 +1,47 @@
+import importlib.util
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import converter
+from benchmarks.workbooks import make_workbook
+
+
+def sheet_values(path):
+    return [list(row) for row in openpyxl.load_workbook(path).active.iter_rows(values_only=True)]
+
+
+@pytest.mark.parametrize('junk_rows', [0, 3])
+@pytest.mark.parametrize('languages', [None, ['fr', 'es']])
+def test_fast_path_and_pandas_path_give_the_same_workbook(tmp_path, monkeypatch, junk_rows, languages):
+    input_file = make_workbook(str(tmp_path), 200, junk_rows=junk_rows)
+    fast_output, pandas_output = str(tmp_path / 'fast.xlsx'), str(tmp_path / 'pandas.xlsx')
+
+    assert converter.convert_and_process(input_file, fast_output, languages=languages)
+    monkeypatch.setattr(converter, 'FAST_PATH_MAX_BYTES', 0)
+    assert converter.convert_and_process(input_file, pandas_output, languages=languages)
+
+    fast, pandas = sheet_values(fast_output), sheet_values(pandas_output)
+    assert fast[0] == pandas[0]
+    assert 'Description Français' == fast[0][fast[0].index('Description') + 1]
+    assert fast[1:] == pandas[1:]
+
+
+def test_both_converters_place_translated_columns_alike(tmp_path):
+    spec = importlib.util.spec_from_file_location('simple_converter_converter', os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'simple_converter', 'converter.py'))
+    simple_converter = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(simple_converter)
+    df = pd.DataFrame({'Time': [1, 2], 'Description': ['Normal', 'Reset'], 'Origin': ['A', 'B'],
+                       'Message': ['Set', 'Reset']})
+    columns_map = {'Description': 'Description', 'Message': 'Message'}
+    outputs = []
+    for module in (converter, simple_converter):
+        output_file = str(tmp_path / f"{module.__name__}.xlsx")
+        module.save_translated(df.copy(), columns_map, 'alarms.xlsx', output_file, languages=['fr', 'es'])
+        outputs.append(sheet_values(output_file))
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0][0][:4] == ['Time', 'Description', 'Description Français', 'Description Español']
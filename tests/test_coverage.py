@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.coverage import NON_TEXT, UNMATCHED, report_path, summarize
+from src.excel_processor import translate_column_languages
+from src.translation_memory import MissRecorder
+from src.translator import get_glossary
+
+
+class FakeMemory:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, source_file, misses):
+        self.recorded.append(dict(misses))
+
+
+def test_report_is_named_after_the_output_stem():
+    assert report_path('/tmp/out.xlsx').name == 'out.coverage.json'
+
+
+def test_non_text_cells_are_neither_unmatched_nor_misses():
+    glossary = get_glossary()
+    recorder = MissRecorder('alarms.xlsx', memory=FakeMemory())
+    values = pd.Series([5, 5, 2.5, 'ZZQX UNKNOWN VALUE', None], dtype=object)
+
+    translated, _, counts = translate_column_languages(values, [glossary], 'Description', recorder)
+
+    counts = counts[glossary.language]
+    assert counts[NON_TEXT] == 3
+    assert counts[UNMATCHED] == 1
+    assert [value for value, _, _ in recorder.misses] == ['ZZQX UNKNOWN VALUE']
+    assert translated[glossary.language].iloc[0] == 5
+    summary = summarize(counts)
+    assert summary['rows'] == 5
+    assert summary['coverage'] == 0.0
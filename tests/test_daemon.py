@@ -0,0 +1,105 @@
+import http.client
+import io
+import json
+import sys
+import threading
+
+import openpyxl
+import pytest
+
+import converter
+from benchmarks.workbooks import make_workbook
+from src import daemon
+
+
+@pytest.fixture
+def server(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def job(input_path, output_path, **options):
+        started.set()
+        release.wait(10)
+        with open(output_path, 'wb') as f:
+            f.write(b'translated')
+        return True
+
+    monkeypatch.setattr(sys, 'stdout', sys.stdout)
+    server = daemon.TranslationServer(job, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.started, server.release = started, release
+    yield server
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def translation_server(monkeypatch):
+    monkeypatch.setattr(sys, 'stdout', sys.stdout)
+    server = daemon.TranslationServer(converter.convert_and_process, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def test_health_counts_running_and_finished_jobs(server):
+    results = []
+    post = threading.Thread(target=lambda: results.append(request(
+        server, 'POST', '/translate', b'xlsx', {daemon.FILENAME_HEADER: 'a"b\'c.xlsx'})))
+    post.start()
+    assert server.started.wait(10)
+    health = json.loads(request(server, 'GET', '/health')[1])
+    assert (health['active_jobs'], health['jobs_total']) == (1, 1)
+
+    server.release.set()
+    post.join(10)
+    response, body = results[0]
+    assert response.status == 200 and body == b'translated'
+    assert response.getheader('Content-Disposition') == "attachment; filename*=UTF-8''a%22b%27c_translated.xlsx"
+    health = json.loads(request(server, 'GET', '/health')[1])
+    assert (health['active_jobs'], health['jobs_total']) == (0, 1)
+
+
+def test_large_uploads_are_refused(server, monkeypatch):
+    monkeypatch.setattr(daemon, 'MAX_UPLOAD_BYTES', 3)
+    response, _ = request(server, 'POST', '/translate', b'xlsx', {daemon.FILENAME_HEADER: 'a.xlsx'})
+    assert response.status == 413
+    monkeypatch.setattr(daemon, 'MAX_UPLOAD_BYTES', 0)
+    server.release.set()
+    response, _ = request(server, 'POST', '/translate', b'xlsx', {daemon.FILENAME_HEADER: 'a.xlsx'})
+    assert response.status == 200
+
+
+def test_uploaded_workbook_is_translated_with_the_query_options(translation_server, tmp_path):
+    with open(make_workbook(str(tmp_path), 30), 'rb') as f:
+        body = f.read()
+    response, output = request(translation_server, 'POST', '/translate?columns=Description&languages=fr&languages=es',
+                               body, {daemon.FILENAME_HEADER: 'alarms.xlsx'})
+
+    assert response.status == 200
+    header = next(openpyxl.load_workbook(io.BytesIO(output), read_only=True).active.values)
+    assert 'Description Français' in header and 'Description Español' in header
+    report = json.loads(response.getheader(daemon.REPORT_HEADER))
+    assert report['rows'] == 30
+
+
+def test_bad_requests_are_refused(translation_server, monkeypatch):
+    # pytest puts its own capture back after setup; the job log must see the prints
+    monkeypatch.setattr(sys, 'stdout', translation_server.log)
+    headers = {daemon.FILENAME_HEADER: 'alarms.xlsx'}
+    response, body = request(translation_server, 'POST', '/translate?languages=xx', b'xlsx', headers)
+    assert (response.status, body) == (400, b'Unknown languages: xx\n')
+    response, _ = request(translation_server, 'POST', '/translate', b'xlsx', {daemon.FILENAME_HEADER: 'notes.txt'})
+    assert response.status == 400
+    response, body = request(translation_server, 'POST', '/translate', b'not a workbook', headers)
+    assert response.status == 422 and b'Failed: alarms.xlsx' in body
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from benchmarks.workbooks import make_workbook
+from src.detection import detect_columns, hit_rate, merge_columns, sample_dataframe
+from src.excel_processor import translate_dataframe
+from src.glossary import target_column_name
+from src.translator import get_glossary
+
+
+def test_hit_rate_counts_fuzzy_matches():
+    glossary = get_glossary()
+    assert not glossary.knows('PRASENCE OF VOLTAGE')
+    assert hit_rate(['PRASENCE OF VOLTAGE', 'Fail - App Ack', 'zzqx'], glossary) == 2 / 3
+
+
+def test_synthetic_export_detects_description(tmp_path):
+    df = pd.read_excel(make_workbook(str(tmp_path), 500, junk_rows=0))
+    assert 'Description' in detect_columns(sample_dataframe(df), get_glossary())
+
+
+def test_detection_adds_to_the_columns_asked_for():
+    available = ['Time', 'Description', 'Message', 'Type']
+    assert merge_columns(['description'], ['Message'], available) == ['Description', 'Message']
+    assert merge_columns(['Description', 'Missing'], ['Description'], available) == ['Description']
+    assert merge_columns(None, ['Type'], available) == ['Type']
+
+
+def test_auto_detect_never_drops_a_selected_column():
+    df = pd.DataFrame({'Description': ['zzqx one', 'zzqx two'], 'Message': ['Normal', 'Reset']})
+    output_df, stats = translate_dataframe(df, ['Description'], auto_detect=True)
+    language = get_glossary().language
+    assert stats['detected_columns'] == ['Message']
+    assert target_column_name('Description', language) in output_df.columns
+    assert target_column_name('Message', language) in output_df.columns
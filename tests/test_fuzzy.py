@@ -0,0 +1,36 @@
+from src.coverage import TRANSLATED, UNMATCHED
+from src.fuzzy import FuzzyMatcher, edit_distance
+from src.translator import get_glossary
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance('BREAKER', 'BRAKER') == 1
+    assert edit_distance('BREAKER', 'BRAKE') == 2
+    assert edit_distance('BREAKER', 'OPEN', limit=1) == 2
+
+
+def test_confidence_boundary():
+    matcher = FuzzyMatcher({'PUMP FAULT': 'DÉFAUT POMPE', 'PUMP FAIL': 'DÉFAILLANCE POMPE'})
+    # One edit in ten characters is exactly the 0.9 minimum
+    assert matcher.match('PUMP FAULX') == ('PUMP FAULT', 0.9)
+    # One edit in nine characters is below it
+    assert matcher.match('PUMP FAIX') is None
+
+
+def test_only_words_are_corrected():
+    matcher = FuzzyMatcher({'BAY 1 BREAKER TRIPPED': 'X', 'CB QA1 BREAKER TRIPPED': 'Y'})
+    assert matcher.match('BAY 2 BREAKER TRIPPED') is None
+    assert matcher.match('CB QB1 BREAKER TRIPPED') is None
+    assert matcher.match('BAY 1 BRAKER TRIPPED')[0] == 'BAY 1 BREAKER TRIPPED'
+
+
+def test_ambiguous_matches_are_rejected():
+    matcher = FuzzyMatcher({'MOTOR FAULTS': 'DÉFAUTS MOTEUR', 'MOTOR FAULTY': 'MOTEUR DÉFECTUEUX'})
+    assert matcher.match('MOTOR FAULTX') is None
+
+
+def test_glossary_translates_misspelled_terms():
+    glossary = get_glossary()
+    assert glossary.lookup('PRASENCE OF VOLTAGE') == ('PRÉSENCE DE TENSION', TRANSLATED)
+    assert glossary.lookup('PRASENCE OF VOLTAGE')[0] == glossary.lookup('PRESENCE OF VOLTAGE')[0]
+    assert glossary.lookup('ZZQX UNKNOWN SIGNAL')[1] == UNMATCHED
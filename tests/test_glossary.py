@@ -0,0 +1,22 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from src import glossary
+
+
+def test_snapshot_is_readable_by_other_users(tmp_path):
+    snapshot = glossary.compile_glossary(glossary.DEFAULT_SOURCE, tmp_path / 'en_fr.tlg')
+    assert stat.S_IMODE(os.stat(snapshot).st_mode) == glossary.SNAPSHOT_MODE
+    if not glossary._UMASK & 0o004:
+        assert os.stat(snapshot).st_mode & stat.S_IROTH
+
+
+def test_compile_rejects_one_output_for_every_language(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['glossary', 'compile', '-o', str(tmp_path / 'all.tlg')])
+    with pytest.raises(SystemExit) as exit_info:
+        glossary.main()
+    assert exit_info.value.code == 2
+    assert not (tmp_path / 'all.tlg').exists()
@@ -0,0 +1,56 @@
+import openpyxl
+import pytest
+
+from benchmarks.workbooks import make_workbook
+from src.incremental import watermark_path
+from src.streaming import stream_translate
+
+
+def write_log(path, rows):
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+
+def values(path):
+    return list(openpyxl.load_workbook(path, read_only=True).active.values)
+
+
+@pytest.mark.parametrize('options', [{'columns_to_translate': ['Description']}, {'auto_detect': True}])
+def test_appended_rows_give_the_same_output_as_a_full_run(tmp_path, capsys, options):
+    rows = values(make_workbook(str(tmp_path), 200))
+    log, output, full = tmp_path / 'log.xlsx', tmp_path / 'log_fr.xlsx', tmp_path / 'full_fr.xlsx'
+
+    write_log(log, rows[:120])
+    assert stream_translate(str(log), str(output), incremental=True, **options)[0]
+    write_log(log, rows)
+    capsys.readouterr()
+    success, stats = stream_translate(str(log), str(output), incremental=True, **options)
+    assert success
+    assert 'Translating the rows after row' in capsys.readouterr().out
+
+    success, full_stats = stream_translate(str(log), str(full), **options)
+    assert success
+    assert values(output) == values(full)
+    assert stats['rows'] == full_stats['rows']
+    assert stats['coverage'] == full_stats['coverage']
+
+
+def test_rows_changed_before_the_watermark_are_translated_again(tmp_path, capsys):
+    rows = values(make_workbook(str(tmp_path), 50))
+    log, output, full = tmp_path / 'log.xlsx', tmp_path / 'log_fr.xlsx', tmp_path / 'full_fr.xlsx'
+    write_log(log, rows)
+    assert stream_translate(str(log), str(output), ['Description'], incremental=True)[0]
+
+    edited = [list(row) for row in rows]
+    description = next(row for row in edited if 'Description' in row).index('Description')
+    edited[-1][description] = 'PRESENCE OF VOLTAGE'
+    write_log(log, edited + [edited[-2]])
+    capsys.readouterr()
+    assert stream_translate(str(log), str(output), ['Description'], incremental=True)[0]
+    assert 'translating the whole file' in capsys.readouterr().out
+
+    assert stream_translate(str(log), str(full), ['Description'])[0]
+    assert values(output) == values(full)
+    assert watermark_path(output).exists()
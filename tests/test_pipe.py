@@ -0,0 +1,25 @@
+import csv
+import io
+import os
+import subprocess
+import sys
+
+from src.translator import get_glossary
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_translingoo_translate_pipes_csv_from_any_directory(tmp_path):
+    source = 'Time,Description,Origin\n1,Normal,A\n2,ZZQX UNKNOWN,B\n'
+    env = dict(os.environ)
+    env.pop('PYTHONPATH', None)
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'translingoo-translate'), '-c', 'Description'],
+                            input=source.encode('utf-8'), capture_output=True, cwd=str(tmp_path), env=env,
+                            timeout=120)
+
+    assert result.returncode == 0, result.stderr.decode('utf-8', 'replace')
+    rows = list(csv.reader(io.StringIO(result.stdout.decode('utf-8'))))
+    assert rows[0] == ['Time', 'Description', 'Description Français', 'Origin']
+    assert rows[1] == ['1', 'Normal', get_glossary().translate('Normal'), 'A']
+    assert rows[2] == ['2', 'ZZQX UNKNOWN', 'ZZQX UNKNOWN', 'B']
+    assert b'Translated 2 rows' in result.stderr
@@ -0,0 +1,66 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from src import glossary as glossary_module
+from src import translator
+from src.coverage import TRANSLATED, UNMATCHED
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """A copy of the French glossary that the test may edit."""
+    shutil.copy(glossary_module.source_path('fr'), tmp_path / 'en_fr.tsv')
+    monkeypatch.setattr(glossary_module, 'GLOSSARY_DIR', tmp_path)
+    monkeypatch.setattr(translator, '_glossaries', {})
+    monkeypatch.setattr(translator, '_reverse_glossaries', {})
+    return tmp_path / 'en_fr.tsv'
+
+
+def add_term(source, term, translation):
+    text = source.read_text(encoding='utf-8').replace('[terms]\n', f"[terms]\n{term}\t{translation}\n", 1)
+    source.write_text(text, encoding='utf-8')
+    # Make sure the watcher sees a new signature even on coarse clocks
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_picks_up_an_edited_source(source):
+    before = translator.get_glossary('fr')
+    assert before.lookup('ZZQX SIGNAL') == ('ZZQX SIGNAL', UNMATCHED)
+    assert translator.reload_glossary('fr') is None
+
+    add_term(source, 'ZZQX SIGNAL', 'SIGNAL ZZQX')
+    after = translator.reload_glossary('fr')
+
+    assert after is translator.get_glossary('fr')
+    assert after.version != before.version
+    assert after.lookup('ZZQX SIGNAL') == ('SIGNAL ZZQX', TRANSLATED)
+    assert after.lookup('Normal') == before.lookup('Normal')
+    # A job holding the old glossary keeps translating with it
+    assert before.lookup('ZZQX SIGNAL')[1] == UNMATCHED
+    assert translator.get_reverse_glossary('fr').lookup('SIGNAL ZZQX') == ('ZZQX SIGNAL', TRANSLATED)
+
+
+def test_broken_source_keeps_the_current_glossary(source):
+    current = translator.get_glossary('fr')
+    source.write_text('[unknown_section]\nA\tB\n', encoding='utf-8')
+    assert translator.reload_glossary('fr') is None
+    assert translator.get_glossary('fr') is current
+
+
+def test_watcher_reloads_without_a_restart(source):
+    before = translator.get_glossary('fr')
+    watcher = translator.GlossaryWatcher(interval=0.05)
+    watcher.start()
+    try:
+        add_term(source, 'ZZQX SIGNAL', 'SIGNAL ZZQX')
+        deadline = time.monotonic() + 10
+        while translator.get_glossary('fr') is before and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+        watcher.join(5)
+    assert translator.get_glossary('fr').translate('ZZQX SIGNAL') == 'SIGNAL ZZQX'
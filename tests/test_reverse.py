@@ -0,0 +1,36 @@
+from collections import Counter
+
+import pytest
+
+from src.coverage import UNMATCHED
+from src.translator import get_glossary, get_reverse_glossary, invert_entries
+
+
+@pytest.mark.parametrize('language', ['fr', 'es', 'ar'])
+def test_every_term_round_trips(language):
+    glossary = get_glossary(language)
+    reverse = get_reverse_glossary(language)
+    terms = list(glossary.terms.items())
+    shared = Counter(translation for _, translation in terms)
+    for term, translation in terms:
+        if shared[translation] == 1:
+            assert reverse.translate(translation).upper() == term
+
+
+def test_cells_round_trip_with_their_case_and_suffix():
+    forward, reverse = get_glossary('fr'), get_reverse_glossary('fr')
+    for cell in ['Presence Of Voltage - Clearing', 'PRESENCE OF VOLTAGE', '24 ALARM']:
+        assert reverse.translate(forward.translate(cell)) == cell
+
+
+def test_french_spellings_do_not_become_the_english_term():
+    inverted = invert_entries([('OPERATIONAL', 'OPÉRATIONNEL'), ('OPÉRATIONNEL', 'OPÉRATIONNEL')])
+    assert inverted == {'OPÉRATIONNEL': ('OPÉRATIONNEL', 'OPERATIONAL')}
+
+
+def test_reverse_glossary_is_cached_for_the_forward_version():
+    reverse = get_reverse_glossary('fr')
+    assert reverse.language == 'en'
+    assert reverse.version == get_glossary('fr').version
+    assert get_reverse_glossary('fr') is reverse
+    assert reverse.lookup('ZZQX INCONNU')[1] == UNMATCHED
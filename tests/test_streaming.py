@@ -0,0 +1,27 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from benchmarks.workbooks import make_workbook
+from src.excel_processor import translate_dataframe
+from src.streaming import stream_translate
+
+
+def data_rows(path):
+    return sum(1 for _ in openpyxl.load_workbook(path, read_only=True).active.iter_rows()) - 1
+
+
+@pytest.mark.parametrize('rows, truncated', [(20, False), (21, True)])
+def test_streaming_truncates_like_the_pandas_path(tmp_path, rows, truncated):
+    input_file = make_workbook(str(tmp_path), rows, junk_rows=0)
+    output_file = str(tmp_path / 'out.xlsx')
+
+    success, stats = stream_translate(input_file, output_file, ['Description'], max_rows=20)
+
+    assert success
+    assert stats['truncated'] is truncated
+    assert data_rows(output_file) == 20
+    output_df, pandas_stats = translate_dataframe(pd.read_excel(input_file), ['Description'], max_rows=20)
+    assert len(output_df) == 20
+    assert pandas_stats['truncated'] is truncated
+    assert stats['rows'] == pandas_stats['rows'] == 20
@@ -0,0 +1,22 @@
+from src.coverage import TRANSLATED, UNMATCHED
+from src.translator import get_glossary
+
+
+def test_term_and_suffix_are_translated_part_by_part():
+    glossary = get_glossary()
+    state = glossary.lookup('PRESENCE OF VOLTAGE')[0]
+    clearing = glossary.suffixes['CLEARING']
+    assert glossary.lookup('PRESENCE OF VOLTAGE - CLEARING') == (f"{state} - {clearing}", TRANSLATED)
+
+
+def test_composition_keeps_the_case_of_each_part():
+    glossary = get_glossary()
+    assert glossary.lookup('Presence Of Voltage - Clearing')[0] == 'Présence De Tension - Effacement'
+    assert glossary.lookup('Fail - App Ack')[0] == 'Défaillance - App Ack'
+
+
+def test_unknown_state_with_a_known_suffix_is_a_miss():
+    glossary = get_glossary()
+    assert glossary.lookup('ZZQX - Clearing') == ('ZZQX - Clearing', UNMATCHED)
+    assert glossary.knows('Fail - App Ack')
+    assert not glossary.knows('ZZQX - App Ack')
@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+from src import translation_memory
+from src.excel_processor import translate_dataframe
+from src.glossary import GLOSSARY_DIR
+
+
+def test_default_database_is_outside_the_source_tree(monkeypatch, tmp_path):
+    monkeypatch.delenv('TRANSLINGOO_MISSES_DB')
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    path = translation_memory.default_db()
+    assert not path.startswith(str(GLOSSARY_DIR))
+    assert os.path.basename(path) == 'misses.sqlite3'
+
+
+def test_misses_are_recorded_in_the_configured_database(misses_db):
+    recorder = translation_memory.MissRecorder('alarms.xlsx')
+    df = pd.DataFrame({'Description': ['ZZQX UNKNOWN VALUE', 'ZZQX UNKNOWN VALUE', 'Normal']})
+    translate_dataframe(df, ['Description'], recorder=recorder)
+    assert recorder.flush() == 1
+    memory = translation_memory.TranslationMemory(misses_db)
+    assert [(miss['value'], miss['rows']) for miss in memory.top_misses(5)] == [('ZZQX UNKNOWN VALUE', 2)]
@@ -0,0 +1,52 @@
+import os
+import shutil
+import threading
+import time
+
+import openpyxl
+
+from benchmarks.workbooks import make_workbook
+from src.coverage import report_path
+from src.excel_processor import translate_file
+from src.translator import get_glossary
+from src.watch import FAILED_DIR, PROCESSED_DIR, STAGING_DIR, FolderWatcher
+
+
+def wait_for(condition, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_dropped_workbooks_are_translated_and_moved_away(tmp_path):
+    drop, source = tmp_path / 'drop', tmp_path / 'source'
+    drop.mkdir()
+    source.mkdir()
+    workbook = make_workbook(str(source), 40)
+    watcher = FolderWatcher(str(drop), lambda input_path, output_path: translate_file(input_path, output_path)[0],
+                            settle=0.2, interval=0.1)
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    try:
+        shutil.copy(workbook, drop / 'alarms.xlsx')
+        (drop / 'broken.xlsx').write_bytes(b'not a workbook')
+        output = drop / 'translated' / 'alarms_translated.xlsx'
+        assert wait_for(lambda: (drop / PROCESSED_DIR / 'alarms.xlsx').exists()
+                        and (drop / FAILED_DIR / 'broken.xlsx').exists())
+    finally:
+        watcher.stop()
+        thread.join(5)
+
+    assert sorted(os.listdir(drop)) == [FAILED_DIR, PROCESSED_DIR, 'translated']
+    published = [STAGING_DIR, output.name, os.path.basename(report_path(str(output)))]
+    assert sorted(os.listdir(drop / 'translated')) == sorted(published)
+    assert os.listdir(drop / 'translated' / STAGING_DIR) == []
+
+    rows = list(openpyxl.load_workbook(output, read_only=True).active.values)
+    column = rows[0].index('Description')
+    assert rows[0][column + 1] == 'Description Français'
+    glossary = get_glossary()
+    for row in rows[1:]:
+        if isinstance(row[column], str):
+            assert row[column + 1] == glossary.translate(row[column])
@@ -0,0 +1,10 @@
+from benchmarks.workbooks import KNOWN_SHARE, description_values
+from src.coverage import FRENCH, TRANSLATED
+from src.translator import get_glossary
+
+
+def test_description_values_have_the_advertised_known_share():
+    glossary = get_glossary()
+    values = description_values(1000)
+    known = [value for value in values if glossary.lookup(value)[1] in (TRANSLATED, FRENCH)]
+    assert len(known) == int(len(values) * KNOWN_SHARE)
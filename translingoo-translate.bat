@@ -0,0 +1,3 @@
+@echo off
+REM Windows counterpart of translingoo-translate: type export.csv ^| translingoo-translate.bat -c Description
+python "%~dp0translingoo-translate" %*